@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""Offline benchmarks of the client against the local mock server of tests/mock_server.py.
+
+Measures pages per second, articles per second and peak memory of ``get_search_all_pages``,
+``get_latest_headlines_all_pages`` and ``get_search_all_articles``, and the import time of the package:
+
+    $ python benchmarks/bench_client.py
+    $ python benchmarks/bench_client.py --latency 0.05 --max-workers 8 --json results.json
+    $ python benchmarks/bench_client.py --transport replay
+
+The server runs in its own process so it does not compete with the client for the interpreter. ``--transport``
+selects the HTTP layer of the client: ``memory`` answers in the client process without sockets, and ``replay``
+records every call once, then measures the replay of the recording. Compare the JSON results of two commits to
+spot a regression.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from newscatcherapi import (NewsCatcherApiClient, MetricsCollector, MemoryTransport, RecordReplayTransport,  # noqa: E402
+                            Urllib3Transport)
+from tests.mock_server import MockNewsCatcherServer  # noqa: E402
+
+IMPORT_SCRIPT = 'import time; started = time.perf_counter(); import newscatcherapi; print(time.perf_counter() - started)'
+TRANSPORTS = ('requests', 'urllib3', 'memory', 'replay')
+
+
+def get_scenarios(nb_pages, page_size, nb_days):
+    """Return the benchmarked calls as ``(name, function of the client)`` pairs."""
+    common = {'page_size': page_size, 'max_page': nb_pages, 'seconds_pause': 0}
+    return [
+        ('get_search_all_pages', lambda client, max_workers: client.get_search_all_pages(
+            q='benchmark', max_workers=max_workers, **common)),
+        ('get_latest_headlines_all_pages', lambda client, max_workers: client.get_latest_headlines_all_pages(
+            lang='en', max_workers=max_workers, **common)),
+        ('get_search_all_articles', lambda client, max_workers: client.get_search_all_articles(
+            q='benchmark', from_='2021/01/01', to_=f'2021/01/{nb_days + 1:02d}', by='day',
+            max_workers=max_workers, **common)),
+    ]
+
+
+def run_scenario(base_url, call, max_workers, repeat, make_transport):
+    """Return the best pages and articles per second of ``repeat`` runs, and the peak memory of one more run.
+
+    ``make_transport()`` returns a new transport for each run, or `None` for the default one.
+    """
+    best = None
+    for _ in range(repeat):
+        metrics = MetricsCollector()
+        transport = make_transport()
+        with NewsCatcherApiClient('benchmark', base_url=base_url, hooks=metrics, transport=transport) as client:
+            started = time.perf_counter()
+            result = call(client, max_workers)
+            seconds = time.perf_counter() - started
+        if transport is not None:
+            transport.close()
+        if best is None or seconds < best['seconds']:
+            snapshot = metrics.snapshot()
+            best = {'seconds': seconds, 'requests': snapshot['requests'], 'pages': snapshot['pages'],
+                    'articles': len(result['articles'])}
+
+    transport = make_transport()
+    with NewsCatcherApiClient('benchmark', base_url=base_url, transport=transport) as client:
+        tracemalloc.start()
+        call(client, max_workers)
+        best['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    if transport is not None:
+        transport.close()
+
+    best['pages_per_second'] = best['pages'] / best['seconds']
+    best['articles_per_second'] = best['articles'] / best['seconds']
+    return best
+
+
+def measure_import_time(repeat):
+    """Return the best time to import the package in a fresh interpreter, in seconds."""
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], cwd=ROOT, check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        times.append(float(output))
+    return min(times)
+
+
+def run_benchmarks(nb_pages=20, page_size=100, nb_days=7, hits_per_day=500, latency=0.0, summary_size=1000,
+                   max_workers=None, repeat=3, in_process=False, transport='requests'):
+    """Run every scenario against a new mock server and return the results as a dict."""
+    if transport not in TRANSPORTS:
+        raise ValueError(f"{transport} is not a valid transport. It should be one of: {', '.join(TRANSPORTS)}")
+    server = MockNewsCatcherServer(total_hits=nb_pages * page_size, hits_per_day=hits_per_day, latency=latency,
+                                   summary_size=summary_size)
+    directory = tempfile.mkdtemp()
+    recording = os.path.join(directory, 'recording.db')
+    make_transport = {
+        'requests': lambda: None,
+        'urllib3': lambda: Urllib3Transport(),
+        'memory': lambda: MemoryTransport(server.respond),
+        'replay': lambda: RecordReplayTransport(recording),
+    }[transport]
+
+    if transport != 'memory':
+        server.start() if in_process else server.start_process()
+    try:
+        scenarios = get_scenarios(nb_pages, page_size, nb_days)
+        if transport == 'replay':
+            with RecordReplayTransport(recording, mode='record') as recorder:
+                for _, call in scenarios:
+                    call(NewsCatcherApiClient('benchmark', base_url=server.base_url, transport=recorder), max_workers)
+        results = {name: run_scenario(server.base_url, call, max_workers, repeat, make_transport)
+                   for name, call in scenarios}
+    finally:
+        server.stop()
+        shutil.rmtree(directory)
+    results['import'] = {'seconds': measure_import_time(repeat)}
+    return results
+
+
+def format_results(results):
+    lines = [f'{"benchmark":<32}{"pages/s":>10}{"articles/s":>12}{"seconds":>10}{"peak MB":>10}']
+    for name, result in results.items():
+        if name == 'import':
+            continue
+        lines.append(f'{name:<32}{result["pages_per_second"]:>10.1f}{result["articles_per_second"]:>12.0f}'
+                     f'{result["seconds"]:>10.3f}{result["peak_memory_mb"]:>10.1f}')
+    lines.append(f'{"import newscatcherapi":<32}{"":>22}{results["import"]["seconds"]:>10.3f}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', type=int, default=20, help='pages of the *_all_pages calls')
+    parser.add_argument('--page-size', type=int, default=100, help='articles per page')
+    parser.add_argument('--days', type=int, default=7, help='daily windows of get_search_all_articles')
+    parser.add_argument('--hits-per-day', type=int, default=500, help='articles per window of get_search_all_articles')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the server waits before each answer')
+    parser.add_argument('--summary-size', type=int, default=1000, help='characters of the summary of each article')
+    parser.add_argument('--max-workers', type=int, default=None, help='concurrent page fetches')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each benchmark, the best one is kept')
+    parser.add_argument('--transport', choices=TRANSPORTS, default='requests', help='HTTP layer of the client')
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.pages, args.page_size, args.days, args.hits_per_day, args.latency,
+                             args.summary_size, args.max_workers, args.repeat, transport=args.transport)
+    print(format_results(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,21 @@
-from newscatcherapi.newscatcherapi_client import NewsCatcherApiClient
\ No newline at end of file
+from newscatcherapi.newscatcherapi_client import NewsCatcherApiClient
+from newscatcherapi.newscatcherapi_async_client import AsyncNewsCatcherApiClient
+from newscatcherapi.newscatcherapi_rate_limiter import RateLimiter
+from newscatcherapi.newscatcherapi_cache import ResponseCache, SearchWindowCache
+from newscatcherapi.newscatcherapi_checkpoint import SearchCheckpoint
+from newscatcherapi.newscatcherapi_dedup import ArticleIdSet, BloomFilter
+from newscatcherapi.newscatcherapi_retry import RetryPolicy
+from newscatcherapi.newscatcherapi_json import JsonDecoder
+from newscatcherapi.newscatcherapi_article import Article
+from newscatcherapi.newscatcherapi_columnar import ColumnarArticles
+from newscatcherapi.newscatcherapi_sinks import ArticleSink, JsonLinesSink, ParquetSink
+from newscatcherapi.newscatcherapi_query import PreparedQuery
+from newscatcherapi.newscatcherapi_hooks import ClientHooks, MetricsCollector, Profiler
+from newscatcherapi.newscatcherapi_transport import (Transport, TransportResponse, RequestsTransport, Urllib3Transport,
+                                                     MemoryTransport, RecordReplayTransport)
+from newscatcherapi.newscatcherapi_watermark import HeadlinesWatermark
+
+import logging
+
+# progress is logged, nothing is output unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -1,5 +1,7 @@
 """Constants and allowed parameter values specified in the NewsCatcher News API."""
 
+from datetime import timedelta
+
 LATEST_HEADLINES_URL = "/v2/latest_headlines"
 SEARCH_URL = "/v2/search"
 SOURCES_URL = "/v2/sources"
@@ -10,6 +12,10 @@ allowed_languages = 'af,ar,bg,bn,ca,cs,cy,cn,da,de,el,en,es,et,fa,fi,fr,gu,he,hi
 #: The topic you want to get articles for.
 allowed_topics = 'news,sport,tech,world,finance,politics,business,economics,entertainment,beauty,travel,music,food,science,gaming,energy'.split(',')
 
+# Sets of the allowed values above, for constant-time validation, the lists being kept for the error messages
+allowed_language_set = frozenset(allowed_languages)
+allowed_topic_set = frozenset(allowed_topics)
+
 # Date precisions
 allowed_precisions = 'timezone unknown,full,date'.split(',')
 
@@ -18,3 +24,21 @@ allowed_search_ins = ['title', 'summary', 'title,summary']
 
 #: The order to sort article results in.  If not specified, the default is ``"relevancy"``.
 allowed_sorts = ['relevancy', 'date', 'rank']
+
+#: How to divide the time interval between ``from_`` and ``to_`` in ``get_search_all_articles``.
+allowed_bys = ['month', 'week', 'day', 'hour']
+
+# Date format of the time windows sent by ``get_search_all_articles``
+WINDOW_DATE_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+# Most articles one query can return, whatever the page number: 100 pages of 100 articles
+MAX_ARTICLES_PER_QUERY = 10000
+
+# Last page number one query can return, whatever the page size
+MAX_PAGES_PER_QUERY = 100
+
+# Time windows of get_search_all_articles are sent with a precision of one second
+WINDOW_RESOLUTION = timedelta(seconds=1)
+
+# Adaptive windows are not split below this size
+MIN_ADAPTIVE_WINDOW = timedelta(minutes=1)
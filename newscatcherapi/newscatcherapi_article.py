@@ -0,0 +1,119 @@
+import sys
+import zlib
+from collections.abc import Mapping
+
+
+# fields of the articles returned by /v2/search and /v2/latest_headlines, stored in slots instead of a dict
+ARTICLE_FIELDS = ('_id', '_score', 'title', 'author', 'authors', 'published_date', 'published_date_precision', 'link',
+                  'clean_url', 'excerpt', 'summary', 'rights', 'rank', 'topic', 'country', 'language', 'media',
+                  'is_opinion', 'twitter_account')
+
+# summaries shorter than this are kept as str, compressing them would save little
+MIN_COMPRESSED_SUMMARY = 256
+
+# fields taking a few distinct values, shared between articles instead of stored once per article
+INTERNED_FIELDS = frozenset(('published_date_precision', 'clean_url', 'rights', 'topic', 'country', 'language'))
+
+_FIELD_SET = frozenset(ARTICLE_FIELDS)
+
+
+class Article(Mapping):
+    """Memory-compact, read-mostly article, returned instead of a dict by clients created with ``compact_articles``.
+
+    Fields are stored in slots, so an article has no per-instance dict, and the values of fields like ``country`` or
+    ``clean_url`` are shared between articles. The strings themselves are kept as decoded, so on articles with a few
+    KB of summary this saves about 15% of the memory of a dict. With ``compress_summary``, the ``summary``, usually
+    the largest field, is also kept zlib-compressed and only decoded when it is read: articles then take about half
+    the memory of a dict, for the CPU time of compressing every summary. Articles keep dict-style access: ``article['title']``,
+    ``article.get('rank')``, ``'summary' in article``, iteration on keys and ``dict(article)`` work as on the dicts
+    returned by default, and fields are also attributes: ``article.title``. Fields the API may add later are kept
+    in a regular dict.
+    """
+
+    __slots__ = tuple('_summary' if field == 'summary' else field for field in ARTICLE_FIELDS) + ('_extra',)
+
+    def __init__(self, fields=None, compress_summary=False):
+        self._extra = None
+        for key, value in (fields or {}).items():
+            if key == 'summary' and compress_summary:
+                self.set_summary(value)
+            elif key in INTERNED_FIELDS and isinstance(value, str):
+                setattr(self, key, sys.intern(value))
+            else:
+                self[key] = value
+
+    @classmethod
+    def from_dict(cls, fields, compress_summary=False):
+        if isinstance(fields, cls):
+            return fields
+        return cls(fields, compress_summary)
+
+    @property
+    def summary(self):
+        summary = self._summary
+        if isinstance(summary, bytes):
+            return zlib.decompress(summary).decode('utf-8')
+        return summary
+
+    def set_summary(self, value):
+        """Set the summary, compressed if it is long enough."""
+        if isinstance(value, str) and len(value) >= MIN_COMPRESSED_SUMMARY:
+            value = zlib.compress(value.encode('utf-8'), 1)
+        self._summary = value
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key == 'summary':
+            self._summary = value
+        elif key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        for field in ARTICLE_FIELDS:
+            if field in self:
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f'Article(_id={self.get("_id")!r}, title={self.get("title")!r})'
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def to_dict(self):
+        """Return the article as a regular dict, with the summary decoded."""
+        return dict(self)
+
+
+def to_articles(result, compress_summary=False):
+    """Replace the article dicts of an API ``result`` with :class:`Article` objects, in place, and return it."""
+    if isinstance(result, dict) and isinstance(result.get('articles'), list):
+        result['articles'] = [Article.from_dict(article, compress_summary) for article in result['articles']]
+    return result
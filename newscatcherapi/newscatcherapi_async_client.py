@@ -0,0 +1,1159 @@
+from __future__ import unicode_literals
+
+import logging
+import time
+from collections import deque
+
+from newscatcherapi import const, utils
+from newscatcherapi.newscatcherapi_article import to_articles
+from newscatcherapi.newscatcherapi_auth import get_auth_headers
+from newscatcherapi.newscatcherapi_dedup import get_deduplicator
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from newscatcherapi.newscatcherapi_hooks import count_articles, get_hooks
+from newscatcherapi.newscatcherapi_json import get_json_decoder
+from newscatcherapi.newscatcherapi_query import PreparedQuery, get_prepared_query
+from newscatcherapi.newscatcherapi_rate_limiter import RateLimiter
+from newscatcherapi.newscatcherapi_retry import RetryPolicy
+from newscatcherapi.newscatcherapi_singleflight import AsyncSingleFlight, get_single_flight
+from newscatcherapi.newscatcherapi_watermark import get_watermark
+from newscatcherapi.newscatcherapi_windows import AdaptiveTimeWindows
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNewsCatcherApiClient(object):
+    """The asyncio counterpart of :class:`NewsCatcherApiClient`.
+
+    Every method of :class:`NewsCatcherApiClient` is available as a coroutine with the same parameters,
+    the same validation and the same response structure, except for the options writing to disk or replacing the
+    HTTP layer, which only the sync client has: ``disk_cache`` and ``transport`` of the constructor, and
+    ``checkpoint``, ``resume`` and ``sink`` of ``get_search_all_articles`` and ``iter_search_articles``. Passing
+    one of them raises a :class:`TypeError`. Requests are sent with `aiohttp`, which is an optional dependency:
+    ``pip install newscatcherapi[async]``.
+
+    :param api_key: Your API key, a length-32 UUID string provided for your NewsCatcher News API account.
+    :type api_key: str
+
+    :param session: An optional :class:`aiohttp.ClientSession` instance from which to execute requests.
+        **Note**: If you provide a ``session`` instance, :class:`AsyncNewsCatcherApiClient` will *not* close the
+        session for you. Otherwise, call ``await client.close()``, or use the client as an async context manager.
+    :type session: aiohttp.ClientSession or None
+
+    :param pool_connections: Total number of simultaneous connections of the session created by the client.
+        Default: `10`. Ignored when ``session`` is provided.
+    :type pool_connections: int
+
+    :param pool_maxsize: Maximum number of simultaneous connections per host of the session created by the client.
+        Default: `10`. Ignored when ``session`` is provided.
+    :type pool_maxsize: int
+
+    :param timeout: Number of seconds to wait for the API to answer before giving up. Default: `30`.
+    :type timeout: int or float
+
+    :param rate_limiter: An optional :class:`RateLimiter` awaited before every API call made by the client. The same
+        instance can be shared with a :class:`NewsCatcherApiClient`.
+    :type rate_limiter: RateLimiter or None
+
+    :param cache: An optional :class:`ResponseCache`, which can be shared with a :class:`NewsCatcherApiClient`.
+    :type cache: ResponseCache or None
+
+    :param retry_policy: An optional :class:`RetryPolicy`, which can be shared with a :class:`NewsCatcherApiClient`.
+        The backoff between two attempts is awaited.
+    :type retry_policy: RetryPolicy or None
+
+    :param json_decoder: Function decoding the response bodies, or a :class:`JsonDecoder` shared between clients.
+        By default, `orjson` is used when it is installed.
+    :type json_decoder: callable or JsonDecoder or None
+
+    :param compact_articles: Default: `False`. Return the articles of `/search` and `/latest_headlines` as
+        :class:`Article` objects instead of dicts. They are accessed the same way but have no per-article dict:
+        fields are stored in slots, which saves about 15% of the memory of articles with a few KB of summary.
+    :type compact_articles: bool
+
+    :param compress_summaries: Default: `False`. With ``compact_articles``, also keep the summary of each
+        :class:`Article` zlib-compressed until it is read. Articles then take about half the memory of dicts, but
+        every summary is compressed as its page arrives.
+    :type compress_summaries: bool
+
+    :param coalesce: Default: `False`. Merge identical calls awaited at the same time into one API call, each
+        caller getting its own result.
+    :type coalesce: bool
+
+    :param hooks: An optional :class:`ClientHooks`, or a list of them, called on the same events as with
+        :class:`NewsCatcherApiClient`. A :class:`MetricsCollector` can be shared between both clients.
+    :type hooks: ClientHooks or list or None
+    """
+
+    def __init__(self, x_api_key, base_url='https://api.newscatcherapi.com', session=None, rate_limiter=None,
+                 pool_connections=10, pool_maxsize=10, timeout=30, cache=None, retry_policy=None,
+                 json_decoder=None, compact_articles=False, coalesce=False, hooks=None, compress_summaries=False,
+                 disk_cache=None, transport=None):
+        _reject_sync_only(disk_cache=disk_cache, transport=transport)
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("AsyncNewsCatcherApiClient requires aiohttp. "
+                              "Install it with `pip install newscatcherapi[async]`")
+        self._aiohttp = aiohttp
+        # imported here rather than with the package, asyncio is slow to import
+        import asyncio
+        self._asyncio = asyncio
+        # aiohttp dependency, used to send the pre-encoded query strings of prepared queries as they are
+        import yarl
+        self._url_class = yarl.URL
+        self.headers = get_auth_headers(x_api_key)
+        self.base_url = base_url
+        self.session = session
+        self._owns_session = session is None
+        self.rate_limiter = rate_limiter
+        self.pool_connections = utils.validate_pool_size(pool_connections, 'pool_connections')
+        self.pool_maxsize = utils.validate_pool_size(pool_maxsize, 'pool_maxsize')
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.cache = cache
+        if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+            raise TypeError("retry_policy param should be a RetryPolicy")
+        self.retry_policy = retry_policy
+        self.json_decoder = get_json_decoder(json_decoder)
+        if compress_summaries and not compact_articles:
+            raise ValueError("compress_summaries param requires compact_articles=True")
+        self.compact_articles = compact_articles
+        self.compress_summaries = compress_summaries
+        self.single_flight = get_single_flight(coalesce, AsyncSingleFlight)
+        self.hooks = get_hooks(hooks)
+        # network errors worth retrying, the request may not have reached the API
+        self._retryable_errors = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying :class:`aiohttp.ClientSession` if it was created by the client."""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        # aiohttp sessions have to be created inside a running event loop
+        if self.session is None:
+            connector = self._aiohttp.TCPConnector(limit=self.pool_connections, limit_per_host=self.pool_maxsize)
+            self.session = self._aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    def _get_proxy(self, proxies):
+        if not proxies:
+            return None
+        return proxies.get(self.base_url.split(':', 1)[0])
+
+    async def _request(self, endpoint, payload, proxies=None, key=None):
+        # payload is the dict of parameters, or the query string of a prepared query, given with its key
+        if key is None:
+            key = utils.make_request_key(endpoint, payload)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                return self._to_result(self.json_decoder.decode(content))
+
+        if self.single_flight is None:
+            _, result = await self._call_api(endpoint, payload, proxies, key)
+            return self._to_result(result)
+
+        (content, result), shared = await self.single_flight.do(
+            key, lambda: self._call_api(endpoint, payload, proxies, key))
+        if shared:
+            # the callers may modify their result, each one decodes its own copy of the shared body
+            result = self.json_decoder.decode(content)
+        return self._to_result(result)
+
+    async def _call_api(self, endpoint, payload, proxies, key):
+        # send the request, retried as per the retry policy, and return the body with its decoded result
+        if isinstance(payload, str):
+            url, params = self._url_class(f'{self.base_url}{endpoint}?{payload}', encoded=True), None
+        else:
+            # aiohttp only accepts str query values, requests sends booleans as "True"/"False" the same way
+            url, params = self.base_url + endpoint, {name: str(value) for name, value in payload.items()}
+
+        hooks = self.hooks
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                await self._acquire(self.rate_limiter)
+
+            # Send Request
+            if hooks is not None:
+                hooks.on_request_start(endpoint, attempt)
+            started = time.perf_counter()
+            try:
+                async with self._get_session().get(url, headers=self.headers, params=params,
+                                                   proxy=self._get_proxy(proxies),
+                                                   timeout=self.timeout) as r:
+                    time_to_headers = time.perf_counter() - started
+                    # Check Status of Request
+                    content = await r.read()
+                    latency = time.perf_counter() - started
+                    if hooks is not None:
+                        hooks.on_phase('time_to_headers', time_to_headers)
+                        hooks.on_phase('download', latency - time_to_headers)
+                    if r.status == 200:
+                        decode_started = time.perf_counter()
+                        try:
+                            result = self.json_decoder.decode(content)
+                        except ValueError:
+                            raise NewsCatcherApiException(self.json_decoder.decode_error(r.status, content))
+                        self._on_phase('decode', decode_started)
+                        if hooks is not None:
+                            hooks.on_response(endpoint, r.status, latency, len(content), count_articles(result),
+                                              attempt)
+
+                        if self.cache is not None:
+                            self.cache.set(key, content)
+
+                        return content, result
+
+                    if hooks is not None:
+                        hooks.on_response(endpoint, r.status, latency, len(content), None, attempt)
+                    delay = None
+                    if self.retry_policy is not None and self.retry_policy.is_retryable_status(r.status):
+                        delay = self.retry_policy.next_delay(attempt, r.headers.get('Retry-After'))
+                    if delay is None:
+                        raise NewsCatcherApiException(self.json_decoder.decode_error(r.status, content))
+                    logger.warning('%s call failed (HTTP %s), retry in %.2fs', endpoint, r.status, delay)
+                    if hooks is not None:
+                        hooks.on_retry(endpoint, attempt, delay, status=r.status)
+            except self._retryable_errors as e:
+                delay = self.retry_policy.next_delay(attempt) if self.retry_policy is not None else None
+                if delay is None:
+                    raise
+                logger.warning('%s call failed (%s), retry in %.2fs', endpoint, type(e).__name__, delay)
+                if hooks is not None:
+                    hooks.on_retry(endpoint, attempt, delay, error=e)
+
+            started = time.perf_counter()
+            await self._asyncio.sleep(delay)
+            self._on_phase('retry_backoff', started)
+
+    def _to_result(self, result):
+        if self.compact_articles:
+            return to_articles(result, self.compress_summaries)
+        return result
+
+    def _on_phase(self, phase, started):
+        # report the time spent in `phase` since the time.perf_counter() value `started`
+        if self.hooks is not None:
+            self.hooks.on_phase(phase, time.perf_counter() - started)
+
+    async def _acquire(self, limiter):
+        started = time.perf_counter()
+        await limiter.acquire_async()
+        self._on_phase('rate_limit_wait', started)
+
+    async def get_latest_headlines(
+            self,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=None,
+            page=None,
+            proxies=None
+    ):
+        """Call the `/latest_headlines` endpoint.
+
+        Same parameters and response as :meth:`NewsCatcherApiClient.get_latest_headlines`.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        payload = utils.build_latest_headlines_payload(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size,
+            page=page
+        )
+
+        return await self._request(const.LATEST_HEADLINES_URL, payload, proxies)
+
+    async def get_search(
+        self,
+        q=None,
+        lang=None,
+        not_lang=None,
+        from_=None,
+        to_=None,
+        published_date_precision=None,
+        search_in=None,
+        countries=None,
+        not_countries=None,
+        topic=None,
+        sources=None,
+        not_sources=None,
+        ranked_only=None,
+        from_rank=None,
+        to_rank=None,
+        sort_by=None,
+        page_size=None,
+        page=None,
+        proxies=None
+    ):
+        """Call the `/search` endpoint.
+
+        Same parameters and response as :meth:`NewsCatcherApiClient.get_search`.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        payload = utils.build_search_payload(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            page=page
+        )
+
+        return await self._request(const.SEARCH_URL, payload, proxies)
+
+    async def get_sources(self,
+                          lang=None,
+                          countries=None,
+                          topic=None,
+                          proxies=None):
+        """Call the `/sources` endpoint.
+
+        Same parameters and response as :meth:`NewsCatcherApiClient.get_sources`.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        payload = utils.build_sources_payload(lang=lang, countries=countries, topic=topic)
+
+        return await self._request(const.SOURCES_URL, payload, proxies)
+
+    def prepare_search(
+        self,
+        q=None,
+        lang=None,
+        not_lang=None,
+        from_=None,
+        to_=None,
+        published_date_precision=None,
+        search_in=None,
+        countries=None,
+        not_countries=None,
+        topic=None,
+        sources=None,
+        not_sources=None,
+        ranked_only=None,
+        from_rank=None,
+        to_rank=None,
+        sort_by=None,
+        page_size=None,
+        page=None
+    ):
+        """Validate the parameters of a `/search` call once and return it as a :class:`PreparedQuery`.
+
+        Same as :meth:`NewsCatcherApiClient.prepare_search`, the query being sent with ``await client.fetch(query)``.
+
+        :return: The prepared query, to send with :meth:`fetch`.
+        :rtype: PreparedQuery
+        """
+        return PreparedQuery(const.SEARCH_URL, utils.build_search_payload(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            page=page
+        ))
+
+    def prepare_latest_headlines(
+            self,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=None,
+            page=None
+    ):
+        """Validate the parameters of a `/latest_headlines` call once and return it as a :class:`PreparedQuery`.
+
+        Same as :meth:`NewsCatcherApiClient.prepare_latest_headlines`, the query being sent with
+        ``await client.fetch(query)``.
+
+        :return: The prepared query, to send with :meth:`fetch`.
+        :rtype: PreparedQuery
+        """
+        return PreparedQuery(const.LATEST_HEADLINES_URL, utils.build_latest_headlines_payload(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size,
+            page=page
+        ))
+
+    async def fetch(self, query, proxies=None):
+        """Call the API with a query returned by :meth:`prepare_search` or :meth:`prepare_latest_headlines`.
+
+        Same as :meth:`NewsCatcherApiClient.fetch`.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        query = get_prepared_query(query)
+        return await self._request(query.endpoint, query.query_string, proxies, query.key)
+
+    async def _fetch_page(self, get_page, current_page, nb_pages):
+        logger.debug('%s/%s page is going to be extracted', current_page, nb_pages or '?')
+
+        try:
+            result = await get_page(current_page)
+        except NewsCatcherApiException as e:
+            logger.warning('%s page has not been extracted due to an error: %s', current_page, e)
+            return None
+        self._on_page(current_page, nb_pages, result)
+        return result
+
+    def _on_page(self, page, nb_pages, result):
+        if self.hooks is not None:
+            self.hooks.on_page(page, nb_pages, count_articles(result))
+
+    def _get_pacer(self, seconds_pause):
+        if self.rate_limiter is not None:
+            return None
+        return RateLimiter.from_seconds_pause(seconds_pause)
+
+    def _search_page_getter(self, query, proxies):
+        def get_page(page_number):
+            started = time.perf_counter()
+            page_query = query.page(page_number)
+            self._on_phase('validation', started)
+            return self.fetch(page_query, proxies)
+
+        return get_page
+
+    async def _iter_pages(self, get_page, page, max_page, pacer, max_workers, first_result=None):
+        if pacer is not None:
+            unpaced_get_page = get_page
+
+            async def get_page(page_number):
+                await self._acquire(pacer)
+                return await unpaced_get_page(page_number)
+
+        nb_pages = None
+        if max_page is not None:
+            nb_pages = utils.validate_max_page(max_page, page)
+        if max_workers is not None:
+            utils.validate_max_workers(max_workers)
+
+        if first_result is None:
+            logger.debug('%s page is going to be extracted', page)
+            first_result = await get_page(page)
+
+        if 'articles' not in first_result.keys():
+            yield page, first_result
+            return
+
+        logger.debug('Total number of found articles => %s. Total number of pages %s.',
+                     first_result['total_hits'], first_result['total_pages'])
+
+        if not nb_pages or (max_page and max_page > first_result["total_pages"]):
+            nb_pages = first_result["total_pages"]
+        self._on_page(page, nb_pages, first_result)
+        yield page, first_result
+
+        async def fetch_page(current_page):
+            return current_page, await self._fetch_page(get_page, current_page, nb_pages)
+
+        async for result in _imap_ordered(fetch_page, _aiter(range(page + 1, nb_pages + 1)), max_workers):
+            yield result
+
+    async def _iter_page_results(self, get_page, page, max_page, page_size, pacer, max_workers, limit,
+                                 first_result=None, dedup=None):
+        # see NewsCatcherApiClient._iter_page_results
+        remaining = limit
+        last_page = None
+        while True:
+            batch_max_page = max_page
+            if remaining is not None:
+                batch_max_page = utils.get_max_page_for_limit(remaining, page, page_size, max_page)
+
+            pages = self._iter_pages(get_page, page, batch_max_page, pacer, max_workers, first_result)
+            try:
+                async for page_number, result in pages:
+                    if result is None:
+                        continue
+                    if 'articles' not in result.keys():
+                        return
+                    if page_number == page:
+                        last_page = (result['total_pages'] if max_page is None
+                                     else min(max_page, result['total_pages']))
+
+                    if dedup is not None:
+                        result['articles'] = dedup.filter(result['articles'])
+                    if remaining is not None:
+                        result['articles'] = result['articles'][:remaining]
+                        remaining -= len(result['articles'])
+
+                    yield result
+
+                    if remaining == 0:
+                        return
+            except NewsCatcherApiException as e:
+                if last_page is None:
+                    raise
+                logger.warning('%s page has not been extracted due to an error: %s', page, e)
+                batch_max_page = page
+            finally:
+                await pages.aclose()
+
+            if remaining is None or batch_max_page >= last_page:
+                return
+            page, first_result = batch_max_page + 1, None
+
+    async def _get_all_pages(self, get_page, page, max_page, pacer, max_workers, first_result=None, dedup=None):
+        pages = self._iter_pages(get_page, page, max_page, pacer, max_workers, first_result)
+
+        _, first_result = await pages.__anext__()
+        if 'articles' not in first_result.keys():
+            await pages.aclose()
+            return first_result
+
+        filter_articles = dedup.filter if dedup is not None else list
+        all_articles = filter_articles(first_result['articles'])
+        async for _, one_call_results in pages:
+            if one_call_results is not None:
+                all_articles.extend(filter_articles(one_call_results['articles']))
+
+        final_results = first_result
+        final_results['articles'] = all_articles
+
+        return final_results
+
+    async def _iter_search_windows(self, search_params, from_, to_, by, page, page_size, max_page, pacer, adaptive):
+        started = time.perf_counter()
+        from_datetime, to_datetime, delta = utils.get_search_interval(from_, to_, by)
+        self._on_phase('date_parsing', started)
+        started = time.perf_counter()
+        query = self.prepare_search(**{name: value for name, value in search_params.items() if name != 'proxies'})
+        self._on_phase('validation', started)
+        proxies = search_params['proxies']
+
+        if not adaptive:
+            for window_from, window_to in utils.iter_time_windows(from_datetime, to_datetime, delta):
+                window = (utils.format_window_date(window_from), utils.format_window_date(window_to))
+                logger.debug('%s --> %s', *window)
+                if self.hooks is not None:
+                    self.hooks.on_window(window[0], window[1], None)
+                yield self._search_page_getter(query.window(*window), proxies), None
+            return
+
+        windows = AdaptiveTimeWindows(from_datetime, to_datetime, delta,
+                                      utils.get_window_max_hits(page, page_size, max_page))
+        while windows.current() is not None:
+            window_from, window_to = windows.current()
+            window = (utils.format_window_date(window_from), utils.format_window_date(window_to))
+            logger.debug('%s --> %s', *window)
+            get_page = self._search_page_getter(query.window(*window), proxies)
+            if pacer is not None:
+                await self._acquire(pacer)
+            first_result = await get_page(page)
+
+            total_hits = first_result.get('total_hits', 0) if 'articles' in first_result.keys() else 0
+            if not windows.submit(total_hits):
+                logger.debug('%s articles found, the window is split in half', total_hits)
+                continue
+            if total_hits > windows.max_hits:
+                logger.warning('%s articles found, only %s can be extracted from the %s --> %s window',
+                               total_hits, windows.max_hits, *window)
+
+            if self.hooks is not None:
+                self.hooks.on_window(window[0], window[1], total_hits)
+            yield get_page, first_result
+
+    async def get_latest_headlines_all_pages(
+            self,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=100,
+            page=1,
+            max_page=None,
+            seconds_pause=1.0,
+            proxies=None,
+            max_workers=None,
+            dedup=False
+    ):
+        """Call the `/latest_headlines` endpoint the number of time sufficient to get all latest articles for a given search.
+
+        Same parameters and response as :meth:`NewsCatcherApiClient.get_latest_headlines_all_pages`. The pause
+        between calls is awaited, so it does not block the event loop. With ``max_workers``, up to that many
+        pages are in flight at once.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        query = self.prepare_latest_headlines(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size
+        )
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return await self._get_all_pages(get_page, page, max_page, self._get_pacer(seconds_pause), max_workers,
+                                         dedup=get_deduplicator(dedup))
+
+    async def get_search_all_pages(
+        self,
+        q=None,
+        lang=None,
+        not_lang=None,
+        from_=None,
+        to_=None,
+        published_date_precision=None,
+        search_in=None,
+        countries=None,
+        not_countries=None,
+        topic=None,
+        sources=None,
+        not_sources=None,
+        ranked_only=None,
+        from_rank=None,
+        to_rank=None,
+        sort_by=None,
+        page_size=100,
+        page=1,
+        max_page=None,
+        seconds_pause=1.0,
+        proxies=None,
+        max_workers=None,
+        dedup=False
+    ):
+        """Call the `/search` endpoint the number of time sufficient to get all latest articles for a given search.
+
+        Same parameters and response as :meth:`NewsCatcherApiClient.get_search_all_pages`. The pause between
+        calls is awaited, so it does not block the event loop. With ``max_workers``, up to that many pages are
+        in flight at once.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        query = self.prepare_search(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size
+        )
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return await self._get_all_pages(get_page, page, max_page, self._get_pacer(seconds_pause), max_workers,
+                                         dedup=get_deduplicator(dedup))
+
+    async def get_search_all_articles(
+            self,
+            q=None,
+            lang=None,
+            not_lang=None,
+            from_=None,
+            to_=None,
+            published_date_precision=None,
+            search_in=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            by='week',
+            sources=None,
+            not_sources=None,
+            ranked_only=None,
+            from_rank=None,
+            to_rank=None,
+            sort_by=None,
+            page_size=100,
+            page=1,
+            max_page=None,
+            seconds_pause=1.0,
+            proxies=None,
+            adaptive=False,
+            max_workers=None,
+            dedup=False,
+            checkpoint=None,
+            resume=False,
+            sink=None):
+        """Call the `/search` endpoint the number of time sufficient to get all latest articles for a given search.
+
+        Same parameters and response as :meth:`NewsCatcherApiClient.get_search_all_articles`, except ``checkpoint``,
+        ``resume`` and ``sink``, which raise a :class:`TypeError`. With ``max_workers``, up to that many time windows
+        are extracted at once.
+
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        _reject_sync_only(checkpoint=checkpoint, resume=resume, sink=sink)
+        # initialize response dict/object
+        payload = utils.init_final_res()
+
+        search_params = dict(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            proxies=proxies
+        )
+
+        pacer = self._get_pacer(seconds_pause)
+
+        if max_workers is not None:
+            utils.validate_max_workers(max_workers)
+        dedup = get_deduplicator(dedup)
+
+        async def get_window(window):
+            get_page, first_result = window
+            return await self._get_all_pages(get_page, page, max_page, pacer, None, first_result)
+
+        windows = self._iter_search_windows(search_params, from_, to_, by, page, page_size, max_page, pacer, adaptive)
+        async for results in _imap_ordered(get_window, windows, max_workers):
+            if dedup is not None and 'articles' in results.keys():
+                results['articles'] = dedup.filter(results['articles'])
+            utils.update_final_res(results, payload)
+
+        return utils.finalize_final_res(results, payload, page_size, by)
+
+    def iter_search_batch(self, queries, max_page=None, seconds_pause=1.0, proxies=None, max_workers=None):
+        """Async generator version of :meth:`NewsCatcherApiClient.iter_search_batch`, use it with ``async for``.
+
+        Same parameters and pages. With ``max_workers``, up to that many pages are in flight at once.
+
+        :return: Async generator of ``(query_id, result)`` pairs, one per page.
+        :rtype: async generator of tuple
+        """
+        queries = {query_id: self.prepare_search(**params)
+                   for query_id, params in utils.validate_batch_queries(queries)}
+        if max_page is not None:
+            utils.validate_max_page(max_page, 1)
+        if max_workers is not None:
+            utils.validate_max_workers(max_workers)
+        return self._iter_search_batch(queries, max_page, self._get_pacer(seconds_pause), proxies, max_workers)
+
+    async def _iter_search_batch(self, queries, max_page, pacer, proxies, max_workers):
+        nb_pages = {}
+
+        async def fetch_page(task):
+            query_id, page_number = task
+
+            async def get_page(page_number):
+                if pacer is not None:
+                    await self._acquire(pacer)
+                return await self.fetch(queries[query_id].page(page_number), proxies)
+
+            logger.debug('query %s', query_id)
+            return query_id, await self._fetch_page(get_page, page_number, nb_pages.get(query_id))
+
+        first_pages = _aiter([(query_id, 1) for query_id in queries])
+        async for query_id, result in _imap_ordered(fetch_page, first_pages, max_workers):
+            if result is None or 'articles' not in result.keys():
+                continue
+            nb_pages[query_id] = utils.get_window_last_page(result, max_page)
+            yield query_id, result
+
+        async for query_id, result in _imap_ordered(fetch_page, _aiter(utils.iter_batch_rounds(nb_pages)),
+                                                    max_workers):
+            if result is not None:
+                yield query_id, result
+
+    def iter_latest_headlines_pages(
+            self,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=100,
+            page=1,
+            max_page=None,
+            seconds_pause=1.0,
+            proxies=None,
+            max_workers=None,
+            limit=None,
+            dedup=False
+    ):
+        """Async generator version of :meth:`get_latest_headlines_all_pages`, use it with ``async for``.
+
+        Same parameters and pages as :meth:`NewsCatcherApiClient.iter_latest_headlines_pages`.
+
+        :return: Async generator of JSON responses, one per page, in page order.
+        :rtype: async generator of dict
+        """
+        query = self.prepare_latest_headlines(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size
+        )
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return self._iter_page_results(get_page, page, max_page, page_size, self._get_pacer(seconds_pause),
+                                       max_workers, limit, dedup=get_deduplicator(dedup))
+
+    def poll_latest_headlines(
+            self,
+            watermark,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=100,
+            seconds_pause=1.0,
+            proxies=None
+    ):
+        """Async generator version of :meth:`NewsCatcherApiClient.poll_latest_headlines`, use it with ``async for``.
+
+        :return: Async generator of the new articles, newest first.
+        :rtype: async generator of dict
+        """
+        watermark = get_watermark(watermark)
+        query = self.prepare_latest_headlines(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size
+        )
+        watermark.bind(dict(query.params))
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return self._iter_new_articles(watermark, get_page, self._get_pacer(seconds_pause))
+
+    async def _iter_new_articles(self, watermark, get_page, pacer):
+        if pacer is not None:
+            unpaced_get_page = get_page
+
+            async def get_page(page_number):
+                await self._acquire(pacer)
+                return await unpaced_get_page(page_number)
+
+        nb_new = 0
+        try:
+            first_result = await get_page(1)
+            if 'articles' not in first_result.keys():
+                return
+            nb_pages = first_result['total_pages']
+            self._on_page(1, nb_pages, first_result)
+
+            for page_number in range(nb_pages, 0, -1):
+                if page_number == 1:
+                    result = first_result
+                else:
+                    result = await self._fetch_page(get_page, page_number, nb_pages)
+                    if result is None:
+                        continue
+
+                nb_page_new = 0
+                for article in reversed(result['articles']):
+                    if watermark.add(article):
+                        nb_page_new += 1
+                        yield article
+                nb_new += nb_page_new
+                if not nb_page_new:
+                    logger.debug('%s page only has known articles, polling stops', page_number)
+                    return
+        finally:
+            watermark.save()
+            logger.info('%s new articles, the latest published at %s', nb_new, watermark.latest)
+
+    def iter_search_pages(
+        self,
+        q=None,
+        lang=None,
+        not_lang=None,
+        from_=None,
+        to_=None,
+        published_date_precision=None,
+        search_in=None,
+        countries=None,
+        not_countries=None,
+        topic=None,
+        sources=None,
+        not_sources=None,
+        ranked_only=None,
+        from_rank=None,
+        to_rank=None,
+        sort_by=None,
+        page_size=100,
+        page=1,
+        max_page=None,
+        seconds_pause=1.0,
+        proxies=None,
+        max_workers=None,
+        limit=None,
+        dedup=False
+    ):
+        """Async generator version of :meth:`get_search_all_pages`, use it with ``async for``.
+
+        Same parameters and pages as :meth:`NewsCatcherApiClient.iter_search_pages`.
+
+        :return: Async generator of JSON responses, one per page, in page order.
+        :rtype: async generator of dict
+        """
+        query = self.prepare_search(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size
+        )
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return self._iter_page_results(get_page, page, max_page, page_size, self._get_pacer(seconds_pause),
+                                       max_workers, limit, dedup=get_deduplicator(dedup))
+
+    async def iter_search_articles(
+            self,
+            q=None,
+            lang=None,
+            not_lang=None,
+            from_=None,
+            to_=None,
+            published_date_precision=None,
+            search_in=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            by='week',
+            sources=None,
+            not_sources=None,
+            ranked_only=None,
+            from_rank=None,
+            to_rank=None,
+            sort_by=None,
+            page_size=100,
+            page=1,
+            max_page=None,
+            seconds_pause=1.0,
+            proxies=None,
+            adaptive=False,
+            limit=None,
+            dedup=False,
+            checkpoint=None,
+            resume=False):
+        """Async generator version of :meth:`get_search_all_articles`, use it with ``async for``.
+
+        Same parameters and articles as :meth:`NewsCatcherApiClient.iter_search_articles`, except ``checkpoint`` and
+        ``resume``, which raise a :class:`TypeError`.
+
+        :return: Async generator of articles, window after window and page after page.
+        :rtype: async generator of dict
+        """
+        _reject_sync_only(checkpoint=checkpoint, resume=resume)
+        if limit is not None:
+            utils.validate_limit(limit)
+
+        search_params = dict(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            proxies=proxies
+        )
+
+        pacer = self._get_pacer(seconds_pause)
+        remaining = limit
+        dedup = get_deduplicator(dedup)
+
+        windows = self._iter_search_windows(search_params, from_, to_, by, page, page_size, max_page, pacer, adaptive)
+        async for get_page, first_result in windows:
+            async for result in self._iter_page_results(get_page, page, max_page, page_size, pacer, None, remaining,
+                                                        first_result, dedup):
+                for article in result['articles']:
+                    yield article
+                if remaining is not None:
+                    remaining -= len(result['articles'])
+
+            if remaining == 0:
+                return
+
+
+def _reject_sync_only(**options):
+    for name, value in options.items():
+        if value is not None and value is not False:
+            raise TypeError(f"{name} param is not supported by AsyncNewsCatcherApiClient, "
+                            f"use NewsCatcherApiClient")
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _imap_ordered(func, items, max_workers):
+    # asyncio counterpart of utils.imap_ordered, items is an async iterable
+    if not max_workers or max_workers == 1:
+        async for item in items:
+            yield await func(item)
+        return
+
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    in_flight = deque()
+    try:
+        async for item in items:
+            if len(in_flight) >= 2 * max_workers:
+                yield await in_flight.popleft()
+            in_flight.append(asyncio.ensure_future(run(item)))
+
+        while in_flight:
+            yield await in_flight.popleft()
+    finally:
+        for task in in_flight:
+            task.cancel()
@@ -7,9 +7,14 @@ class NewsCatcherApiAuth(AuthBase):
         self.x_api_key = x_api_key
 
     def __call__(self, request):
-        request.headers.update(get_auth_headers(self.x_api_key))
+        request.headers.update(self.headers)
         return request
 
+    @property
+    def headers(self):
+        # sent by the transports, which do not all take a requests auth object
+        return get_auth_headers(self.x_api_key)
+
 
 def get_auth_headers(x_api_key):
     return {"Content-Type": "Application/JSON", "x-api-key": x_api_key}
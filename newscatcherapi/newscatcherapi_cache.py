@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from newscatcherapi import const, utils
+
+
+class ResponseCache(object):
+    """In-memory LRU cache of successful API responses, keyed on the endpoint and the validated query parameters.
+
+    Pass it to :class:`NewsCatcherApiClient` to answer repeated identical calls without spending quota. The raw
+    response body is stored and decoded again on each hit, so callers can freely modify the returned dictionary.
+    The least recently used entries are evicted once ``max_entries`` or ``max_bytes`` is reached. It is safe to
+    share between threads and clients.
+
+    :param ttl: Number of seconds a response stays valid. `None` keeps it until it is evicted. Default: `60`.
+    :type ttl: int or float or None
+
+    :param endpoint_ttls: Per-endpoint TTLs overriding ``ttl``, keyed on the endpoint path, for example
+        ``{const.SOURCES_URL: 3600, const.SEARCH_URL: 0}``. A TTL of `0` disables caching for that endpoint.
+    :type endpoint_ttls: dict or None
+
+    :param max_entries: Most responses kept. Default: `1024`.
+    :type max_entries: int
+
+    :param max_bytes: Most bytes of response bodies kept. Default: 64 MiB.
+    :type max_bytes: int
+    """
+
+    def __init__(self, ttl=60, endpoint_ttls=None, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        if ttl is not None and not utils.is_valid_num(ttl):
+            raise TypeError("ttl param should be of type int or float")
+        self.ttl = ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self.max_entries = utils.validate_pool_size(max_entries, 'max_entries')
+        self.max_bytes = utils.validate_pool_size(max_bytes, 'max_bytes')
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nb_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_ttl(self, endpoint):
+        return self.endpoint_ttls.get(endpoint, self.ttl)
+
+    def get(self, key):
+        """Return the cached body for ``key``, or ``None`` if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, content):
+        """Store the response body ``content`` for ``key``, the endpoint being the first item of the key."""
+        ttl = self.get_ttl(key[0])
+        if ttl == 0 or len(content) > self.max_bytes:
+            return
+
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, content)
+            self.nb_bytes += len(content)
+
+            while len(self._entries) > self.max_entries or self.nb_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nb_bytes = 0
+
+    def stats(self):
+        """Return the hit/miss counters and the current size of the cache as a dict."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self.nb_bytes}
+
+    def _remove(self, key):
+        _, content = self._entries.pop(key)
+        self.nb_bytes -= len(content)
+
+
+class SearchWindowCache(object):
+    """SQLite-backed cache of ``/v2/search`` pages of time windows, persisted across runs.
+
+    Pass it to :class:`NewsCatcherApiClient` as ``disk_cache`` to re-run or extend a ``get_search_all_articles``
+    backfill without fetching the past windows again. Only search calls with both ``from_`` and ``to_`` are cached.
+    A page fetched more than ``settle_time`` seconds after the end of its window is treated as immutable and never
+    expires. A page of a window close to "now" expires ``tail_ttl`` seconds after it was fetched, so only the tail
+    of a backfill is fetched again.
+
+    :param path: Path of the SQLite database file, created if needed.
+    :type path: str
+
+    :param settle_time: Number of seconds after the end of a window from which its results no longer change.
+        Default: one day.
+    :type settle_time: int or float
+
+    :param tail_ttl: Number of seconds a page of a recent window stays valid. Default: one hour.
+    :type tail_ttl: int or float
+    """
+
+    def __init__(self, path, settle_time=24 * 3600, tail_ttl=3600):
+        if not utils.is_valid_num(settle_time) or not utils.is_valid_num(tail_ttl):
+            raise TypeError("settle_time and tail_ttl params should be of type int or float")
+        self.path = path
+        self.settle_time = settle_time
+        self.tail_ttl = tail_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # imported here rather than with the package, most runs use no SQLite file
+        import sqlite3
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS search_pages '
+                                 '(key TEXT PRIMARY KEY, content BLOB NOT NULL, expires_at REAL)')
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def get(self, key):
+        """Return the cached body for ``key``, or ``None`` if it is missing, expired or not a search window."""
+        if _get_window_to(key) is None:
+            return None
+
+        with self._lock:
+            row = self._connection.execute('SELECT content, expires_at FROM search_pages WHERE key = ?',
+                                           (_serialize_key(key),)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= time.time()):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return bytes(row[0])
+
+    def set(self, key, content):
+        """Store the response body ``content`` for ``key`` if it is a page of a search window."""
+        window_to = _get_window_to(key)
+        if window_to is None:
+            return
+
+        # naive window dates are UTC, like the time windows of get_search_all_articles
+        now = time.time()
+        window_closed_for = now - (window_to - datetime(1970, 1, 1)).total_seconds()
+        expires_at = None if window_closed_for >= self.settle_time else now + self.tail_ttl
+
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO search_pages (key, content, expires_at) VALUES (?, ?, ?)',
+                                     (_serialize_key(key), content, expires_at))
+            self._connection.commit()
+
+    def purge(self):
+        """Delete the expired pages from the database file."""
+        with self._lock:
+            self._connection.execute('DELETE FROM search_pages WHERE expires_at <= ?', (time.time(),))
+            self._connection.commit()
+
+    def stats(self):
+        """Return the hit/miss counters and the number of stored pages as a dict."""
+        with self._lock:
+            entries = self._connection.execute('SELECT COUNT(*) FROM search_pages').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+
+def _serialize_key(key):
+    return json.dumps([key[0], [list(item) for item in key[1]]])
+
+
+def _get_window_to(key):
+    endpoint, items = key
+    if endpoint != const.SEARCH_URL:
+        return None
+    payload = dict(items)
+    if 'from' not in payload or 'to' not in payload:
+        return None
+    return utils.parse_date(payload['to'])
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+
+class SearchCheckpoint(object):
+    """Journal of the pages already extracted by a ``get_search_all_articles`` run, used to resume it.
+
+    The journal at ``path`` is a JSON Lines file: a header identifying the search, then one line per extracted
+    page with the file its response was written to. Responses are written in the ``<path>.pages`` directory. Lines are appended and flushed as pages arrive, so a run that crashes or is
+    killed loses at most the page in progress.
+
+    When resuming, the pages found in the journal are read back from disk instead of being requested again.
+    Pages are keyed on their time window, so extending the interval of a backfill with the same ``from_`` and
+    ``by`` also reuses the windows already extracted.
+
+    :param path: Path of the journal file.
+    :type path: str
+
+    :param query: The search parameters, except ``from_`` and ``to_``. Resuming a journal written for other
+        parameters raises a :class:`ValueError`.
+    :type query: dict
+
+    :param resume: Continue the journal at ``path`` if it exists. Otherwise, any previous journal and its pages are
+        discarded.
+    :type resume: bool
+    """
+
+    def __init__(self, path, query, resume=False):
+        self.path = path
+        self.pages_dir = path + '.pages'
+        self.query = json.loads(json.dumps(query, sort_keys=True))
+        self.nb_reused_pages = 0
+        self._pages = {}
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            self._load()
+            os.makedirs(self.pages_dir, exist_ok=True)
+            self._journal = open(path, 'a', encoding='utf-8')
+        else:
+            # pages of a previous run must not be replayed by a later resume of this one
+            shutil.rmtree(self.pages_dir, ignore_errors=True)
+            os.makedirs(self.pages_dir)
+            self._journal = open(path, 'w', encoding='utf-8')
+            self._append({'query': self.query})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._journal.close()
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as journal:
+            lines = journal.read().splitlines()
+
+        if not lines or json.loads(lines[0]).get('query') != self.query:
+            raise ValueError(f"{self.path} is a checkpoint of another search and cannot be resumed")
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # the last line of a killed run can be incomplete
+                continue
+            if 'page' in entry:
+                self._pages[(entry['window'], entry['page'])] = entry['file']
+
+    def _append(self, entry):
+        self._journal.write(json.dumps(entry) + '\n')
+        self._journal.flush()
+
+    def wrap(self, window_from, window_to, get_page, load_hook=None):
+        """Return a ``get_page`` reading the pages of the journal from disk and recording the new ones.
+
+        ``load_hook``, if any, is applied to the pages read from disk, to return them in the form ``get_page`` does.
+        """
+        window = _window_key(window_from, window_to)
+
+        def checkpointed_get_page(page_number):
+            file_name = self._pages.get((window, page_number))
+            if file_name is not None:
+                with open(os.path.join(self.pages_dir, file_name), encoding='utf-8') as page_file:
+                    result = json.load(page_file)
+                with self._lock:
+                    self.nb_reused_pages += 1
+                return load_hook(result) if load_hook is not None else result
+
+            result = get_page(page_number)
+
+            file_name = f'{hashlib.sha1(window.encode("utf-8")).hexdigest()[:20]}-{page_number}.json'
+            temp_path = os.path.join(self.pages_dir, file_name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as page_file:
+                # compact Article objects are written as regular dicts
+                json.dump(result, page_file, default=dict)
+            os.replace(temp_path, os.path.join(self.pages_dir, file_name))
+
+            with self._lock:
+                self._pages[(window, page_number)] = file_name
+                self._append({'window': window, 'page': page_number, 'file': file_name})
+            return result
+
+        return checkpointed_get_page
+
+
+def _window_key(window_from, window_to):
+    return f'{window_from}|{window_to}'
@@ -1,18 +1,32 @@
 from __future__ import unicode_literals
 
 import requests
+import logging
 import os
 import sys
 import time
-from datetime import date, datetime, timedelta
-from dateparser import parse as parse_date
 
 sys.path.append(os.getcwd())
 
 
 from newscatcherapi import const, utils
+from newscatcherapi.newscatcherapi_article import to_articles
 from newscatcherapi.newscatcherapi_auth import NewsCatcherApiAuth
+from newscatcherapi.newscatcherapi_checkpoint import SearchCheckpoint
+from newscatcherapi.newscatcherapi_dedup import get_deduplicator
 from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from newscatcherapi.newscatcherapi_hooks import count_articles, get_hooks
+from newscatcherapi.newscatcherapi_json import get_json_decoder
+from newscatcherapi.newscatcherapi_query import PreparedQuery, get_prepared_query
+from newscatcherapi.newscatcherapi_rate_limiter import RateLimiter
+from newscatcherapi.newscatcherapi_retry import RetryPolicy
+from newscatcherapi.newscatcherapi_singleflight import SingleFlight, get_single_flight
+from newscatcherapi.newscatcherapi_sinks import get_article_sink
+from newscatcherapi.newscatcherapi_transport import RequestsTransport, get_transport
+from newscatcherapi.newscatcherapi_watermark import get_watermark
+from newscatcherapi.newscatcherapi_windows import AdaptiveTimeWindows
+
+logger = logging.getLogger(__name__)
 
 
 class NewsCatcherApiClient(object):
@@ -23,19 +37,450 @@ class NewsCatcherApiClient(object):
     :type api_key: str
 
     :param session: An optional :class:`requests.Session` instance from which to execute requests.
+        By default, the client creates its own session, which keeps connections alive between calls. Call
+        ``close()``, or use the client as a context manager, to close the sockets and free up resources.
         **Note**: If you provide a ``session`` instance, :class:`NewsCatcherApiClient` will *not* close the session
         for you.  Remember to call ``session.close()``, or use the session as a context manager, to close
         the socket and free up resources.
     :type session: `requests.Session <https://2.python-requests.org/en/master/user/advanced/#session-objects>`_ or None
+
+    :param pool_connections: Number of per-host connection pools kept by the session created by the client.
+        Default: `10`. Ignored when ``session`` is provided.
+    :type pool_connections: int
+
+    :param pool_maxsize: Maximum number of connections kept alive per host by the session created by the client.
+        Set it to at least the ``max_workers`` you use for concurrent pagination. Default: `10`. Ignored when
+        ``session`` is provided.
+    :type pool_maxsize: int
+
+    :param timeout: Number of seconds to wait for the API to answer before giving up. Default: `30`.
+    :type timeout: int or float or tuple
+
+    :param rate_limiter: An optional :class:`RateLimiter` applied to every API call made by the client, right before
+        the request is sent. It is safe to share between threads and clients. When it is set, the ``seconds_pause``
+        parameter of the ``*_all_pages`` and ``*_all_articles`` methods is ignored.
+    :type rate_limiter: RateLimiter or None
+
+    :param cache: An optional :class:`ResponseCache`. Identical calls, same endpoint and same parameters, are then
+        answered from memory while the cached response is fresh, without calling the API.
+    :type cache: ResponseCache or None
+
+    :param disk_cache: An optional :class:`SearchWindowCache` persisting the `/search` pages of time windows to
+        disk, so re-running or extending a backfill only fetches the windows that may still change.
+    :type disk_cache: SearchWindowCache or None
+
+    :param retry_policy: An optional :class:`RetryPolicy`. Calls failing with a rate limit or server error status,
+        a timeout or a connection error are then retried with an exponential backoff instead of failing right away.
+        Each attempt goes through the ``rate_limiter``.
+    :type retry_policy: RetryPolicy or None
+
+    :param json_decoder: Function decoding the response bodies, like ``orjson.loads``, or a :class:`JsonDecoder`
+        shared between clients. By default, `orjson` is used when it is installed. Each body is decoded once and
+        ``client.json_decoder.stats()`` gives the time spent decoding.
+    :type json_decoder: callable or JsonDecoder or None
+
+    :param compact_articles: Default: `False`. Return the articles of `/search` and `/latest_headlines` as
+        :class:`Article` objects instead of dicts. They are accessed the same way but have no per-article dict:
+        fields are stored in slots, which saves about 15% of the memory of articles with a few KB of summary.
+    :type compact_articles: bool
+
+    :param compress_summaries: Default: `False`. With ``compact_articles``, also keep the summary of each
+        :class:`Article` zlib-compressed until it is read. Articles then take about half the memory of dicts, but
+        every summary is compressed as its page arrives.
+    :type compress_summaries: bool
+
+    :param coalesce: Default: `False`. Merge identical calls, same endpoint and same parameters, made by several
+        threads at the same time: only the first one reaches the API, the others wait for its response. Each caller
+        still gets its own result. ``client.single_flight.nb_coalesced`` counts the calls saved.
+    :type coalesce: bool
+
+    :param hooks: An optional :class:`ClientHooks`, or a list of them, called when a request is sent, a response
+        received or a call retried, with its endpoint, latency, status, bytes and number of articles, and when
+        a page or a time window of a multi-page extraction is done. :class:`MetricsCollector` is a built-in one
+        keeping latency histograms. Progress is reported through the ``newscatcherapi`` logger, not printed.
+    :type hooks: ClientHooks or list or None
+
+    :param transport: An optional :class:`Transport` sending the HTTP requests instead of a `requests` session:
+        :class:`Urllib3Transport` for less overhead per call, :class:`MemoryTransport` to answer in memory, or
+        :class:`RecordReplayTransport` to record responses and replay them without network access. Cannot be used
+        with ``session``. **Note**: the client does *not* close a transport you provide.
+    :type transport: Transport or None
     """
 
-    def __init__(self, x_api_key, base_url='https://api.newscatcherapi.com', session=None):
+    def __init__(self, x_api_key, base_url='https://api.newscatcherapi.com', session=None, rate_limiter=None,
+                 pool_connections=10, pool_maxsize=10, timeout=30, cache=None, disk_cache=None, retry_policy=None,
+                 json_decoder=None, compact_articles=False, coalesce=False, hooks=None, transport=None,
+                 compress_summaries=False):
         self.auth = NewsCatcherApiAuth(x_api_key=x_api_key)
         self.base_url = base_url
-        if session is None:
-            self.request_method = requests
-        else:
-            self.request_method = session
+        self.transport, self._owns_transport = get_transport(transport, session, pool_connections, pool_maxsize)
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.cache = cache
+        self.disk_cache = disk_cache
+        if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+            raise TypeError("retry_policy param should be a RetryPolicy")
+        self.retry_policy = retry_policy
+        self.json_decoder = get_json_decoder(json_decoder)
+        if compress_summaries and not compact_articles:
+            raise ValueError("compress_summaries param requires compact_articles=True")
+        self.compact_articles = compact_articles
+        self.compress_summaries = compress_summaries
+        self.single_flight = get_single_flight(coalesce, SingleFlight)
+        self.hooks = get_hooks(hooks)
+
+    @property
+    def headers(self):
+        """Headers sent with every request, read from :attr:`auth` so a new API key set on it is used."""
+        return self.auth.headers
+
+    @property
+    def request_method(self):
+        """The :class:`requests.Session` of the default transport, None for the other transports.
+
+        A session set on it replaces the one created by the client, which is closed. It cannot be set on a client
+        created with a ``transport``, pass a transport sending the requests with that session instead.
+        """
+        return getattr(self.transport, 'session', None)
+
+    @request_method.setter
+    def request_method(self, session):
+        if not self._owns_transport:
+            raise AttributeError("request_method can't be set on a client created with a transport, "
+                                 "pass transport=RequestsTransport(session) instead")
+        self.transport.close()
+        self.transport = RequestsTransport(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the connections of the session created by the client. A ``session`` or ``transport`` you provided
+        is left open."""
+        if self._owns_transport:
+            self.transport.close()
+
+    def _request(self, endpoint, payload, proxies=None, key=None):
+        # payload is the dict of parameters, or the query string of a prepared query, given with its key
+        caches = [cache for cache in (self.cache, self.disk_cache) if cache is not None]
+        if key is None:
+            key = utils.make_request_key(endpoint, payload)
+        for cache in caches:
+            content = cache.get(key)
+            if content is not None:
+                if cache is self.disk_cache and self.cache is not None:
+                    self.cache.set(key, content)
+                return self._to_result(self.json_decoder.decode(content))
+
+        if self.single_flight is None:
+            _, result = self._call_api(endpoint, payload, proxies, key, caches)
+            return self._to_result(result)
+
+        (content, result), shared = self.single_flight.do(
+            key, lambda: self._call_api(endpoint, payload, proxies, key, caches))
+        if shared:
+            # the callers may modify their result, each one decodes its own copy of the shared body
+            result = self.json_decoder.decode(content)
+        return self._to_result(result)
+
+    def _call_api(self, endpoint, payload, proxies, key, caches):
+        # send the request, retried as per the retry policy, and return the body with its decoded result
+        hooks = self.hooks
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self._acquire(self.rate_limiter)
+
+            # Send Request
+            if hooks is not None:
+                hooks.on_request_start(endpoint, attempt)
+            started = time.perf_counter()
+            try:
+                r = self.transport.get(self.base_url + endpoint, payload, self.headers, self.timeout, proxies)
+            except self.transport.RETRYABLE_ERRORS as e:
+                delay = self.retry_policy.next_delay(attempt) if self.retry_policy is not None else None
+                if delay is None:
+                    raise
+                logger.warning('%s call failed (%s), retry in %.2fs', endpoint, type(e).__name__, delay)
+                if hooks is not None:
+                    hooks.on_retry(endpoint, attempt, delay, error=e)
+                self._sleep(delay)
+                continue
+            latency = time.perf_counter() - started
+            if hooks is not None:
+                # the transport measures the time until the headers are parsed, the body is then read by get()
+                elapsed = getattr(r, 'elapsed', None)
+                time_to_headers = elapsed.total_seconds() if elapsed is not None else latency
+                hooks.on_phase('time_to_headers', time_to_headers)
+                hooks.on_phase('download', max(0.0, latency - time_to_headers))
+
+            # Check Status of Request
+            if r.status_code == requests.codes.ok:
+                break
+
+            if hooks is not None:
+                hooks.on_response(endpoint, r.status_code, latency, len(r.content), None, attempt)
+            delay = None
+            if self.retry_policy is not None and self.retry_policy.is_retryable_status(r.status_code):
+                delay = self.retry_policy.next_delay(attempt, r.headers.get('Retry-After'))
+            if delay is None:
+                raise NewsCatcherApiException(self.json_decoder.decode_error(r.status_code, r.content))
+            logger.warning('%s call failed (HTTP %s), retry in %.2fs', endpoint, r.status_code, delay)
+            if hooks is not None:
+                hooks.on_retry(endpoint, attempt, delay, status=r.status_code)
+            self._sleep(delay)
+
+        started = time.perf_counter()
+        try:
+            result = self.json_decoder.decode(r.content)
+        except ValueError:
+            raise NewsCatcherApiException(self.json_decoder.decode_error(r.status_code, r.content))
+        self._on_phase('decode', started)
+        if hooks is not None:
+            hooks.on_response(endpoint, r.status_code, latency, len(r.content), count_articles(result), attempt)
+
+        for cache in caches:
+            cache.set(key, r.content)
+
+        return r.content, result
+
+    def _to_result(self, result):
+        if self.compact_articles:
+            return to_articles(result, self.compress_summaries)
+        return result
+
+    def _on_phase(self, phase, started):
+        # report the time spent in `phase` since the time.perf_counter() value `started`
+        if self.hooks is not None:
+            self.hooks.on_phase(phase, time.perf_counter() - started)
+
+    def _acquire(self, limiter):
+        started = time.perf_counter()
+        limiter.acquire()
+        self._on_phase('rate_limit_wait', started)
+
+    def _sleep(self, delay):
+        started = time.perf_counter()
+        time.sleep(delay)
+        self._on_phase('retry_backoff', started)
+
+    def _fetch_page(self, get_page, current_page, nb_pages):
+        logger.debug('%s/%s page is going to be extracted', current_page, nb_pages or '?')
+
+        try:
+            result = get_page(current_page)
+        except NewsCatcherApiException as e:
+            logger.warning('%s page has not been extracted due to an error: %s', current_page, e)
+            return None
+        self._on_page(current_page, nb_pages, result)
+        return result
+
+    def _on_page(self, page, nb_pages, result):
+        if self.hooks is not None:
+            self.hooks.on_page(page, nb_pages, count_articles(result))
+
+    @staticmethod
+    def _open_checkpoint(path, resume, search_params, by, page, max_page, adaptive):
+        # from_ and to_ are left out: the pages are recorded per time window, so a longer interval reuses them
+        query = {key: value for key, value in search_params.items() if key != 'proxies'}
+        query.update(by=by, page=page, max_page=max_page, adaptive=adaptive)
+        return SearchCheckpoint(path, query, resume)
+
+    def _get_pacer(self, seconds_pause):
+        # The client-level rate limiter already paces every call, otherwise seconds_pause is used for this run only
+        if self.rate_limiter is not None:
+            return None
+        return RateLimiter.from_seconds_pause(seconds_pause)
+
+    def _search_page_getter(self, query, proxies, pacer=None):
+        def get_page(page_number):
+            if pacer is not None:
+                self._acquire(pacer)
+            started = time.perf_counter()
+            page_query = query.page(page_number)
+            self._on_phase('validation', started)
+            return self.fetch(page_query, proxies)
+
+        return get_page
+
+    def _iter_pages(self, get_page, page, max_page, pacer, max_workers, first_result=None):
+        """Yield ``(page_number, result)`` for the first page and each following page, in page order.
+
+        Every call first waits for the ``pacer`` rate limiter, if any. With ``max_workers`` greater than 1 the pages
+        after the first one run on a thread pool that keeps at most ``2 * max_workers`` pages in flight. Pages that
+        failed with a :class:`NewsCatcherApiException` are yielded with a ``None`` result. A ``first_result`` that
+        was already fetched is used instead of requesting the first page again.
+        """
+        if pacer is not None:
+            unpaced_get_page = get_page
+
+            def get_page(page_number):
+                self._acquire(pacer)
+                return unpaced_get_page(page_number)
+
+        nb_pages = None
+        if max_page is not None:
+            nb_pages = utils.validate_max_page(max_page, page)
+        if max_workers is not None:
+            utils.validate_max_workers(max_workers)
+
+        if first_result is None:
+            logger.debug('%s page is going to be extracted', page)
+            first_result = get_page(page)
+
+        if 'articles' not in first_result.keys():
+            yield page, first_result
+            return
+
+        logger.debug('Total number of found articles => %s. Total number of pages %s.',
+                     first_result['total_hits'], first_result['total_pages'])
+
+        if not nb_pages or (max_page and max_page > first_result["total_pages"]):
+            nb_pages = first_result["total_pages"]
+        self._on_page(page, nb_pages, first_result)
+        yield page, first_result
+
+        def fetch_page(current_page):
+            return current_page, self._fetch_page(get_page, current_page, nb_pages)
+
+        for result in utils.imap_ordered(fetch_page, range(page + 1, nb_pages + 1), max_workers):
+            yield result
+
+    def _iter_page_results(self, get_page, page, max_page, page_size, pacer, max_workers, limit, first_result=None,
+                           dedup=None):
+        """Yield the successful pages of :meth:`_iter_pages`, stopping once ``limit`` articles are produced.
+
+        The articles already seen by the ``dedup`` de-duplicator, if any, are removed from each page first. With a
+        ``limit``, only the pages that can hold the articles still missing are requested at a time: when removed
+        duplicates or failed pages leave it short, the following pages are requested, up to ``max_page`` or the last
+        page of the results.
+        """
+        remaining = limit
+        last_page = None
+        while True:
+            batch_max_page = max_page
+            if remaining is not None:
+                batch_max_page = utils.get_max_page_for_limit(remaining, page, page_size, max_page)
+
+            try:
+                for page_number, result in self._iter_pages(get_page, page, batch_max_page, pacer, max_workers,
+                                                            first_result):
+                    if result is None:
+                        continue
+                    if 'articles' not in result.keys():
+                        return
+                    if page_number == page:
+                        last_page = (result['total_pages'] if max_page is None
+                                     else min(max_page, result['total_pages']))
+
+                    if dedup is not None:
+                        result['articles'] = dedup.filter(result['articles'])
+                    if remaining is not None:
+                        result['articles'] = result['articles'][:remaining]
+                        remaining -= len(result['articles'])
+
+                    yield result
+
+                    if remaining == 0:
+                        return
+            except NewsCatcherApiException as e:
+                # only the first page of a batch raises, a failure of the very first page is the caller's
+                if last_page is None:
+                    raise
+                logger.warning('%s page has not been extracted due to an error: %s', page, e)
+                batch_max_page = page
+
+            if remaining is None or batch_max_page >= last_page:
+                return
+            page, first_result = batch_max_page + 1, None
+
+    def _get_all_pages(self, get_page, page, max_page, pacer, max_workers, first_result=None, dedup=None):
+        pages = self._iter_pages(get_page, page, max_page, pacer, max_workers, first_result)
+
+        _, first_result = next(pages)
+        if 'articles' not in first_result.keys():
+            return first_result
+
+        filter_articles = dedup.filter if dedup is not None else list
+        all_articles = filter_articles(first_result['articles'])
+        for _, one_call_results in pages:
+            if one_call_results is not None:
+                all_articles.extend(filter_articles(one_call_results['articles']))
+
+        final_results = first_result
+        final_results['articles'] = all_articles
+
+        return final_results
+
+    def _write_all_pages(self, get_page, page, max_page, first_result, write_articles):
+        """Like :meth:`_get_all_pages`, but pass the articles of each page to ``write_articles`` as it arrives."""
+        pages = self._iter_pages(get_page, page, max_page, None, None, first_result)
+
+        _, first_result = next(pages)
+        if 'articles' not in first_result.keys():
+            return first_result
+
+        write_articles(first_result['articles'])
+        for _, one_call_results in pages:
+            if one_call_results is not None:
+                write_articles(one_call_results['articles'])
+
+        first_result['articles'] = []
+        return first_result
+
+    def _iter_search_windows(self, search_params, from_, to_, by, page, page_size, max_page, pacer, adaptive,
+                             checkpoint=None):
+        """Yield ``(window, get_page, first_result)`` for each time window of a ``*_search_all_articles`` run.
+
+        ``window`` is the ``(from_, to_)`` pair sent to the API. ``get_page`` already waits for the ``pacer``, and
+        reads the pages recorded in the ``checkpoint`` from disk. In adaptive mode ``first_result`` is the first page
+        that was fetched to probe the window, otherwise the first page is left to fetch and ``first_result`` is
+        ``None``.
+        """
+        started = time.perf_counter()
+        from_datetime, to_datetime, delta = utils.get_search_interval(from_, to_, by)
+        self._on_phase('date_parsing', started)
+        started = time.perf_counter()
+        query = self.prepare_search(**{name: value for name, value in search_params.items() if name != 'proxies'})
+        self._on_phase('validation', started)
+
+        def get_window_page_getter(window_from, window_to):
+            window = (utils.format_window_date(window_from), utils.format_window_date(window_to))
+            logger.debug('%s --> %s', *window)
+            get_page = self._search_page_getter(query.window(*window), search_params['proxies'], pacer)
+            if checkpoint is not None:
+                get_page = checkpoint.wrap(window[0], window[1], get_page, self._to_result)
+            return window, get_page
+
+        if not adaptive:
+            for window_from, window_to in utils.iter_time_windows(from_datetime, to_datetime, delta):
+                window, get_page = get_window_page_getter(window_from, window_to)
+                if self.hooks is not None:
+                    self.hooks.on_window(window[0], window[1], None)
+                yield window, get_page, None
+            return
+
+        windows = AdaptiveTimeWindows(from_datetime, to_datetime, delta,
+                                      utils.get_window_max_hits(page, page_size, max_page))
+        while windows.current() is not None:
+            window, get_page = get_window_page_getter(*windows.current())
+            first_result = get_page(page)
+
+            total_hits = first_result.get('total_hits', 0) if 'articles' in first_result.keys() else 0
+            if not windows.submit(total_hits):
+                logger.debug('%s articles found, the window is split in half', total_hits)
+                continue
+            if total_hits > windows.max_hits:
+                logger.warning('%s articles found, only %s can be extracted from the %s --> %s window',
+                               total_hits, windows.max_hits, *window)
+
+            if self.hooks is not None:
+                self.hooks.on_window(window[0], window[1], total_hits)
+            yield window, get_page, first_result
 
     def get_latest_headlines(
             self,
@@ -100,71 +545,21 @@ class NewsCatcherApiClient(object):
         :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
         """
 
-        payload = {}
-
-
-        # Language
-        if lang is not None:
-            payload["lang"] = utils.validate_language(lang)
-
-        if not_lang is not None:
-            payload["not_lang"] = utils.validate_language(not_lang)
-
-        # Countries
-        if countries is not None:
-            payload["countries"] = utils.validate_countries(countries, 'countries')
-
-        if not_countries is not None:
-            payload["not_countries"] = utils.validate_countries(not_countries, 'not_countries')
-
-        # Topic
-        if topic is not None:
-            payload['topic'] = utils.validate_topic(topic)
-
-        # Sources
-        if sources is not None:
-            payload["sources"] = utils.validate_sources(sources, 'sources')
-
-        if not_sources is not None:
-            payload["not_sources"] = utils.validate_sources(not_sources, 'not_sources')
-
-        # When
-        if when is not None:
-            payload["when"] = utils.validate_when(when, 'when')
-
-        # Ranks
-        if ranked_only is not None:
-            if utils.is_valid_boolean(ranked_only):
-                payload['ranked_only'] = ranked_only
-            else:
-                raise TypeError("ranked_only parameter should be of type boolean")
-
-        # Page and page sizes
-        # Page Size
-        if page_size is not None:
-            if type(page_size) == int:
-                payload["page_size"] = page_size
-            else:
-                raise TypeError("page_size param should be an int")
-
-        # Page
-        if page is not None:
-            if type(page) == int:
-                if page > 0:
-                    payload["page"] = page
-                else:
-                    raise ValueError("page param should be an int greater than 0")
-            else:
-                raise TypeError("page param should be an int")
-
-        # Send Request
-        r = self.request_method.get(self.base_url + const.LATEST_HEADLINES_URL, auth=self.auth, timeout=30, params=payload, proxies=proxies)
-
-        # Check Status of Request
-        if r.status_code != requests.codes.ok:
-            raise NewsCatcherApiException(r.json())
+        payload = utils.build_latest_headlines_payload(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size,
+            page=page
+        )
 
-        return r.json()
+        return self._request(const.LATEST_HEADLINES_URL, payload, proxies)
 
     def get_search(
         self,
@@ -255,131 +650,28 @@ class NewsCatcherApiClient(object):
         :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
         """
 
-        payload = {}
-
-        # Q
-        if q is not None:
-            if utils.is_valid_string(q):
-                payload["q"] = q
-            else:
-                raise TypeError("q parameter should be of type str")
-
-        # Language
-        if lang is not None:
-            payload["lang"] = utils.validate_language(lang)
-
-        if not_lang is not None:
-            payload["not_lang"] = utils.validate_language(not_lang)
-
-        # Time variables
-        if from_ is not None:
-            if utils.is_valid_string(from_):
-                payload["from"] = from_
-            else:
-                raise TypeError("from_ parameter should be of type str")
-
-        if to_ is not None:
-            if utils.is_valid_string(to_):
-                payload["to"] = to_
-            else:
-                raise TypeError("to_ parameter should be of type str")
-
-        if published_date_precision is not None:
-            if utils.is_valid_string(published_date_precision):
-                if published_date_precision in const.allowed_precisions:
-                    payload["published_date_precision"] = published_date_precision
-                else:
-                    raise ValueError(f'{published_date_precision} is not a valid date precision. '
-                                     f'It should be one of the list: {str(const.allowed_precisions)}')
-            else:
-                raise TypeError("published_date_precision parameter should be of type str")
-
-        # Search in
-        if search_in is not None:
-            if utils.is_valid_string(search_in):
-                if search_in in const.allowed_search_ins:
-                    payload["search_in"] = search_in
-                else:
-                    raise ValueError(f'{search_in} is not a valid place to search for keywords. '
-                                     f'It should be one of the list: {str(const.allowed_search_ins)}')
-            else:
-                raise TypeError("search_in parameter should be of type str")
-
-        # Countries
-        if countries is not None:
-            payload["countries"] = utils.validate_countries(countries, 'countries')
-
-        if not_countries is not None:
-            payload["not_countries"] = utils.validate_countries(not_countries, 'not_countries')
-
-        # Topic
-        if topic is not None:
-            payload['topic'] = utils.validate_topic(topic)
-
-        # Sources
-        if sources is not None:
-            payload["sources"] = utils.validate_sources(sources, 'sources')
-
-        if not_sources is not None:
-            payload["not_sources"] = utils.validate_sources(not_sources, 'not_sources')
-
-
-        # Ranks
-        if ranked_only is not None:
-            if utils.is_valid_boolean(ranked_only):
-                payload['ranked_only'] = ranked_only
-            else:
-                raise TypeError("ranked_only parameter should be of type boolean")
-
-        if from_rank is not None:
-            if utils.is_valid_num(from_rank):
-                payload['from_rank'] = from_rank
-            else:
-                raise TypeError("from_rank parameter should be of type int")
-
-        if to_rank is not None:
-            if utils.is_valid_num(to_rank):
-                payload['to_rank'] = to_rank
-            else:
-                raise TypeError("to_rank parameter should be of type int")
-
-        # Sort by
-        if sort_by is not None:
-            if utils.is_valid_string(sort_by):
-                if sort_by in const.allowed_sorts:
-                    payload["sort_by"] = sort_by
-                else:
-                    raise ValueError(f'{sort_by} is not a valid sort by type. '
-                                     f'It should be one of the list: {str(const.allowed_sorts)}')
-            else:
-                raise TypeError("sort_by parameter should be of type str")
-
-        # Page and page sizes
-        # Page Size
-        if page_size is not None:
-            if type(page_size) == int:
-                payload["page_size"] = page_size
-            else:
-                raise TypeError("page_size param should be an int")
-
-        # Page
-        if page is not None:
-            if type(page) == int:
-                if page > 0:
-                    payload["page"] = page
-                else:
-                    raise ValueError("page param should be an int greater than 0")
-            else:
-                raise TypeError("page param should be an int")
-
-        # Send Request
-        r = self.request_method.get(self.base_url + const.SEARCH_URL, auth=self.auth, timeout=30, params=payload, proxies=proxies)
-
-        # Check Status of Request
-        if r.status_code != requests.codes.ok:
-            raise NewsCatcherApiException(r.json())
+        payload = utils.build_search_payload(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            page=page
+        )
 
-        return r.json()
+        return self._request(const.SEARCH_URL, payload, proxies)
 
     def get_sources(self,
                     lang=None,
@@ -408,28 +700,114 @@ class NewsCatcherApiClient(object):
 
         """
 
-        payload = {}
+        payload = utils.build_sources_payload(lang=lang, countries=countries, topic=topic)
+
+        return self._request(const.SOURCES_URL, payload, proxies)
+
+    def prepare_search(
+        self,
+        q=None,
+        lang=None,
+        not_lang=None,
+        from_=None,
+        to_=None,
+        published_date_precision=None,
+        search_in=None,
+        countries=None,
+        not_countries=None,
+        topic=None,
+        sources=None,
+        not_sources=None,
+        ranked_only=None,
+        from_rank=None,
+        to_rank=None,
+        sort_by=None,
+        page_size=None,
+        page=None
+    ):
+        """Validate the parameters of a `/search` call once and return it as a :class:`PreparedQuery`.
+
+        Takes the same parameters as :meth:`get_search`, except ``proxies``, which is given to :meth:`fetch`. The
+        query string is encoded once: ``query.page(n)`` and ``query.window(from_, to_)`` return the query for
+        another page or time window without validating and encoding the other parameters again.
+
+        :return: The prepared query, to send with :meth:`fetch`.
+        :rtype: PreparedQuery
+        """
+        return PreparedQuery(const.SEARCH_URL, utils.build_search_payload(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            page=page
+        ))
+
+    def prepare_latest_headlines(
+            self,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=None,
+            page=None
+    ):
+        """Validate the parameters of a `/latest_headlines` call once and return it as a :class:`PreparedQuery`.
+
+        Takes the same parameters as :meth:`get_latest_headlines`, except ``proxies``, which is given to
+        :meth:`fetch`. Use ``query.page(n)`` to get the query for another page.
 
-        # Language
-        if lang is not None:
-            payload["lang"] = utils.validate_language(lang)
+        :return: The prepared query, to send with :meth:`fetch`.
+        :rtype: PreparedQuery
+        """
+        return PreparedQuery(const.LATEST_HEADLINES_URL, utils.build_latest_headlines_payload(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size,
+            page=page
+        ))
 
-        # Countries
-        if countries is not None:
-            payload["countries"] = utils.validate_countries(countries, 'countries')
+    def fetch(self, query, proxies=None):
+        """Call the API with a query returned by :meth:`prepare_search` or :meth:`prepare_latest_headlines`.
 
-        # Topic
-        if topic is not None:
-            payload['topic'] = utils.validate_topic(topic)
+        The pre-encoded query string is sent as is, without validating the parameters again.
 
-        # Send Request
-        r = self.request_method.get(self.base_url + const.SOURCES_URL, auth=self.auth, timeout=30, params=payload, proxies=proxies)
+        :param query: The prepared query.
+        :type query: PreparedQuery
 
-        # Check Status of Request
-        if r.status_code != requests.codes.ok:
-            raise NewsCatcherApiException(r.json())
+        :param proxies: Dict of proxies if needed
+        :type proxies: dict or None
 
-        return r.json()
+        :return: JSON response as nested Python dictionary.
+        :rtype: dict
+        :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
+        """
+        query = get_prepared_query(query)
+        return self._request(query.endpoint, query.query_string, proxies, query.key)
 
     def get_latest_headlines_all_pages(
             self,
@@ -446,7 +824,9 @@ class NewsCatcherApiClient(object):
             page=1,
             max_page=None,
             seconds_pause=1.0,
-            proxies=None
+            proxies=None,
+            max_workers=None,
+            dedup=False
     ):
 
         """Call the `/latest_headlines` endpoint the number of time sufficient to get all latest articles for a given search.
@@ -492,9 +872,15 @@ class NewsCatcherApiClient(object):
         :param max_page: The last page number to extract. Use it to manage number of API calls and articles you are going to extract. For example, if you make a broad search with page_size=100 you will extract up to 10 000 articles and make 100 calls to do so.
         :type max_page: int or None
 
-        :param seconds_pause: The number of seconds delay between each API call. For your subscription, you can have a rate limit on number of calls per second.
+        :param seconds_pause: The minimum number of seconds between the dispatch of two API calls. For your subscription, you can have a rate limit on number of calls per second. Ignored when the client has a `rate_limiter`.
         :type seconds_pause: float
 
+        :param max_workers: Fetch the pages after the first one concurrently over a pool of up to `max_workers` threads. Articles are still returned in page order and API calls are still paced by `seconds_pause` or the client `rate_limiter`. By default, pages are fetched one at a time.
+        :type max_workers: int or None
+
+        :param dedup: Default: `False`. Drop the articles whose `_id` was already returned, by an earlier page or by an earlier call sharing the same de-duplicator. `True` uses a new :class:`ArticleIdSet` for this call. Pass an :class:`ArticleIdSet` or a :class:`BloomFilter` to share it between calls.
+        :type dedup: bool or ArticleIdSet or BloomFilter
+
         :param proxies: Dict of proxies if needed
         :type proxies: dict or None
 
@@ -502,19 +888,7 @@ class NewsCatcherApiClient(object):
         :rtype: dict
         :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
         """
-        nb_pages = None
-        if max_page is not None:
-            if type(max_page) == int:
-                if max_page >= page:
-                    nb_pages = max_page
-                else:
-                    raise ValueError("max_page param should be greater than page param")
-            else:
-                raise TypeError("max_page param should be an int")
-
-        all_articles = []
-        print(f'{str(page)} page is going to be extracted')
-        first_result = self.get_latest_headlines(
+        query = self.prepare_latest_headlines(
             lang=lang,
             not_lang=not_lang,
             countries=countries,
@@ -524,60 +898,14 @@ class NewsCatcherApiClient(object):
             not_sources=not_sources,
             when=when,
             ranked_only=ranked_only,
-            page_size=page_size,
-            page=page,
-            proxies=proxies
+            page_size=page_size
         )
 
-        time.sleep(seconds_pause)
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
 
-        if 'articles' not in first_result.keys():
-            return first_result
-
-        all_articles.extend(first_result['articles'])
-
-        print(f'Total number of found articles => {first_result["total_hits"]}.\n'
-              f'Total number of pages {first_result["total_pages"]}.')
-
-        current_page = page
-
-        if not nb_pages or (max_page and max_page > first_result["total_pages"]):
-            nb_pages = first_result["total_pages"]
-
-        while current_page < nb_pages:
-
-            current_page += 1
-
-            print(f'{str(current_page)}/{str(nb_pages)} page is going to be extracted')
-
-            try:
-                one_call_results = self.get_latest_headlines(
-                    lang=lang,
-                    not_lang=not_lang,
-                    countries=countries,
-                    not_countries=not_countries,
-                    topic=topic,
-                    sources=sources,
-                    not_sources=not_sources,
-                    when=when,
-                    ranked_only=ranked_only,
-                    page_size=page_size,
-                    page=current_page,
-                    proxies=proxies
-                )
-                all_articles.extend(one_call_results['articles'])
-            except NewsCatcherApiException as e:
-                print(f'{current_page} has not been extracted due to an error')
-                print(str(e))
-                pass
-
-            time.sleep(seconds_pause)
-
-
-        final_results = first_result
-        final_results['articles'] = all_articles
-
-        return final_results
+        return self._get_all_pages(get_page, page, max_page, self._get_pacer(seconds_pause), max_workers,
+                                   dedup=get_deduplicator(dedup))
 
     def get_search_all_pages(
         self,
@@ -601,7 +929,9 @@ class NewsCatcherApiClient(object):
         page=1,
         max_page=None,
         seconds_pause=1.0,
-        proxies=None
+        proxies=None,
+        max_workers=None,
+        dedup=False
     ):
         """Call the `/search` endpoint the number of time sufficient to get all latest articles for a given search.
 
@@ -664,9 +994,15 @@ class NewsCatcherApiClient(object):
         :param max_page: The last page number to extract. Use it to manage number of API calls and articles you are going to extract. For example, if you make a broad search with page_size=100 you will extract up to 10 000 articles and make 100 calls to do so.
         :type max_page: int or None
 
-        :param seconds_pause: The number of seconds delay between each API call. For your subscription, you can have a rate limit on number of calls per second.
+        :param seconds_pause: The minimum number of seconds between the dispatch of two API calls. For your subscription, you can have a rate limit on number of calls per second. Ignored when the client has a `rate_limiter`.
         :type seconds_pause: float
 
+        :param max_workers: Fetch the pages after the first one concurrently over a pool of up to `max_workers` threads. Articles are still returned in page order and API calls are still paced by `seconds_pause` or the client `rate_limiter`. By default, pages are fetched one at a time.
+        :type max_workers: int or None
+
+        :param dedup: Default: `False`. Drop the articles whose `_id` was already returned, by an earlier page or by an earlier call sharing the same de-duplicator. `True` uses a new :class:`ArticleIdSet` for this call. Pass an :class:`ArticleIdSet` or a :class:`BloomFilter` to share it between calls.
+        :type dedup: bool or ArticleIdSet or BloomFilter
+
         :param proxies: Dict of proxies if needed
         :type proxies: dict or None
 
@@ -675,19 +1011,7 @@ class NewsCatcherApiClient(object):
         :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
         """
 
-        nb_pages = None
-        if max_page is not None:
-            if type(max_page) == int:
-                if max_page >= page:
-                    nb_pages = max_page
-                else:
-                    raise ValueError("max_page param should be greater than page param")
-            else:
-                raise TypeError("max_page param should be an int")
-
-        all_articles = []
-        print(f'{str(page)} page is going to be extracted')
-        first_result = self.get_search(
+        query = self.prepare_search(
             q=q,
             lang=lang,
             not_lang=not_lang,
@@ -704,66 +1028,14 @@ class NewsCatcherApiClient(object):
             from_rank=from_rank,
             to_rank=to_rank,
             sort_by=sort_by,
-            page_size=page_size,
-            page=page,
-            proxies=proxies
+            page_size=page_size
         )
 
-        time.sleep(seconds_pause)
-
-        if 'articles' not in first_result.keys():
-            return first_result
-
-        all_articles.extend(first_result['articles'])
-
-        print(f'Total number of found articles => {first_result["total_hits"]}.\n'
-              f'Total number of pages {first_result["total_pages"]}.')
-
-        current_page = page
-
-        if not nb_pages or (max_page and max_page > first_result["total_pages"]):
-            nb_pages = first_result["total_pages"]
-
-        while current_page < nb_pages:
-
-            current_page += 1
-
-            print(f'{str(current_page)}/{str(nb_pages)} page is going to be extracted')
-
-            try:
-                one_call_results = self.get_search(
-                    q=q,
-                    lang=lang,
-                    not_lang=not_lang,
-                    from_=from_,
-                    to_=to_,
-                    published_date_precision=published_date_precision,
-                    search_in=search_in,
-                    countries=countries,
-                    not_countries=not_countries,
-                    topic=topic,
-                    sources=sources,
-                    not_sources=not_sources,
-                    ranked_only=ranked_only,
-                    from_rank=from_rank,
-                    to_rank=to_rank,
-                    sort_by=sort_by,
-                    page_size=page_size,
-                    page=current_page,
-                    proxies=proxies
-                )
-                all_articles.extend(one_call_results['articles'])
-            except NewsCatcherApiException as e:
-                print(f'{current_page} has not been extracted due to an error')
-                print(str(e))
-                pass
-
-            time.sleep(seconds_pause)
-
-        final_results = first_result
-        final_results['articles'] = all_articles
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
 
-        return final_results
+        return self._get_all_pages(get_page, page, max_page, self._get_pacer(seconds_pause), max_workers,
+                                   dedup=get_deduplicator(dedup))
 
     def get_search_all_articles(
             self,
@@ -788,7 +1060,13 @@ class NewsCatcherApiClient(object):
             page=1,
             max_page=None,
             seconds_pause=1.0,
-            proxies=None):
+            proxies=None,
+            adaptive=False,
+            max_workers=None,
+            checkpoint=None,
+            resume=False,
+            dedup=False,
+            sink=None):
 
         """Call the `/search` endpoint the number of time sufficient to get all latest articles for a given search.
 
@@ -852,7 +1130,7 @@ class NewsCatcherApiClient(object):
         :param max_page: The last page number to extract. Use it to manage number of API calls and articles you are going to extract. For example, if you make a broad search with page_size=100 you will extract up to 10 000 articles and make 100 calls to do so.
         :type max_page: int or None
 
-        :param seconds_pause: The number of seconds delay between each API call. For your subscription, you can have a rate limit on number of calls per second.
+        :param seconds_pause: The minimum number of seconds between the dispatch of two API calls. For your subscription, you can have a rate limit on number of calls per second. Ignored when the client has a `rate_limiter`.
         :type seconds_pause: float
 
         :param proxies: Dict of proxies if needed
@@ -861,117 +1139,500 @@ class NewsCatcherApiClient(object):
         :param by: Accepted values: `month`, `week`, `day`, 'hour'. Default: `week`. How to divide the the time time interval between to_ and from_.
         :type by: str
 
-        :return: JSON response as nested Python dictionary.
+        :param adaptive: Default: `False`. Use `by` as the initial window size only: a window with more articles than a single search can return is split in half, and the window after a sparse one is twice as large. Nothing is cut off and the number of API calls stays close to the minimum.
+        :type adaptive: bool
+
+        :param max_workers: Extract up to `max_workers` time windows at the same time, each on its own thread, with the pages of a window fetched one after another. All windows share the `seconds_pause` pacing (or the client `rate_limiter`), and articles are still merged in window order. By default, windows are extracted one by one.
+        :type max_workers: int or None
+
+        :param checkpoint: Path of a journal recording each page extracted, and each time window completed. The responses are written in the `<checkpoint>.pages` directory. See :class:`SearchCheckpoint`.
+        :type checkpoint: str or None
+
+        :param resume: Default: `False`. Continue the run recorded in `checkpoint`: the pages already extracted are read from disk instead of calling the API again, so a restarted backfill picks up where it stopped. Raises a `ValueError` if the journal was written for other search parameters.
+        :type resume: bool
+
+        :param dedup: Default: `False`. Drop the articles whose `_id` was already returned, by an earlier page or time window, or by an earlier call sharing the same de-duplicator. `True` uses a new :class:`ArticleIdSet` for this call. Pass an :class:`ArticleIdSet` or a :class:`BloomFilter` to share it between calls, or a saved :class:`BloomFilter` to share it between the workers of a backfill.
+        :type dedup: bool or ArticleIdSet or BloomFilter
+
+        :param sink: Where to write the articles instead of keeping them in the result: a path or a file object, written as JSON Lines by a :class:`JsonLinesSink` (gzip or zstd compressed for a `.gz` or `.zst` path), or an :class:`ArticleSink` like a :class:`ParquetSink`. Articles are written page by page as they arrive, in order, so memory stays constant whatever the size of the backfill. With `max_workers`, the windows in flight are buffered to keep them in order. A path is closed at the end of the call, a file object or an `ArticleSink` is left open.
+        :type sink: str or file object or ArticleSink or None
+
+        :return: JSON response as nested Python dictionary. With a `sink`, the `articles` list is replaced by `nb_articles_written` and `nb_pages_written`.
         :rtype: dict
         :raises NewsCatcherApiException: If the ``"status"`` value of the response is ``"error"`` rather than ``"ok"``.
         """
-        if not from_:
-            from_ = (datetime.utcnow() - timedelta(days=7)).strftime('%Y/%m/%d')
-        if not to_:
-            to_ = datetime.utcnow().strftime('%Y/%m/%d')
-
-        # create a timedelta corresponding to the by parameter
-        if by == 'month':
-            delta = timedelta(days=28)
-        elif by == 'week':
-            delta = timedelta(days=7)
-        elif by == 'day':
-            delta = timedelta(days=1)
-        elif by == 'hour':
-            delta = timedelta(hours=1)
-
-        # Convert the to_ and from_ parameters to datetime object
-        # Check if time is specified and treat accordingly
-        to_datetime = parse_date(to_, settings={'TIMEZONE': 'UTC'})
-
-        from_datetime = parse_date(from_, settings={'TIMEZONE': 'UTC'})
-
-        # the by parameter can't be smaller than `to_ - from_`
-        if to_datetime - from_datetime < delta:
-            raise ValueError("The 'by' parameter cannot be bigger than the difference of from_ and to_")
-
         # initialize response dict/object
-        payload = {'status': '', 'total_hits': 0, 'page': 0, 'total_pages': 0, 'page_size': 0, 'articles': [], 'user_input': {}}
+        payload = utils.init_final_res()
 
-        # flag so we can compensate for our midnight trickery in the from_ parameter
-        midnight_flag = False
+        search_params = dict(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            proxies=proxies
+        )
 
-        while True:
+        # one pacer for the whole run, shared by the windows running in parallel
+        pacer = self._get_pacer(seconds_pause)
+
+        if max_workers is not None:
+            utils.validate_max_workers(max_workers)
+        dedup = get_deduplicator(dedup)
+        # windows extracted one by one are written page by page, parallel windows once they are complete
+        stream_pages = sink is not None and not (max_workers and max_workers > 1)
+        written = {'articles': 0, 'pages': 0}
+
+        def write_articles(articles, nb_pages=1):
+            # nb_pages is the number of pages the articles come from, several for a complete window
+            if dedup is not None:
+                articles = dedup.filter(articles)
+            started = time.perf_counter()
+            sink.write_articles(articles)
+            self._on_phase('sink_write', started)
+            written['articles'] += len(articles)
+            written['pages'] += nb_pages
+
+        if checkpoint is not None:
+            checkpoint = self._open_checkpoint(checkpoint, resume, search_params, by, page, max_page, adaptive)
+
+        def get_window(window):
+            # return the results of the window with the number of pages fetched, failed pages left out
+            _, get_page, first_result = window
+            nb_pages = [0 if first_result is None else 1]
+            if stream_pages:
+                results = self._write_all_pages(get_page, page, max_page, first_result, write_articles)
+            else:
+                uncounted_get_page = get_page
+
+                def get_page(page_number):
+                    result = uncounted_get_page(page_number)
+                    nb_pages[0] += 1
+                    return result
+
+                results = self._get_all_pages(get_page, page, max_page, None, None, first_result)
+            return results, nb_pages[0]
+
+        windows = self._iter_search_windows(search_params, from_, to_, by, page, page_size, max_page, pacer, adaptive,
+                                            checkpoint)
+        sink, owns_sink = get_article_sink(sink)
+        try:
+            for results, nb_pages in utils.imap_ordered(get_window, windows, max_workers):
+                # windows are de-duplicated and written in window order, whatever order they finish in
+                if sink is not None and 'articles' in results.keys():
+                    if not stream_pages:
+                        write_articles(results['articles'], nb_pages)
+                        results['articles'] = []
+                    started = time.perf_counter()
+                    sink.end_window()
+                    self._on_phase('sink_write', started)
+                elif dedup is not None and 'articles' in results.keys():
+                    results['articles'] = dedup.filter(results['articles'])
+                utils.update_final_res(results, payload)
+        finally:
+            if owns_sink:
+                sink.close()
+            if checkpoint is not None:
+                checkpoint.close()
+                logger.info('%s pages read from the checkpoint', checkpoint.nb_reused_pages)
+
+        if dedup is not None:
+            logger.info('%s duplicated articles dropped', dedup.nb_duplicates)
+
+        if sink is not None:
+            payload['nb_pages_written'] = written['pages']
+            return utils.finalize_final_res(results, payload, page_size, by, written['articles'])
+        return utils.finalize_final_res(results, payload, page_size, by)
+
+    def iter_search_batch(self, queries, max_page=None, seconds_pause=1.0, proxies=None, max_workers=None):
+        """Run the `/search` pages of many queries through one scheduler, yielding each page tagged with its query ID.
+
+        Pages are interleaved round-robin across the queries: the first page of every query comes first, then the
+        second page of every query that has one, and so on, so a query with many pages cannot starve the others.
+        All the calls share the connection pool of the client and one `seconds_pause` pacing (or the client
+        `rate_limiter`). Pages that failed with an error are skipped, as are the queries without any match.
+
+        :param queries: The queries, as a dict of query ID to the parameters of :meth:`get_search`, or as an
+            iterable of ``(query_id, params)`` pairs. Every query is validated before the first call.
+        :type queries: dict or iterable
+
+        :param max_page: The last page number to extract for each query.
+        :type max_page: int or None
 
-            if to_datetime - from_datetime <= delta:
-                print(f'{from_datetime.strftime("%m/%d/%Y %H:%M:%S")} --> {to_datetime.strftime("%m/%d/%Y %H:%M:%S")}')
-                results = self.get_search_all_pages(q=q,
-                                                    lang=lang,
-                                                    not_lang=not_lang,
-                                                    from_=from_datetime.strftime("%m/%d/%Y %H:%M:%S"),
-                                                    to_=to_datetime.strftime("%m/%d/%Y %H:%M:%S"),
-                                                    published_date_precision=published_date_precision,
-                                                    search_in=search_in,
-                                                    countries=countries,
-                                                    not_countries=not_countries,
-                                                    topic=topic,
-                                                    sources=sources,
-                                                    not_sources=not_sources,
-                                                    ranked_only=ranked_only,
-                                                    from_rank=from_rank,
-                                                    to_rank=to_rank,
-                                                    sort_by=sort_by,
-                                                    page_size=page_size,
-                                                    page=page,
-                                                    proxies=proxies,
-                                                    max_page=max_page,
-                                                    seconds_pause=seconds_pause)
+        :param seconds_pause: The minimum number of seconds between the dispatch of two API calls, all queries together. Ignored when the client has a `rate_limiter`.
+        :type seconds_pause: float
 
-                utils.update_final_res(results, payload)
-                payload['page_size'] = page_size
-                payload['user_input'] = results['user_input']
-                payload['user_input']['by'] = by
-                if len(payload['articles']) > 0:
-                    payload['status'] = 'ok'
+        :param proxies: Dict of proxies if needed
+        :type proxies: dict or None
+
+        :param max_workers: Fetch up to `max_workers` pages at the same time. Pages are still yielded in the round-robin order. By default, pages are fetched one at a time.
+        :type max_workers: int or None
+
+        :return: Generator of ``(query_id, result)`` pairs, one per page.
+        :rtype: generator of tuple
+        """
+        queries = {query_id: self.prepare_search(**params)
+                   for query_id, params in utils.validate_batch_queries(queries)}
+        if max_page is not None:
+            utils.validate_max_page(max_page, 1)
+        if max_workers is not None:
+            utils.validate_max_workers(max_workers)
+        return self._iter_search_batch(queries, max_page, self._get_pacer(seconds_pause), proxies, max_workers)
+
+    def _iter_search_batch(self, queries, max_page, pacer, proxies, max_workers):
+        nb_pages = {}
+
+        def fetch_page(task):
+            query_id, page_number = task
+
+            def get_page(page_number):
+                if pacer is not None:
+                    self._acquire(pacer)
+                return self.fetch(queries[query_id].page(page_number), proxies)
+
+            logger.debug('query %s', query_id)
+            return query_id, self._fetch_page(get_page, page_number, nb_pages.get(query_id))
+
+        first_pages = [(query_id, 1) for query_id in queries]
+        for query_id, result in utils.imap_ordered(fetch_page, first_pages, max_workers):
+            if result is None or 'articles' not in result.keys():
+                continue
+            nb_pages[query_id] = utils.get_window_last_page(result, max_page)
+            yield query_id, result
+
+        for query_id, result in utils.imap_ordered(fetch_page, utils.iter_batch_rounds(nb_pages), max_workers):
+            if result is not None:
+                yield query_id, result
+
+    def iter_latest_headlines_pages(
+            self,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=100,
+            page=1,
+            max_page=None,
+            seconds_pause=1.0,
+            proxies=None,
+            max_workers=None,
+            limit=None,
+            dedup=False
+    ):
+        """Generator version of :meth:`get_latest_headlines_all_pages` yielding each page as soon as it is fetched.
+
+        Takes the same parameters as :meth:`get_latest_headlines_all_pages`. Only the page being processed is kept
+        in memory. Pages that failed with an error are skipped, and nothing is yielded if no article matches.
+
+        :param limit: Stop once `limit` articles have been yielded. The last page is cut to fit and no page past it
+            is requested. Failed pages and removed duplicates are made up for with the following pages.
+        :type limit: int or None
+
+        :param dedup: Default: `False`. Drop the articles whose `_id` was already yielded. See
+            :meth:`get_search_all_articles`.
+        :type dedup: bool or ArticleIdSet or BloomFilter
+
+        :return: Generator of JSON responses, one per page, in page order.
+        :rtype: generator of dict
+        :raises NewsCatcherApiException: If the first page returns an ``"error"`` status.
+        """
+        query = self.prepare_latest_headlines(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size
+        )
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return self._iter_page_results(get_page, page, max_page, page_size, self._get_pacer(seconds_pause),
+                                       max_workers, limit, dedup=get_deduplicator(dedup))
+
+    def poll_latest_headlines(
+            self,
+            watermark,
+            lang=None,
+            not_lang=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            sources=None,
+            not_sources=None,
+            when=None,
+            ranked_only=None,
+            page_size=100,
+            seconds_pause=1.0,
+            proxies=None
+    ):
+        """Yield the latest headlines not seen by the previous polls of the query, stopping at the known ones.
+
+        Made to be called every few minutes with the same parameters, like ``when='1h'``. `/latest_headlines` sorts
+        the articles by the earliest date published first, so the new ones are on the last pages: the first page
+        is requested for the number of pages, then the pages are requested one by one from the last one back, and
+        only the articles unknown to the ``watermark`` are yielded. Paging stops at the first page holding no new
+        article, so a poll usually costs two or three calls instead of all the pages of the period. The first poll
+        of a watermark yields every article.
+
+        **Note**: an article indexed late, with a ``published_date`` older than articles already seen, is sorted
+        among the known articles and can be missed: paging stops before its page, and the articles published no
+        later than :attr:`HeadlinesWatermark.floor` are treated as known.
+
+        Takes the parameters of :meth:`get_latest_headlines_all_pages`, except ``page``, ``max_page``,
+        ``max_workers`` and ``dedup``.
+
+        :param watermark: The watermark of the query, updated as articles are yielded and saved at the end of the
+            poll, see :class:`HeadlinesWatermark`.
+        :type watermark: HeadlinesWatermark
+
+        :return: Generator of the new articles, newest first.
+        :rtype: generator of dict
+        :raises NewsCatcherApiException: If the first page returns an ``"error"`` status.
+        """
+        watermark = get_watermark(watermark)
+        query = self.prepare_latest_headlines(
+            lang=lang,
+            not_lang=not_lang,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            when=when,
+            ranked_only=ranked_only,
+            page_size=page_size
+        )
+        watermark.bind(dict(query.params))
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return self._iter_new_articles(watermark, get_page, self._get_pacer(seconds_pause))
+
+    def _iter_new_articles(self, watermark, get_page, pacer):
+        """Yield the articles unknown to the ``watermark``, newest first, from the last page back to the first
+        page holding no new article."""
+        if pacer is not None:
+            unpaced_get_page = get_page
+
+            def get_page(page_number):
+                self._acquire(pacer)
+                return unpaced_get_page(page_number)
+
+        nb_new = 0
+        try:
+            first_result = get_page(1)
+            if 'articles' not in first_result.keys():
+                return
+            nb_pages = first_result['total_pages']
+            self._on_page(1, nb_pages, first_result)
+
+            # articles dropping out of the `when` period shift the pages back, onto pages already read
+            for page_number in range(nb_pages, 0, -1):
+                if page_number == 1:
+                    result = first_result
                 else:
-                    payload['status'] = 'No matches for your search.'
+                    result = self._fetch_page(get_page, page_number, nb_pages)
+                    if result is None:
+                        continue
+
+                nb_page_new = 0
+                for article in reversed(result['articles']):
+                    if watermark.add(article):
+                        nb_page_new += 1
+                        yield article
+                nb_new += nb_page_new
+                if not nb_page_new:
+                    logger.debug('%s page only has known articles, polling stops', page_number)
+                    return
+        finally:
+            watermark.save()
+            logger.info('%s new articles, the latest published at %s', nb_new, watermark.latest)
+
+    def iter_search_pages(
+        self,
+        q=None,
+        lang=None,
+        not_lang=None,
+        from_=None,
+        to_=None,
+        published_date_precision=None,
+        search_in=None,
+        countries=None,
+        not_countries=None,
+        topic=None,
+        sources=None,
+        not_sources=None,
+        ranked_only=None,
+        from_rank=None,
+        to_rank=None,
+        sort_by=None,
+        page_size=100,
+        page=1,
+        max_page=None,
+        seconds_pause=1.0,
+        proxies=None,
+        max_workers=None,
+        limit=None,
+        dedup=False
+    ):
+        """Generator version of :meth:`get_search_all_pages` yielding each page as soon as it is fetched.
 
-                return payload
+        Takes the same parameters as :meth:`get_search_all_pages`. Only the page being processed is kept in memory.
+        Pages that failed with an error are skipped, and nothing is yielded if no article matches.
 
-            # move the to_ parameter forward
-            else:
-                temp_to_ = from_datetime + delta
-
-            # subtract 1 sec if the to_ parameter is the exact midnight
-            if temp_to_.hour == 0 and temp_to_.minute == 0 and \
-                    temp_to_.second == 0:
-                temp_to_ -= timedelta(seconds=1)
-                midnight_flag = True
-
-            print(f'{from_datetime.strftime("%m/%d/%Y %H:%M:%S")} --> {to_datetime.strftime("%m/%d/%Y %H:%M:%S")}')
-
-            results = self.get_search_all_pages(q=q,
-                                                lang=lang,
-                                                not_lang=not_lang,
-                                                from_=from_datetime.strftime("%m/%d/%Y %H:%M:%S"),
-                                                to_=temp_to_.strftime("%m/%d/%Y %H:%M:%S"),
-                                                published_date_precision=published_date_precision,
-                                                search_in=search_in,
-                                                countries=countries,
-                                                not_countries=not_countries,
-                                                topic=topic,
-                                                sources=sources,
-                                                not_sources=not_sources,
-                                                ranked_only=ranked_only,
-                                                from_rank=from_rank,
-                                                to_rank=to_rank,
-                                                sort_by=sort_by,
-                                                page_size=page_size,
-                                                page=page,
-                                                proxies=proxies,
-                                                max_page=max_page,
-                                                seconds_pause=seconds_pause)
-
-            utils.update_final_res(results, payload)
-
-            # move the from_ parameter forward
-            from_datetime = temp_to_
-
-            # Add a second so from_ doesn't become DD-1/MM/YYYY 23:59:59
-            if midnight_flag:
-                from_datetime += timedelta(seconds=1)
+        :param limit: Stop once `limit` articles have been yielded. The last page is cut to fit and no page past it
+            is requested. Failed pages and removed duplicates are made up for with the following pages.
+        :type limit: int or None
+
+        :param dedup: Default: `False`. Drop the articles whose `_id` was already yielded. See
+            :meth:`get_search_all_articles`.
+        :type dedup: bool or ArticleIdSet or BloomFilter
+
+        :return: Generator of JSON responses, one per page, in page order.
+        :rtype: generator of dict
+        :raises NewsCatcherApiException: If the first page returns an ``"error"`` status.
+        """
+        query = self.prepare_search(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            from_=from_,
+            to_=to_,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size
+        )
+
+        def get_page(page_number):
+            return self.fetch(query.page(page_number), proxies)
+
+        return self._iter_page_results(get_page, page, max_page, page_size, self._get_pacer(seconds_pause),
+                                       max_workers, limit, dedup=get_deduplicator(dedup))
+
+    def iter_search_articles(
+            self,
+            q=None,
+            lang=None,
+            not_lang=None,
+            from_=None,
+            to_=None,
+            published_date_precision=None,
+            search_in=None,
+            countries=None,
+            not_countries=None,
+            topic=None,
+            by='week',
+            sources=None,
+            not_sources=None,
+            ranked_only=None,
+            from_rank=None,
+            to_rank=None,
+            sort_by=None,
+            page_size=100,
+            page=1,
+            max_page=None,
+            seconds_pause=1.0,
+            proxies=None,
+            adaptive=False,
+            limit=None,
+            checkpoint=None,
+            resume=False,
+            dedup=False):
+        """Generator version of :meth:`get_search_all_articles` yielding the articles one by one as pages arrive.
+
+        Takes the same parameters as :meth:`get_search_all_articles`. Only the page being processed is kept in
+        memory, so downstream processing can start on the first page of the first time window.
+
+        :param limit: Stop once `limit` articles have been produced, without requesting any further page or window.
+        :type limit: int or None
+
+        :param checkpoint: Path of a journal recording each page extracted. See :meth:`get_search_all_articles`.
+        :type checkpoint: str or None
+
+        :param resume: Default: `False`. Read the pages recorded in `checkpoint` from disk instead of calling the API.
+        :type resume: bool
+
+        :param dedup: Default: `False`. Drop the articles whose `_id` was already yielded. See
+            :meth:`get_search_all_articles`.
+        :type dedup: bool or ArticleIdSet or BloomFilter
+
+        :return: Generator of articles, window after window and page after page.
+        :rtype: generator of dict
+        :raises NewsCatcherApiException: If the first page of a window returns an ``"error"`` status.
+        """
+        if limit is not None:
+            utils.validate_limit(limit)
+
+        search_params = dict(
+            q=q,
+            lang=lang,
+            not_lang=not_lang,
+            published_date_precision=published_date_precision,
+            search_in=search_in,
+            countries=countries,
+            not_countries=not_countries,
+            topic=topic,
+            sources=sources,
+            not_sources=not_sources,
+            ranked_only=ranked_only,
+            from_rank=from_rank,
+            to_rank=to_rank,
+            sort_by=sort_by,
+            page_size=page_size,
+            proxies=proxies
+        )
+
+        pacer = self._get_pacer(seconds_pause)
+        remaining = limit
+        dedup = get_deduplicator(dedup)
+
+        if checkpoint is not None:
+            checkpoint = self._open_checkpoint(checkpoint, resume, search_params, by, page, max_page, adaptive)
+
+        windows = self._iter_search_windows(search_params, from_, to_, by, page, page_size, max_page, pacer, adaptive,
+                                            checkpoint)
+        try:
+            for _, get_page, first_result in windows:
+                for result in self._iter_page_results(get_page, page, max_page, page_size, None, None, remaining,
+                                                      first_result, dedup):
+                    for article in result['articles']:
+                        yield article
+                    if remaining is not None:
+                        remaining -= len(result['articles'])
+
+                if remaining == 0:
+                    return
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
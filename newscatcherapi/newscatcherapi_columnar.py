@@ -0,0 +1,136 @@
+from newscatcherapi import utils
+from newscatcherapi.newscatcherapi_article import ARTICLE_FIELDS
+
+# type of each column, the other columns are strings
+TIMESTAMP_COLUMNS = frozenset(('published_date',))
+INT_COLUMNS = frozenset(('rank',))
+FLOAT_COLUMNS = frozenset(('_score',))
+BOOL_COLUMNS = frozenset(('is_opinion',))
+LIST_COLUMNS = frozenset(('authors',))
+
+
+class ColumnarArticles(object):
+    """Column buffers the articles of each page are appended to, instead of keeping one dict per article.
+
+    Each value is converted to the type of its column as it is appended: ``published_date`` becomes a UTC datetime,
+    ``rank`` an int, ``_score`` a float, ``is_opinion`` a bool and ``authors`` a list of str. Missing and
+    unparsable values are ``None``. Export the buffers with :meth:`to_record_batch` as a :class:`pyarrow.RecordBatch`
+    (``pip install newscatcherapi[parquet]``), or with :meth:`to_pydict` as a dict of lists.
+
+    :param columns: Fields of the articles to keep, in order. Default: every article field.
+    :type columns: list or tuple
+    """
+
+    def __init__(self, columns=ARTICLE_FIELDS):
+        self.columns = tuple(columns)
+        self._converters = [(column, _get_converter(column)) for column in self.columns]
+        self._buffers = {column: [] for column in self.columns}
+        self._nb_rows = 0
+
+    def __len__(self):
+        return self._nb_rows
+
+    def append_articles(self, articles):
+        for column, convert in self._converters:
+            buffer = self._buffers[column]
+            for article in articles:
+                buffer.append(convert(article.get(column)))
+        self._nb_rows += len(articles)
+
+    def clear(self):
+        for buffer in self._buffers.values():
+            del buffer[:]
+        self._nb_rows = 0
+
+    def to_pydict(self):
+        """Return the columns as a dict of lists, keyed on the column names."""
+        return {column: list(self._buffers[column]) for column in self.columns}
+
+    def get_schema(self):
+        """Return the :class:`pyarrow.Schema` of the record batches."""
+        pyarrow = import_pyarrow()
+        return pyarrow.schema([(column, _get_arrow_type(pyarrow, column)) for column in self.columns])
+
+    def to_record_batch(self):
+        """Return the buffered rows as a :class:`pyarrow.RecordBatch` with typed columns."""
+        pyarrow = import_pyarrow()
+        schema = self.get_schema()
+        arrays = [pyarrow.array(self._buffers[field.name], type=field.type) for field in schema]
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Columnar export requires pyarrow. Install it with `pip install newscatcherapi[parquet]`")
+    return pyarrow
+
+
+def _get_arrow_type(pyarrow, column):
+    if column in TIMESTAMP_COLUMNS:
+        return pyarrow.timestamp('s', tz='UTC')
+    if column in INT_COLUMNS:
+        return pyarrow.int64()
+    if column in FLOAT_COLUMNS:
+        return pyarrow.float64()
+    if column in BOOL_COLUMNS:
+        return pyarrow.bool_()
+    if column in LIST_COLUMNS:
+        return pyarrow.list_(pyarrow.string())
+    return pyarrow.string()
+
+
+def _get_converter(column):
+    if column in TIMESTAMP_COLUMNS:
+        return _to_timestamp
+    if column in INT_COLUMNS:
+        return _to_int
+    if column in FLOAT_COLUMNS:
+        return _to_float
+    if column in BOOL_COLUMNS:
+        return _to_bool
+    if column in LIST_COLUMNS:
+        return _to_str_list
+    return _to_str
+
+
+def _to_timestamp(value):
+    if not value:
+        return None
+    try:
+        return utils.parse_date(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(value):
+    return None if value is None else bool(value)
+
+
+def _to_str_list(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return [str(item) for item in value]
+
+
+def _to_str(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
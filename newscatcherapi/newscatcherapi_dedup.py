@@ -0,0 +1,204 @@
+import hashlib
+import math
+import struct
+import threading
+
+from newscatcherapi import utils
+
+
+class ArticleIdSet(object):
+    """Set of the article ``_id`` already seen, used to drop duplicated articles across pages and time windows.
+
+    Each ``_id`` is stored as a 64-bit hash instead of the string itself, which takes about half the memory. It is
+    exact in practice: two ids only collide once billions of articles have been seen. It is safe to share between
+    threads and calls.
+    """
+
+    def __init__(self):
+        self.nb_duplicates = 0
+        self._hashes = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, article_id):
+        return _hash_id(article_id, 8) in self._hashes
+
+    def add(self, article_id):
+        """Add ``article_id`` to the set. Return ``False`` if it was already seen, ``True`` otherwise."""
+        id_hash = _hash_id(article_id, 8)
+        with self._lock:
+            if id_hash in self._hashes:
+                return False
+            self._hashes.add(id_hash)
+            return True
+
+    def filter_new(self, ids):
+        """Mark the ``ids`` as seen and return those that were not seen yet, in order and once each.
+
+        The ids already seen are counted in ``nb_duplicates``. The whole list is checked under one lock, so two
+        threads filtering the same id at once never both get it.
+        """
+        ids = list(ids)
+        hashes = [_hash_id(article_id, 8) for article_id in ids]
+        new_ids = []
+        with self._lock:
+            for article_id, id_hash in zip(ids, hashes):
+                if id_hash not in self._hashes:
+                    self._hashes.add(id_hash)
+                    new_ids.append(article_id)
+            self.nb_duplicates += len(ids) - len(new_ids)
+        return new_ids
+
+    def filter(self, articles):
+        """Return the articles of the list whose ``_id`` was not seen yet, and mark them as seen."""
+        return _filter_articles(self, articles)
+
+
+class BloomFilter(object):
+    """Bloom filter of the article ``_id`` already seen, for de-duplicating very large backfills in a fixed memory.
+
+    It takes about 1.8 bytes per article for an ``error_rate`` of 0.1%, whatever the number of articles, at the
+    price of dropping that share of new articles as false duplicates. Save it with :meth:`save` and load it with
+    :meth:`load` to share it between the workers of a backfill, or merge the filters of several workers with
+    :meth:`update`. It is safe to share between threads and calls.
+
+    :param capacity: Number of articles the filter is sized for. Above it, the error rate grows. Default: `1000000`.
+    :type capacity: int
+
+    :param error_rate: Share of new articles wrongly reported as seen at ``capacity`` articles. Default: `0.001`.
+    :type error_rate: float
+    """
+
+    _HEADER = struct.Struct('<4sQQQ')
+    _MAGIC = b'NCBF'
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        utils.validate_pool_size(capacity, 'capacity')
+        if not utils.is_valid_num(error_rate) or not 0 < error_rate < 1:
+            raise ValueError("error_rate param should be a number between 0 and 1")
+
+        self.nb_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.nb_hashes = max(1, int(round(self.nb_bits / capacity * math.log(2))))
+        self.nb_duplicates = 0
+        self._count = 0
+        self._bits = bytearray((self.nb_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Approximate number of articles added: false positives are not counted, merged articles may be twice."""
+        return self._count
+
+    def __contains__(self, article_id):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._get_positions(article_id))
+
+    def _get_positions(self, article_id):
+        # double hashing: the k positions are derived from the two halves of one digest
+        digest = _hash_id(article_id, 16)
+        first_hash, second_hash = digest & 0xFFFFFFFFFFFFFFFF, (digest >> 64) | 1
+        return [(first_hash + i * second_hash) % self.nb_bits for i in range(self.nb_hashes)]
+
+    def add(self, article_id):
+        """Add ``article_id`` to the filter. Return ``False`` if it was probably seen already, ``True`` otherwise."""
+        positions = self._get_positions(article_id)
+        with self._lock:
+            return self._add_positions(positions)
+
+    def _add_positions(self, positions):
+        # to be called with the lock held
+        is_new = False
+        for position in positions:
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                is_new = True
+        if is_new:
+            self._count += 1
+        return is_new
+
+    def filter_new(self, ids):
+        """Mark the ``ids`` as seen and return those that were probably not seen yet, in order and once each.
+
+        The other ids are counted in ``nb_duplicates``. The whole list is checked under one lock, so two threads
+        filtering the same id at once never both get it.
+        """
+        ids = list(ids)
+        all_positions = [self._get_positions(article_id) for article_id in ids]
+        with self._lock:
+            new_ids = [article_id for article_id, positions in zip(ids, all_positions)
+                       if self._add_positions(positions)]
+            self.nb_duplicates += len(ids) - len(new_ids)
+        return new_ids
+
+    def filter(self, articles):
+        """Return the articles of the list whose ``_id`` was not seen yet, and mark them as seen."""
+        return _filter_articles(self, articles)
+
+    def update(self, other):
+        """Merge the articles seen by another :class:`BloomFilter` of the same size into this one."""
+        if (other.nb_bits, other.nb_hashes) != (self.nb_bits, self.nb_hashes):
+            raise ValueError("Only Bloom filters with the same capacity and error_rate can be merged")
+        with self._lock:
+            # OR of the two bit arrays as big integers, word by word in C rather than byte by byte in Python
+            merged = int.from_bytes(self._bits, 'little') | int.from_bytes(other._bits, 'little')
+            self._bits = bytearray(merged.to_bytes(len(self._bits), 'little'))
+            self._count += other._count
+
+    def save(self, path):
+        """Write the filter to the file at ``path``."""
+        with self._lock, open(path, 'wb') as bloom_file:
+            bloom_file.write(self._HEADER.pack(self._MAGIC, self.nb_bits, self.nb_hashes, self._count))
+            bloom_file.write(self._bits)
+
+    @classmethod
+    def load(cls, path):
+        """Read a filter written by :meth:`save`."""
+        with open(path, 'rb') as bloom_file:
+            magic, nb_bits, nb_hashes, count = cls._HEADER.unpack(bloom_file.read(cls._HEADER.size))
+            if magic != cls._MAGIC:
+                raise ValueError(f"{path} is not a saved BloomFilter")
+            bits = bytearray(bloom_file.read())
+
+        bloom_filter = cls.__new__(cls)
+        bloom_filter.nb_bits = nb_bits
+        bloom_filter.nb_hashes = nb_hashes
+        bloom_filter.nb_duplicates = 0
+        bloom_filter._count = count
+        bloom_filter._bits = bits
+        bloom_filter._lock = threading.Lock()
+        return bloom_filter
+
+
+def get_deduplicator(dedup):
+    """Return the de-duplicator to use for the ``dedup`` parameter of the ``*_all_*`` and ``iter_*`` methods."""
+    if dedup is None or dedup is False:
+        return None
+    if dedup is True:
+        return ArticleIdSet()
+    if isinstance(dedup, (ArticleIdSet, BloomFilter)):
+        return dedup
+    raise TypeError("dedup param should be a bool, an ArticleIdSet or a BloomFilter")
+
+
+def _hash_id(article_id, digest_size):
+    return int.from_bytes(hashlib.blake2b(str(article_id).encode('utf-8'), digest_size=digest_size).digest(), 'little')
+
+
+# end of the new ids of a page
+_NO_ID = object()
+
+
+def _filter_articles(deduplicator, articles):
+    # articles without an _id can't be compared and are kept
+    new_ids = iter(deduplicator.filter_new(article['_id'] for article in articles if '_id' in article))
+    # the new ids come in the order of their first article, the other articles with an _id are duplicates
+    next_new_id = next(new_ids, _NO_ID)
+    new_articles = []
+    for article in articles:
+        if '_id' not in article:
+            new_articles.append(article)
+        elif article['_id'] == next_new_id:
+            new_articles.append(article)
+            next_new_id = next(new_ids, _NO_ID)
+    return new_articles
@@ -0,0 +1,279 @@
+import bisect
+import threading
+import time
+
+# phases of the time of a run reported by the on_phase hook
+PHASES = ('rate_limit_wait', 'retry_backoff', 'time_to_headers', 'download', 'decode', 'validation', 'date_parsing',
+          'sink_write')
+
+
+class ClientHooks(object):
+    """Base class of the ``hooks`` of the clients, called on the events of every API call and extraction.
+
+    Override the methods of the events you need, the others do nothing. Hooks are called synchronously, from the
+    thread or the event loop making the call, so they should return quickly. They are not called for the responses
+    answered by a cache.
+    """
+
+    def on_request_start(self, endpoint, attempt):
+        """A request to ``endpoint`` is sent, ``attempt`` counting from 1 as the call is retried."""
+
+    def on_response(self, endpoint, status, latency, nb_bytes, nb_articles, attempt):
+        """A response was received after ``latency`` seconds, with ``nb_bytes`` bytes of body.
+
+        ``nb_articles`` is the number of articles of a successful `/search` or `/latest_headlines` page, and `None`
+        for a failed call or another endpoint.
+        """
+
+    def on_retry(self, endpoint, attempt, delay, status=None, error=None):
+        """The call is retried in ``delay`` seconds, after an HTTP ``status`` or a network ``error``."""
+
+    def on_page(self, page, nb_pages, nb_articles):
+        """Page number ``page`` out of ``nb_pages`` of a ``*_all_pages``, ``*_all_articles`` or ``iter_*`` run was
+        extracted. ``nb_pages`` is `None` while the number of pages is not known yet."""
+
+    def on_window(self, window_from, window_to, total_hits):
+        """The extraction of a time window of a ``*_all_articles`` run starts. ``total_hits`` is known for the
+        windows probed in adaptive mode, `None` otherwise."""
+
+    def on_phase(self, phase, seconds):
+        """``seconds`` were spent in ``phase``, one of :data:`PHASES`, see :class:`Profiler`."""
+
+
+class HookList(ClientHooks):
+    """Calls each of several :class:`ClientHooks` in turn."""
+
+    def __init__(self, hooks):
+        self.hooks = list(hooks)
+
+    def on_request_start(self, endpoint, attempt):
+        for hooks in self.hooks:
+            hooks.on_request_start(endpoint, attempt)
+
+    def on_response(self, endpoint, status, latency, nb_bytes, nb_articles, attempt):
+        for hooks in self.hooks:
+            hooks.on_response(endpoint, status, latency, nb_bytes, nb_articles, attempt)
+
+    def on_retry(self, endpoint, attempt, delay, status=None, error=None):
+        for hooks in self.hooks:
+            hooks.on_retry(endpoint, attempt, delay, status, error)
+
+    def on_page(self, page, nb_pages, nb_articles):
+        for hooks in self.hooks:
+            hooks.on_page(page, nb_pages, nb_articles)
+
+    def on_window(self, window_from, window_to, total_hits):
+        for hooks in self.hooks:
+            hooks.on_window(window_from, window_to, total_hits)
+
+    def on_phase(self, phase, seconds):
+        for hooks in self.hooks:
+            hooks.on_phase(phase, seconds)
+
+
+class LatencyHistogram(object):
+    """Histogram of latencies in seconds, in buckets growing by 10% from 1 ms to about 2 minutes.
+
+    Recording is a binary search in the bucket bounds, so memory is fixed whatever the number of calls, and the
+    percentiles are exact to the width of one bucket.
+    """
+
+    BOUNDS = tuple(0.001 * 1.1 ** i for i in range(124))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency):
+        self.counts[bisect.bisect_left(self.BOUNDS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def percentile(self, percent):
+        """Return the upper bound of the bucket holding the ``percent`` percentile, or `None` when empty."""
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        """Return the count, mean, p50, p90, p99 and max latencies in seconds as a dict."""
+        return {'count': self.count, 'mean': self.total / self.count if self.count else None,
+                'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99),
+                'max': self.max if self.count else None}
+
+
+class MetricsCollector(ClientHooks):
+    """Hooks counting the calls, bytes, articles, retries, pages and windows, with a latency histogram per endpoint.
+
+    Pass it as the ``hooks`` of one or several clients, it is thread-safe, and read the numbers with
+    :meth:`snapshot`, for example every minute to report throughput and p99 latency.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start counting again from zero."""
+        with self._lock:
+            self.started = time.monotonic()
+            self.nb_requests = 0
+            self.nb_errors = 0
+            self.nb_retries = 0
+            self.nb_bytes = 0
+            self.nb_articles = 0
+            self.nb_pages = 0
+            self.nb_windows = 0
+            self.statuses = {}
+            self.latencies = {}
+
+    def on_request_start(self, endpoint, attempt):
+        with self._lock:
+            self.nb_requests += 1
+
+    def on_response(self, endpoint, status, latency, nb_bytes, nb_articles, attempt):
+        with self._lock:
+            histogram = self.latencies.get(endpoint)
+            if histogram is None:
+                histogram = self.latencies[endpoint] = LatencyHistogram()
+            histogram.record(latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status != 200:
+                self.nb_errors += 1
+            self.nb_bytes += nb_bytes
+            self.nb_articles += nb_articles or 0
+
+    def on_retry(self, endpoint, attempt, delay, status=None, error=None):
+        with self._lock:
+            self.nb_retries += 1
+            if error is not None:
+                self.nb_errors += 1
+
+    def on_page(self, page, nb_pages, nb_articles):
+        with self._lock:
+            self.nb_pages += 1
+
+    def on_window(self, window_from, window_to, total_hits):
+        with self._lock:
+            self.nb_windows += 1
+
+    def snapshot(self):
+        """Return the counters, the rates per second since the last reset and the latencies per endpoint as a dict."""
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            return {
+                'seconds': elapsed,
+                'requests': self.nb_requests,
+                'errors': self.nb_errors,
+                'retries': self.nb_retries,
+                'bytes': self.nb_bytes,
+                'articles': self.nb_articles,
+                'pages': self.nb_pages,
+                'windows': self.nb_windows,
+                'statuses': dict(self.statuses),
+                'requests_per_second': self.nb_requests / elapsed,
+                'articles_per_second': self.nb_articles / elapsed,
+                'latency': {endpoint: histogram.summary() for endpoint, histogram in self.latencies.items()},
+            }
+
+
+class Profiler(ClientHooks):
+    """Hooks breaking down the wall-clock time of a run by phase, to tune concurrency, page and window sizes.
+
+    The phases, reported by the clients through :meth:`ClientHooks.on_phase`, are:
+
+    - ``rate_limit_wait``: waiting for the ``seconds_pause`` pacing or the ``rate_limiter``
+    - ``retry_backoff``: sleeping before retrying a failed call
+    - ``time_to_headers``: from sending a request to receiving the response headers, so connection, TLS and
+      server time
+    - ``download``: reading the response body
+    - ``decode``: decoding the JSON body
+    - ``validation``: validating the parameters and encoding the query strings
+    - ``date_parsing``: parsing ``from_`` and ``to_`` into time windows
+    - ``sink_write``: writing the articles to the ``sink``
+
+    Each phase keeps a :class:`LatencyHistogram` of its durations. Pages fetched concurrently overlap, so the
+    phases can add up to more than the wall-clock time. Pass the profiler as the ``hooks`` of the client, run the
+    extraction, then read :meth:`report` or print :meth:`format_report`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self):
+        """Forget the recorded phases and start measuring the wall-clock time from now."""
+        with self._lock:
+            self.started = time.perf_counter()
+            self.nb_requests = 0
+            self.phases = {phase: LatencyHistogram() for phase in PHASES}
+
+    def on_request_start(self, endpoint, attempt):
+        with self._lock:
+            self.nb_requests += 1
+
+    def on_phase(self, phase, seconds):
+        with self._lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def report(self):
+        """Return the wall-clock time, the number of requests and the time of each phase as a dict.
+
+        Each phase gives its total ``seconds``, its ``share`` of the wall-clock time, and the ``count``, ``mean``,
+        ``p50``, ``p90``, ``p99`` and ``max`` of its durations. ``unaccounted`` is the wall-clock time spent out of
+        any phase, like the processing of the articles by the caller.
+        """
+        with self._lock:
+            wall_clock = max(time.perf_counter() - self.started, 1e-9)
+            phases = {}
+            for phase, histogram in self.phases.items():
+                phase_report = histogram.summary()
+                phase_report['seconds'] = histogram.total
+                phase_report['share'] = histogram.total / wall_clock
+                phases[phase] = phase_report
+            return {'seconds': wall_clock, 'requests': self.nb_requests, 'phases': phases,
+                    'unaccounted': max(0.0, wall_clock - sum(phase['seconds'] for phase in phases.values()))}
+
+    def format_report(self):
+        """Return :meth:`report` as a text table, one line per phase, longest first."""
+        report = self.report()
+        lines = [f'{report["requests"]} requests in {report["seconds"]:.3f}s',
+                 f'{"phase":<16}{"seconds":>10}{"share":>8}{"count":>8}{"mean ms":>10}{"p99 ms":>10}']
+        for phase, phase_report in sorted(report['phases'].items(), key=lambda item: -item[1]['seconds']):
+            if not phase_report['count']:
+                continue
+            lines.append(f'{phase:<16}{phase_report["seconds"]:>10.3f}{phase_report["share"]:>8.1%}'
+                         f'{phase_report["count"]:>8}{phase_report["mean"] * 1000:>10.2f}'
+                         f'{phase_report["p99"] * 1000:>10.2f}')
+        lines.append(f'{"unaccounted":<16}{report["unaccounted"]:>10.3f}'
+                     f'{report["unaccounted"] / report["seconds"]:>8.1%}')
+        return '\n'.join(lines)
+
+
+def get_hooks(hooks):
+    """Return the :class:`ClientHooks` for the ``hooks`` parameter of the clients, or `None`."""
+    if hooks is None or isinstance(hooks, ClientHooks):
+        return hooks
+    if isinstance(hooks, (list, tuple)) and all(isinstance(one_hooks, ClientHooks) for one_hooks in hooks):
+        return HookList(hooks)
+    raise TypeError("hooks param should be a ClientHooks or a list of ClientHooks")
+
+
+def count_articles(result):
+    # articles of a /search or /latest_headlines page, None for the other responses
+    if isinstance(result, dict) and isinstance(result.get('articles'), list):
+        return len(result['articles'])
+    return None
@@ -0,0 +1,77 @@
+from types import MappingProxyType
+from urllib.parse import urlencode
+
+from newscatcherapi import const, utils
+
+
+class PreparedQuery(object):
+    """Validated and immutable API call, with its query string already encoded.
+
+    Returned by ``prepare_search`` and ``prepare_latest_headlines``, and sent with ``client.fetch(query)``. The
+    parameters are validated once, when the query is prepared. :meth:`page` and, for `/search`, :meth:`window`
+    return a new query for another page or another time window: only the changed parameter is validated and
+    encoded, the rest of the query string is reused. That makes issuing the pages of a query almost free.
+
+    :ivar endpoint: Endpoint called, like ``"/v2/search"``.
+    :ivar params: Read-only mapping of the validated parameters sent to the API.
+    :ivar query_string: The URL-encoded parameters.
+    :ivar key: Hashable identity of the call, the key of the response caches.
+    """
+
+    __slots__ = ('endpoint', 'params', 'query_string', 'key', '_base_query_string', '_window_query_string')
+
+    def __init__(self, endpoint, payload, base_query_string=None, window_query_string=None):
+        # the query string is made of the base parameters, the from/to window of /search and the page, in that order
+        if base_query_string is None:
+            base_query_string = urlencode([(name, value) for name, value in payload.items()
+                                           if name not in ('from', 'to', 'page')])
+        if window_query_string is None:
+            window_query_string = urlencode([(name, payload[name]) for name in ('from', 'to') if name in payload])
+        page_query_string = f'page={payload["page"]}' if 'page' in payload else ''
+
+        set_slot = object.__setattr__
+        set_slot(self, 'endpoint', endpoint)
+        set_slot(self, 'params', MappingProxyType(payload))
+        set_slot(self, 'query_string', '&'.join(part for part in (base_query_string, window_query_string,
+                                                                  page_query_string) if part))
+        set_slot(self, 'key', utils.make_request_key(endpoint, payload))
+        set_slot(self, '_base_query_string', base_query_string)
+        set_slot(self, '_window_query_string', window_query_string)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PreparedQuery objects are immutable, use page() or window() to change them")
+
+    def __eq__(self, other):
+        return isinstance(other, PreparedQuery) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f'PreparedQuery({self.endpoint}?{self.query_string})'
+
+    def page(self, page):
+        """Return the same query for page number ``page``."""
+        payload = dict(self.params)
+        payload['page'] = utils.validate_page(page)
+        return PreparedQuery(self.endpoint, payload, self._base_query_string, self._window_query_string)
+
+    def window(self, from_, to_):
+        """Return the same `/search` query restricted to the ``from_`` to ``to_`` time window."""
+        if self.endpoint != const.SEARCH_URL:
+            raise ValueError("Only /search queries have a time window")
+        if not utils.is_valid_string(from_):
+            raise TypeError("from_ parameter should be of type str")
+        if not utils.is_valid_string(to_):
+            raise TypeError("to_ parameter should be of type str")
+
+        payload = dict(self.params)
+        payload['from'] = from_
+        payload['to'] = to_
+        return PreparedQuery(self.endpoint, payload, self._base_query_string)
+
+
+def get_prepared_query(query):
+    if not isinstance(query, PreparedQuery):
+        raise TypeError("query param should be a PreparedQuery, see prepare_search and prepare_latest_headlines")
+    return query
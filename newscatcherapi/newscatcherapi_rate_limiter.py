@@ -0,0 +1,71 @@
+import threading
+import time
+
+from newscatcherapi import utils
+
+
+class RateLimiter(object):
+    """Token bucket limiting how many API calls are dispatched per second.
+
+    Share one instance between every endpoint method of a client, or between several clients, threads and event
+    loops, to stay under the rate limit of your subscription plan. Each call takes one token right before the
+    request is sent. Tokens refill at ``requests_per_second`` up to ``burst``, so the pacing is measured from
+    the time requests are dispatched and does not depend on how long the responses take.
+
+    :param requests_per_second: How many calls are allowed per second on average.
+    :type requests_per_second: int or float
+
+    :param burst: How many calls can be sent back to back after a quiet period. Default: `1`.
+    :type burst: int
+    """
+
+    def __init__(self, requests_per_second, burst=1):
+        if not utils.is_valid_num(requests_per_second) or isinstance(requests_per_second, bool):
+            raise TypeError("requests_per_second param should be of type int or float")
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second param should be greater than 0")
+        if type(burst) != int:
+            raise TypeError("burst param should be an int")
+        if burst < 1:
+            raise ValueError("burst param should be an int greater than 0")
+
+        self.requests_per_second = float(requests_per_second)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_seconds_pause(cls, seconds_pause):
+        """Build the limiter equivalent to waiting ``seconds_pause`` seconds between calls, or ``None`` for no pause."""
+        if not utils.is_valid_num(seconds_pause):
+            raise TypeError("seconds_pause param should be of type int or float")
+        if seconds_pause <= 0:
+            return None
+        return cls(1.0 / seconds_pause, burst=1)
+
+    def _reserve(self):
+        # Take a token, possibly borrowing one that is not refilled yet, and return how long to wait for it
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.requests_per_second)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.requests_per_second
+
+    def acquire(self):
+        """Block the current thread until a call can be dispatched."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a call can be dispatched."""
+        # imported here, asyncio is slow to import and only needed by the async client
+        import asyncio
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,106 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from newscatcherapi import utils
+
+
+class RetryPolicy(object):
+    """Retry policy applied by the clients to the API calls failing with a transient error.
+
+    A call is retried when the API answers with one of ``retry_statuses`` (rate limited or server error by default),
+    or when the request fails with a network error such as a timeout or a connection reset. Other errors, like
+    an invalid parameter, are raised right away. Before retry number ``n`` the client waits
+    ``backoff_factor * 2 ** (n - 1)`` seconds, capped at ``max_backoff``, or the time asked by the
+    ``Retry-After`` header of the response. With ``jitter``, the wait is drawn at random between 0 and that
+    value, so clients sharing a rate limit don't retry all at once.
+
+    :param max_retries: Most retries of a single call. Default: `3`.
+    :type max_retries: int
+
+    :param backoff_factor: Wait before the first retry, in seconds, doubled at each retry. Default: `0.5`.
+    :type backoff_factor: int or float
+
+    :param max_backoff: Longest wait between two attempts, in seconds, ``Retry-After`` included. Default: `30`.
+    :type max_backoff: int or float
+
+    :param jitter: Randomize the wait between 0 and the backoff. Default: `True`.
+    :type jitter: bool
+
+    :param retry_statuses: HTTP status codes retried. Default: `429` and `500`, `502`, `503`, `504`.
+    :type retry_statuses: tuple or list or set
+
+    :param retry_budget: Most retries of all the calls made with this policy, shared between clients and threads,
+        so a failing API does not multiply the calls of a long backfill. `None` for no limit. Default: `None`.
+    :type retry_budget: int or None
+
+    :param respect_retry_after: Wait the time asked by the ``Retry-After`` header when there is one.
+        Default: `True`.
+    :type respect_retry_after: bool
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30, jitter=True,
+                 retry_statuses=(429, 500, 502, 503, 504), retry_budget=None, respect_retry_after=True):
+        if type(max_retries) != int:
+            raise TypeError("max_retries param should be an int")
+        if max_retries < 0:
+            raise ValueError("max_retries param should be an int greater than or equal to 0")
+        if not utils.is_valid_num(backoff_factor) or not utils.is_valid_num(max_backoff):
+            raise TypeError("backoff_factor and max_backoff params should be of type int or float")
+        if retry_budget is not None:
+            if type(retry_budget) != int:
+                raise TypeError("retry_budget param should be an int")
+            if retry_budget < 0:
+                raise ValueError("retry_budget param should be an int greater than or equal to 0")
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_budget = retry_budget
+        self.respect_retry_after = respect_retry_after
+        self.nb_retries = 0
+        self._lock = threading.Lock()
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.retry_statuses
+
+    def next_delay(self, attempt, retry_after=None):
+        """Return how many seconds to wait before retrying a call after its ``attempt``-th failure, counted from 1.
+
+        ``retry_after`` is the value of the ``Retry-After`` header of the failed response, if any. Returns ``None``
+        when the call should not be retried any more, the retry then counting against the ``retry_budget``.
+        """
+        with self._lock:
+            if attempt > self.max_retries or (self.retry_budget is not None and self.nb_retries >= self.retry_budget):
+                return None
+            self.nb_retries += 1
+
+        delay = self.backoff_factor * 2 ** (attempt - 1)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.respect_retry_after and retry_after is not None:
+            retry_after_seconds = parse_retry_after(retry_after)
+            if retry_after_seconds is not None:
+                delay = retry_after_seconds
+        return min(delay, self.max_backoff)
+
+
+def parse_retry_after(value):
+    """Return the number of seconds of a ``Retry-After`` header, given in seconds or as an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,90 @@
+import threading
+
+
+class _Call(object):
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Group of in-flight calls, running each key once however many threads ask for it at the same time.
+
+    The first thread calling :meth:`do` with a key runs the function. Threads calling it with the same key before
+    it returns wait for it and get its value, or its exception. The key is forgotten as soon as the call returns:
+    this only merges calls overlapping in time, it is not a cache.
+    """
+
+    def __init__(self):
+        self.nb_coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Return ``(value, shared)``: the value of ``func()`` for ``key``, and whether it came from another thread."""
+        with self._lock:
+            call = self._calls.get(key)
+            shared = call is not None
+            if shared:
+                self.nb_coalesced += 1
+            else:
+                call = self._calls[key] = _Call()
+
+        if shared:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+
+class AsyncSingleFlight(object):
+    """Asyncio counterpart of :class:`SingleFlight`, merging the identical calls awaited at the same time.
+
+    The call runs in its own task, so cancelling one of the waiting coroutines does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.nb_coalesced = 0
+        self._tasks = {}
+
+    async def do(self, key, func):
+        """Return ``(value, shared)``: the value of ``await func()`` for ``key``, and whether it was already running."""
+        # imported here, asyncio is slow to import and only needed by the async client
+        import asyncio
+
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self.nb_coalesced += 1
+        else:
+            task = self._tasks[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done_task: self._forget(key, done_task))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # retrieved here so a failure whose waiters were all cancelled is not logged as never retrieved
+            task.exception()
+
+
+def get_single_flight(coalesce, single_flight_class):
+    """Return the group of in-flight calls for the ``coalesce`` parameter of the clients, or `None`."""
+    if type(coalesce) != bool:
+        raise TypeError("coalesce param should be a bool")
+    return single_flight_class() if coalesce else None
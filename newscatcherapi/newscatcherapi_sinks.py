@@ -0,0 +1,199 @@
+import gzip
+import io
+import json
+import time
+
+from newscatcherapi.newscatcherapi_article import ARTICLE_FIELDS
+from newscatcherapi.newscatcherapi_columnar import ColumnarArticles, import_pyarrow
+
+
+class ArticleSink(object):
+    """Base class of the ``sink`` of ``get_search_all_articles``, receiving the articles instead of the result dict.
+
+    The client calls :meth:`write_articles` with the articles of each page, in order, then :meth:`end_window` after
+    each time window. The sink is not closed by the client: call :meth:`close`, or use it as a context manager,
+    once every call writing to it is done. It can be shared by several calls to append to the same output.
+    """
+
+    nb_articles = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_articles(self, articles):
+        raise NotImplementedError
+
+    def end_window(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ParquetSink(ArticleSink):
+    """Sink writing the articles to a Parquet file, one row group per time window.
+
+    Articles are appended to :class:`ColumnarArticles` column buffers, and written out as a row group at the end
+    of each time window, or once ``max_rows`` rows are buffered. Memory therefore stays bounded by one window,
+    whatever the size of the backfill. ``published_date`` is a UTC timestamp column and ``rank`` an integer
+    column. It requires pyarrow: ``pip install newscatcherapi[parquet]``.
+
+    :param path: Path of the Parquet file, overwritten.
+    :type path: str
+
+    :param columns: Fields of the articles to write, in order. Default: every article field.
+    :type columns: list or tuple
+
+    :param compression: Parquet compression codec. Default: `"snappy"`.
+    :type compression: str
+
+    :param max_rows: Most rows buffered before a row group is written. Default: `100000`.
+    :type max_rows: int
+    """
+
+    def __init__(self, path, columns=ARTICLE_FIELDS, compression='snappy', max_rows=100000):
+        pyarrow = import_pyarrow()
+        import pyarrow.parquet
+
+        self.path = path
+        self.max_rows = max_rows
+        self._pyarrow = pyarrow
+        self.nb_articles = 0
+        self.nb_row_groups = 0
+        self._columns = ColumnarArticles(columns)
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._columns.get_schema(), compression=compression)
+
+    def write_articles(self, articles):
+        self._columns.append_articles(articles)
+        self.nb_articles += len(articles)
+        if len(self._columns) >= self.max_rows:
+            self.flush()
+
+    def end_window(self):
+        self.flush()
+
+    def flush(self):
+        """Write the buffered articles as a row group."""
+        if len(self._columns):
+            self._writer.write_table(self._pyarrow.Table.from_batches([self._columns.to_record_batch()]))
+            self._columns.clear()
+            self.nb_row_groups += 1
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+class JsonLinesSink(ArticleSink):
+    """Sink writing each article as one JSON line as soon as its page arrives, optionally compressed.
+
+    Each page is encoded and written in one go, with orjson when it is installed, and the output is flushed every
+    ``flush_interval`` seconds, so a crashed or killed job keeps what it extracted. Memory does not grow with the
+    number of articles written.
+
+    :param output: Path of the file, overwritten, or a file object opened for writing, left open by :meth:`close`.
+    :type output: str or file object
+
+    :param compression: `"gzip"`, `"zstd"` (``pip install newscatcherapi[zstd]``) or `None`. Default: inferred from
+        the extension of a path, `.gz` or `.zst`, and `None` for a file object.
+    :type compression: str or None
+
+    :param flush_interval: Most seconds between two flushes of the output. Default: `5`.
+    :type flush_interval: int or float
+    """
+
+    def __init__(self, output, compression='infer', flush_interval=5):
+        if compression == 'infer':
+            compression = _infer_compression(output)
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f"{compression} is not a valid compression. It should be one of: gzip, zstd, None")
+
+        self.compression = compression
+        self.flush_interval = flush_interval
+        self.nb_articles = 0
+        self.nb_bytes = 0
+        self._dumps = _get_dumps()
+        self._owns_output = isinstance(output, str)
+        raw_output = open(output, 'wb') if self._owns_output else output
+        self._is_text = isinstance(raw_output, io.TextIOBase)
+        if compression is not None and self._is_text:
+            raise ValueError("A compressed output should be a path or a binary file object")
+
+        self._raw_output = raw_output
+        if compression == 'gzip':
+            self._output = gzip.GzipFile(fileobj=raw_output, mode='wb')
+        elif compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd compression requires zstandard. "
+                                  "Install it with `pip install newscatcherapi[zstd]`")
+            self._output = zstandard.ZstdCompressor().stream_writer(raw_output, closefd=False)
+        else:
+            self._output = raw_output
+        self._last_flush = time.monotonic()
+
+    def write_articles(self, articles):
+        if not articles:
+            return
+        lines = b''.join(self._dumps(article) + b'\n' for article in articles)
+        self._output.write(lines.decode('utf-8') if self._is_text else lines)
+        self.nb_articles += len(articles)
+        self.nb_bytes += len(lines)
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Flush the written articles to the output, so they can be read, even compressed."""
+        self._output.flush()
+        if self._output is not self._raw_output:
+            self._raw_output.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._output is None:
+            return
+        if self._output is not self._raw_output:
+            self._output.close()
+        if self._owns_output:
+            self._raw_output.close()
+        else:
+            self._raw_output.flush()
+        self._output = None
+
+
+def get_article_sink(sink):
+    """Return the ``(sink, owned)`` pair for the ``sink`` parameter: a path is opened as a :class:`JsonLinesSink`."""
+    if sink is None:
+        return None, False
+    if isinstance(sink, str):
+        return JsonLinesSink(sink), True
+    if hasattr(sink, 'write_articles'):
+        return sink, False
+    if hasattr(sink, 'write'):
+        return JsonLinesSink(sink), True
+    raise TypeError("sink param should be a path, a file object or an ArticleSink")
+
+
+def _infer_compression(output):
+    if isinstance(output, str):
+        if output.endswith('.gz'):
+            return 'gzip'
+        if output.endswith('.zst'):
+            return 'zstd'
+    return None
+
+
+def _get_dumps():
+    # encode to UTF-8 bytes, Article objects being written as regular dicts
+    try:
+        import orjson
+    except ImportError:
+        return lambda article: json.dumps(article, ensure_ascii=False, default=dict).encode('utf-8')
+    return lambda article: orjson.dumps(article, default=dict)
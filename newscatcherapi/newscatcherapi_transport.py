@@ -0,0 +1,270 @@
+import json
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from newscatcherapi import utils
+
+
+class TransportResponse(object):
+    """HTTP response returned by a :class:`Transport`.
+
+    :ivar status_code: HTTP status code.
+    :ivar headers: Case-insensitive mapping of the response headers.
+    :ivar content: Body, as bytes.
+    :ivar elapsed: :class:`datetime.timedelta` from sending the request to receiving the headers, or `None`.
+    """
+
+    __slots__ = ('status_code', 'headers', 'content', 'elapsed')
+
+    def __init__(self, status_code, headers, content, elapsed=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+
+
+class Transport(object):
+    """Base class of the HTTP layer of :class:`NewsCatcherApiClient`, passed as its ``transport``.
+
+    A transport sends one GET request per call of :meth:`get`, without retrying: the client handles the retries,
+    the rate limiting, the caches and the decoding.
+
+    :cvar RETRYABLE_ERRORS: Network errors raised by :meth:`get` that the client retries as per its
+        ``retry_policy``, the request may not have reached the API.
+    """
+
+    RETRYABLE_ERRORS = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, url, params, headers, timeout, proxies=None):
+        """Send a GET request and return its response, an object with the attributes of :class:`TransportResponse`.
+
+        ``params`` is a dict of parameters or an already URL-encoded query string, ``timeout`` a number of seconds
+        or a ``(connect, read)`` tuple, and ``proxies`` a `requests`-style mapping of schemes to proxy URLs.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Free the connections of the transport."""
+
+
+class RequestsTransport(Transport):
+    """Transport sending the requests with a :class:`requests.Session`, the default one.
+
+    :param session: Session used to send the requests. By default, a session keeping up to ``pool_maxsize``
+        connections alive per host is created, and closed by :meth:`close`. A session you provide is left open.
+    :type session: requests.Session or None
+    """
+
+    RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+    def __init__(self, session=None, pool_connections=10, pool_maxsize=10):
+        self._owns_session = session is None
+        self.session = utils.create_session(pool_connections, pool_maxsize) if session is None else session
+
+    def get(self, url, params, headers, timeout, proxies=None):
+        # the requests.Response is returned as is, it has the attributes of a TransportResponse
+        return self.session.get(url, headers=headers, timeout=timeout, params=params, proxies=proxies)
+
+    def close(self):
+        if self._owns_session:
+            self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """Transport sending the requests with `urllib3`, skipping the per-request overhead of `requests`.
+
+    It sends the same requests as :class:`RequestsTransport`, gzip compression included, with less CPU time per
+    call, which shows when many small pages are fetched concurrently. `urllib3` is installed with `requests`.
+
+    :param num_pools: Number of per-host connection pools kept. Default: `10`.
+    :type num_pools: int
+
+    :param maxsize: Maximum number of connections kept alive per host. Set it to at least the ``max_workers`` you
+        use for concurrent pagination. Default: `10`.
+    :type maxsize: int
+
+    :ivar RETRYABLE_ERRORS: The `urllib3` network errors the client retries, set when the transport is created.
+    """
+
+    def __init__(self, num_pools=10, maxsize=10):
+        # imported here rather than with the package, only this transport uses urllib3 directly
+        import urllib3
+        self._urllib3 = urllib3
+        self.RETRYABLE_ERRORS = (urllib3.exceptions.TimeoutError, urllib3.exceptions.ProtocolError,
+                                 urllib3.exceptions.NewConnectionError)
+        self.num_pools = utils.validate_pool_size(num_pools, 'num_pools')
+        self.maxsize = utils.validate_pool_size(maxsize, 'maxsize')
+        self.default_headers = urllib3.util.make_headers(accept_encoding=True, keep_alive=True)
+        self.pool_manager = urllib3.PoolManager(num_pools=self.num_pools, maxsize=self.maxsize)
+        self._proxy_managers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, params, headers, timeout, proxies=None):
+        query_string = params if isinstance(params, str) else urlencode(params or {}, doseq=True)
+        if query_string:
+            url = f'{url}?{query_string}'
+        if isinstance(timeout, tuple):
+            timeout = self._urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        request_headers = dict(self.default_headers)
+        request_headers.update(headers or {})
+
+        started = time.perf_counter()
+        r = self._get_pool_manager(url, proxies).urlopen('GET', url, headers=request_headers, timeout=timeout,
+                                                         retries=False, preload_content=False)
+        try:
+            elapsed = timedelta(seconds=time.perf_counter() - started)
+            content = r.read()
+        finally:
+            r.release_conn()
+        return TransportResponse(r.status, r.headers, content, elapsed)
+
+    def _get_pool_manager(self, url, proxies):
+        proxy_url = proxies.get(urlsplit(url).scheme) if proxies else None
+        if proxy_url is None:
+            return self.pool_manager
+        with self._lock:
+            proxy_manager = self._proxy_managers.get(proxy_url)
+            if proxy_manager is None:
+                proxy_manager = self._proxy_managers[proxy_url] = self._urllib3.ProxyManager(
+                    proxy_url, num_pools=self.num_pools, maxsize=self.maxsize)
+            return proxy_manager
+
+    def close(self):
+        self.pool_manager.clear()
+        with self._lock:
+            for proxy_manager in self._proxy_managers.values():
+                proxy_manager.clear()
+
+
+class MemoryTransport(Transport):
+    """Transport answering the requests in memory with a function, without network access.
+
+    ``handler(path, params, headers)`` is called with the path of the URL, like ``"/v2/search"``, the parameters as
+    a dict of str values and the request headers. It returns a ``(status_code, headers, body)`` tuple, the body
+    being bytes, a str or an object encoded to JSON. Use it to test code built on the client, or to benchmark the
+    client without the time spent in the network stack.
+
+    :param handler: Function answering the requests.
+    :type handler: callable
+    """
+
+    def __init__(self, handler):
+        if not callable(handler):
+            raise TypeError("handler param should be callable")
+        self.handler = handler
+
+    def get(self, url, params, headers, timeout, proxies=None):
+        status_code, response_headers, body = self.handler(urlsplit(url).path, dict(get_query_items(params)),
+                                                           dict(headers or {}))
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        elif not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        return TransportResponse(status_code, CaseInsensitiveDict(response_headers or {}), body)
+
+
+class RecordReplayTransport(Transport):
+    """Transport saving the responses of another transport to a SQLite file, and answering from it later.
+
+    Record a backfill once, then replay it as many times as needed with no network access, API key or quota: the
+    same calls get the same responses, so runs are deterministic and their timing only depends on the client.
+    Responses are stored by path and parameters, the base URL and the API key are left out, so a recording can
+    be shared and replayed against any ``base_url``. When a call is made several times while recording, like a
+    retried one, the last response is kept.
+
+    :param path: Path of the SQLite database file of the recording, created if needed.
+    :type path: str
+
+    :param mode: `"replay"` to answer from the recording only, failing with a :class:`LookupError` for the calls
+        not recorded, `"record"` to send every call and record its response, or `"auto"` to replay the recorded
+        calls and record the others. Default: `"replay"`.
+    :type mode: str
+
+    :param transport: Transport sending the calls to record. Default: a :class:`RequestsTransport`, closed with
+        this transport. A transport you provide is left open.
+    :type transport: Transport or None
+    """
+
+    MODES = ('replay', 'record', 'auto')
+
+    def __init__(self, path, mode='replay', transport=None):
+        if mode not in self.MODES:
+            raise ValueError(f"{mode} is not a valid mode. It should be one of: {', '.join(self.MODES)}")
+        if transport is not None and not isinstance(transport, Transport):
+            raise TypeError("transport param should be a Transport")
+        self.path = path
+        self.mode = mode
+        self._owns_transport = transport is None and mode != 'replay'
+        self.transport = RequestsTransport() if self._owns_transport else transport
+        self.RETRYABLE_ERRORS = self.transport.RETRYABLE_ERRORS if self.transport is not None else ()
+
+        self.nb_recorded = 0
+        self.nb_replayed = 0
+        self._lock = threading.Lock()
+        # imported here rather than with the package, most runs use no SQLite file
+        import sqlite3
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS responses '
+                                 '(key TEXT PRIMARY KEY, status_code INTEGER NOT NULL, headers TEXT NOT NULL, '
+                                 'content BLOB NOT NULL)')
+        self._connection.commit()
+
+    def get(self, url, params, headers, timeout, proxies=None):
+        key = json.dumps([urlsplit(url).path, sorted(get_query_items(params))])
+        if self.mode != 'record':
+            with self._lock:
+                row = self._connection.execute('SELECT status_code, headers, content FROM responses WHERE key = ?',
+                                               (key,)).fetchone()
+            if row is not None:
+                self.nb_replayed += 1
+                return TransportResponse(row[0], CaseInsensitiveDict(json.loads(row[1])), bytes(row[2]))
+            if self.mode == 'replay':
+                raise LookupError(f"No recorded response for {key} in {self.path}")
+        if self.transport is None:
+            raise ValueError("A transport is needed to record responses")
+
+        r = self.transport.get(url, params, headers, timeout, proxies)
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO responses (key, status_code, headers, content) '
+                                     'VALUES (?, ?, ?, ?)',
+                                     (key, r.status_code, json.dumps(dict(r.headers)), r.content))
+            self._connection.commit()
+            self.nb_recorded += 1
+        return r
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+        if self._owns_transport:
+            self.transport.close()
+
+
+def get_query_items(params):
+    # the (name, value) pairs of a dict of parameters or of a query string, str values either way
+    if isinstance(params, str):
+        return parse_qsl(params, keep_blank_values=True)
+    return [(name, str(value)) for name, value in (params or {}).items()]
+
+
+def get_transport(transport, session, pool_connections, pool_maxsize):
+    """Return the transport of a client and whether the client owns it, for its ``transport`` and ``session``."""
+    if transport is None:
+        if session is None:
+            return RequestsTransport(pool_connections=pool_connections, pool_maxsize=pool_maxsize), True
+        return RequestsTransport(session), True
+    if session is not None:
+        raise ValueError("session and transport params cannot be used together, pass the session to the transport")
+    if not isinstance(transport, Transport):
+        raise TypeError("transport param should be a Transport")
+    return transport, False
@@ -0,0 +1,116 @@
+import heapq
+import json
+import os
+import threading
+
+
+class HeadlinesWatermark(object):
+    """Watermark of a `/latest_headlines` query polled again and again, see ``poll_latest_headlines``.
+
+    It keeps the latest ``published_date`` seen, and the ``_id`` and ``published_date`` of the ``max_ids``
+    most recent articles seen. An article is known if its ``_id`` is among them, or if it was published no later
+    than :attr:`floor`, the most recent ``published_date`` of the ids forgotten to stay under ``max_ids``. Set
+    ``max_ids`` above the number of articles of a ``when`` period, so the floor stays out of it.
+
+    A watermark belongs to one query: polling another query with it raises a :class:`ValueError`. With a ``path``,
+    the watermark is loaded from that JSON file if it exists, and saved to it at the end of every poll, so the next
+    run of the poller carries on where the last one stopped.
+
+    :param path: Path of the JSON file the watermark is saved to, or `None` to keep it in memory only.
+    :type path: str or None
+
+    :param max_ids: Number of article ids remembered. Default: `10000`.
+    :type max_ids: int
+
+    :ivar latest: Latest ``published_date`` seen, or `None` before the first poll.
+    :ivar floor: Articles published no later than this date are known, `None` until ids are forgotten.
+    """
+
+    def __init__(self, path=None, max_ids=10000):
+        if type(max_ids) != int or max_ids <= 0:
+            raise ValueError("max_ids param should be an int greater than 0")
+        self.path = path
+        self.max_ids = max_ids
+        self.query = None
+        self.latest = None
+        self.floor = None
+        self.nb_new = 0
+        self.nb_known = 0
+        # _id -> published_date, and a heap of the (published_date, _id) to forget the oldest articles first
+        self._ids = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        self.query = state['query']
+        self.latest = state['latest']
+        self.floor = state['floor']
+        self._ids = dict(state['ids'])
+        self._heap = [(published_date or '', article_id) for article_id, published_date in self._ids.items()]
+        heapq.heapify(self._heap)
+
+    def save(self):
+        """Write the watermark to its ``path``, if any. Called at the end of every poll."""
+        if self.path is None:
+            return
+        with self._lock:
+            state = {'query': self.query, 'latest': self.latest, 'floor': self.floor, 'ids': list(self._ids.items())}
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+    def bind(self, query):
+        """Attach the watermark to the ``query`` parameters, or check that it is attached to the same ones."""
+        query = json.loads(json.dumps(query, sort_keys=True))
+        with self._lock:
+            if self.query is None:
+                self.query = query
+            elif self.query != query:
+                raise ValueError("The watermark belongs to another query, use one HeadlinesWatermark per query")
+
+    def is_known(self, article):
+        """Return whether the article was seen by a previous poll, or is older than the forgotten ids."""
+        article_id, published_date = _get_id_and_date(article)
+        if article_id is not None and article_id in self._ids:
+            return True
+        return published_date is not None and self.floor is not None and published_date <= self.floor
+
+    def add(self, article):
+        """Mark the article as seen. Return ``False`` if it was already known, ``True`` otherwise."""
+        article_id, published_date = _get_id_and_date(article)
+        with self._lock:
+            if self.is_known(article):
+                self.nb_known += 1
+                return False
+            self.nb_new += 1
+            if published_date is not None and (self.latest is None or published_date > self.latest):
+                self.latest = published_date
+            if article_id is not None:
+                self._ids[article_id] = published_date
+                heapq.heappush(self._heap, (published_date or '', article_id))
+                while len(self._ids) > self.max_ids:
+                    forgotten_date = self._ids.pop(heapq.heappop(self._heap)[1])
+                    if forgotten_date is not None and (self.floor is None or forgotten_date > self.floor):
+                        self.floor = forgotten_date
+            return True
+
+
+def get_watermark(watermark):
+    if not isinstance(watermark, HeadlinesWatermark):
+        raise TypeError("watermark param should be a HeadlinesWatermark")
+    return watermark
+
+
+def _get_id_and_date(article):
+    # published_date strings, like "2021-08-31 12:34:56", sort in time order
+    return (article['_id'] if '_id' in article else None,
+            article['published_date'] if 'published_date' in article else None)
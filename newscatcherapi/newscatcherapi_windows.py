@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from newscatcherapi import const
+
+
+class AdaptiveTimeWindows(object):
+    """Plan the time windows of an adaptive ``get_search_all_articles`` run from the ``total_hits`` of each window.
+
+    Windows start at the ``by`` size. A window with more hits than one query can return (``max_hits``) is split in
+    half and probed again, so no article is cut off. After a sparse window the next one is twice as large, which
+    merges quiet periods into fewer calls. Windows never overlap: each one ends one second before the next starts.
+
+    Drive it with :meth:`current` and :meth:`submit`::
+
+        while windows.current() is not None:
+            window_from, window_to = windows.current()
+            first_page = ...
+            if windows.submit(first_page['total_hits']):
+                ...  # the window is accepted, fetch its remaining pages
+
+    :param from_datetime: Start of the interval.
+    :type from_datetime: datetime
+
+    :param to_datetime: End of the interval, included.
+    :type to_datetime: datetime
+
+    :param delta: Initial window size.
+    :type delta: timedelta
+
+    :param max_hits: Most articles a single window can return.
+    :type max_hits: int
+    """
+
+    def __init__(self, from_datetime, to_datetime, delta, max_hits):
+        self.to_datetime = to_datetime
+        self.max_hits = max_hits
+        self._from = from_datetime
+        self._size = delta
+        self.nb_splits = 0
+        self.nb_merges = 0
+
+    def current(self):
+        """Return the ``(window_from, window_to)`` to probe next, or ``None`` once the interval is covered."""
+        if self._from > self.to_datetime:
+            return None
+        window_to = min(self._from + self._size - const.WINDOW_RESOLUTION, self.to_datetime)
+        return self._from, window_to
+
+    def submit(self, total_hits):
+        """Record the hits of the current window. Return ``True`` if it is accepted, ``False`` if it was split."""
+        window_from, window_to = self.current()
+        window_size = window_to - window_from + const.WINDOW_RESOLUTION
+
+        if total_hits > self.max_hits and window_size > const.MIN_ADAPTIVE_WINDOW:
+            self._size = max(_round_size(window_size / 2), const.MIN_ADAPTIVE_WINDOW)
+            self.nb_splits += 1
+            return False
+
+        self._from = window_to + const.WINDOW_RESOLUTION
+        if total_hits * 4 <= self.max_hits:
+            self._size = window_size * 2
+            self.nb_merges += 1
+        else:
+            self._size = window_size
+        return True
+
+
+def _round_size(size):
+    return timedelta(seconds=int(size.total_seconds()))
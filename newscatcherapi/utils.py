@@ -1,18 +1,24 @@
 from __future__ import unicode_literals
 from newscatcherapi import const
 
+import re
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import requests
+from requests.adapters import HTTPAdapter
 
 def validate_language(language):
     if is_valid_list(language):
         for each_lang in language:
-            if each_lang.strip().lower() not in const.allowed_languages:
+            if each_lang.strip().lower() not in const.allowed_language_set:
                 raise ValueError(f"{each_lang} - is an invalid language. Language should be one of this list => {str(const.allowed_languages)}")
         return ','.join([i.strip().lower() for i in language])
     elif is_valid_string(language):
         language_clean = [i.strip().lower() for i in language.split(',')]
         for each_lang in language_clean:
-            if each_lang not in const.allowed_languages:
+            if each_lang not in const.allowed_language_set:
                 raise ValueError(f"{each_lang} - is an invalid language. Language should be one of this list => {str(const.allowed_languages)}")
         return ','.join(language_clean)
     else:
@@ -31,7 +37,7 @@ def validate_countries(list_countries, name_parameter):
 
 def validate_topic(topic):
     if is_valid_string(topic):
-        if topic in const.allowed_topics:
+        if topic in const.allowed_topic_set:
             return topic
         else:
             raise ValueError(
@@ -60,6 +66,304 @@ def validate_when(when, name_parameter):
         raise TypeError(f"{name_parameter} parameter should be of type str")
 
 
+def validate_page_size(page_size):
+    if type(page_size) == int:
+        return page_size
+    else:
+        raise TypeError("page_size param should be an int")
+
+
+def validate_page(page):
+    if type(page) == int:
+        if page > 0:
+            return page
+        else:
+            raise ValueError("page param should be an int greater than 0")
+    else:
+        raise TypeError("page param should be an int")
+
+
+def validate_max_page(max_page, page):
+    if type(max_page) == int:
+        if max_page >= page:
+            return max_page
+        else:
+            raise ValueError("max_page param should be greater than page param")
+    else:
+        raise TypeError("max_page param should be an int")
+
+
+def validate_max_workers(max_workers):
+    if type(max_workers) == int:
+        if max_workers > 0:
+            return max_workers
+        else:
+            raise ValueError("max_workers param should be an int greater than 0")
+    else:
+        raise TypeError("max_workers param should be an int")
+
+
+def validate_limit(limit):
+    if type(limit) == int:
+        if limit > 0:
+            return limit
+        else:
+            raise ValueError("limit param should be an int greater than 0")
+    else:
+        raise TypeError("limit param should be an int")
+
+
+def get_max_page_for_limit(limit, page, page_size, max_page):
+    # the last page needed to produce `limit` articles, so that no page is requested past it
+    validate_limit(limit)
+    if validate_page_size(page_size) < 1:
+        raise ValueError("page_size param should be an int greater than 0")
+    last_page = page + (limit + page_size - 1) // page_size - 1
+    if max_page is None or max_page > last_page:
+        return max(last_page, page)
+    return max_page
+
+
+def make_request_key(endpoint, payload):
+    # hashable identity of an API call, the payload being already validated and normalized
+    return endpoint, tuple(sorted(payload.items()))
+
+
+def get_window_max_hits(page, page_size, max_page):
+    # how many articles of a time window can be extracted with the given page parameters: below page_size 100, the
+    # page cap of the API is reached before its article cap
+    last_page = const.MAX_PAGES_PER_QUERY
+    if max_page is not None:
+        last_page = min(last_page, max_page)
+    return min(const.MAX_ARTICLES_PER_QUERY, (last_page - page + 1) * page_size)
+
+
+def get_window_last_page(first_result, max_page):
+    # last page number extracted by the *_all_pages loop, given the first page of the results
+    if max_page is not None and max_page <= first_result['total_pages']:
+        return max_page
+    return first_result['total_pages']
+
+
+def validate_pool_size(pool_size, name_parameter):
+    if type(pool_size) == int:
+        if pool_size > 0:
+            return pool_size
+        else:
+            raise ValueError(f"{name_parameter} param should be an int greater than 0")
+    else:
+        raise TypeError(f"{name_parameter} param should be an int")
+
+
+def create_session(pool_connections, pool_maxsize):
+    adapter = HTTPAdapter(pool_connections=validate_pool_size(pool_connections, 'pool_connections'),
+                          pool_maxsize=validate_pool_size(pool_maxsize, 'pool_maxsize'))
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def validate_choice(value, allowed, name_parameter, description):
+    if is_valid_string(value):
+        if value in allowed:
+            return value
+        else:
+            raise ValueError(f'{value} is not a valid {description}. '
+                             f'It should be one of the list: {str(allowed)}')
+    else:
+        raise TypeError(f"{name_parameter} parameter should be of type str")
+
+
+def validate_batch_queries(queries):
+    # queries of iter_search_batch: a dict or pairs of query ID and get_search parameters, prepared by the client
+    items = list(queries.items()) if isinstance(queries, dict) else list(queries)
+    if not items:
+        raise ValueError("queries param should contain at least one query")
+
+    query_ids = set()
+    for query_id, params in items:
+        if query_id in query_ids:
+            raise ValueError(f"{query_id} is used by more than one query")
+        query_ids.add(query_id)
+        if not isinstance(params, dict):
+            raise TypeError("the parameters of each query should be a dict")
+        if 'page' in params or 'proxies' in params:
+            raise ValueError("page and proxies are set for the whole batch, not per query")
+    return items
+
+
+def iter_batch_rounds(nb_pages):
+    # (query_id, page) of the pages after the first one, one page of each query per round
+    for page in range(2, max(nb_pages.values(), default=1) + 1):
+        for query_id, query_nb_pages in nb_pages.items():
+            if query_nb_pages >= page:
+                yield query_id, page
+
+
+# functions building the validated query parameters of each endpoint
+def build_latest_headlines_payload(lang=None, not_lang=None, countries=None, not_countries=None, topic=None,
+                                   sources=None, not_sources=None, when=None, ranked_only=None, page_size=None,
+                                   page=None):
+    payload = {}
+
+    # Language
+    if lang is not None:
+        payload["lang"] = validate_language(lang)
+
+    if not_lang is not None:
+        payload["not_lang"] = validate_language(not_lang)
+
+    # Countries
+    if countries is not None:
+        payload["countries"] = validate_countries(countries, 'countries')
+
+    if not_countries is not None:
+        payload["not_countries"] = validate_countries(not_countries, 'not_countries')
+
+    # Topic
+    if topic is not None:
+        payload['topic'] = validate_topic(topic)
+
+    # Sources
+    if sources is not None:
+        payload["sources"] = validate_sources(sources, 'sources')
+
+    if not_sources is not None:
+        payload["not_sources"] = validate_sources(not_sources, 'not_sources')
+
+    # When
+    if when is not None:
+        payload["when"] = validate_when(when, 'when')
+
+    # Ranks
+    if ranked_only is not None:
+        if is_valid_boolean(ranked_only):
+            payload['ranked_only'] = ranked_only
+        else:
+            raise TypeError("ranked_only parameter should be of type boolean")
+
+    # Page and page sizes
+    if page_size is not None:
+        payload["page_size"] = validate_page_size(page_size)
+
+    if page is not None:
+        payload["page"] = validate_page(page)
+
+    return payload
+
+
+def build_search_payload(q=None, lang=None, not_lang=None, from_=None, to_=None, published_date_precision=None,
+                         search_in=None, countries=None, not_countries=None, topic=None, sources=None,
+                         not_sources=None, ranked_only=None, from_rank=None, to_rank=None, sort_by=None,
+                         page_size=None, page=None):
+    payload = {}
+
+    # Q
+    if q is not None:
+        if is_valid_string(q):
+            payload["q"] = q
+        else:
+            raise TypeError("q parameter should be of type str")
+
+    # Language
+    if lang is not None:
+        payload["lang"] = validate_language(lang)
+
+    if not_lang is not None:
+        payload["not_lang"] = validate_language(not_lang)
+
+    # Time variables
+    if from_ is not None:
+        if is_valid_string(from_):
+            payload["from"] = from_
+        else:
+            raise TypeError("from_ parameter should be of type str")
+
+    if to_ is not None:
+        if is_valid_string(to_):
+            payload["to"] = to_
+        else:
+            raise TypeError("to_ parameter should be of type str")
+
+    if published_date_precision is not None:
+        payload["published_date_precision"] = validate_choice(published_date_precision, const.allowed_precisions,
+                                                              'published_date_precision', 'date precision')
+
+    # Search in
+    if search_in is not None:
+        payload["search_in"] = validate_choice(search_in, const.allowed_search_ins, 'search_in',
+                                               'place to search for keywords')
+
+    # Countries
+    if countries is not None:
+        payload["countries"] = validate_countries(countries, 'countries')
+
+    if not_countries is not None:
+        payload["not_countries"] = validate_countries(not_countries, 'not_countries')
+
+    # Topic
+    if topic is not None:
+        payload['topic'] = validate_topic(topic)
+
+    # Sources
+    if sources is not None:
+        payload["sources"] = validate_sources(sources, 'sources')
+
+    if not_sources is not None:
+        payload["not_sources"] = validate_sources(not_sources, 'not_sources')
+
+    # Ranks
+    if ranked_only is not None:
+        if is_valid_boolean(ranked_only):
+            payload['ranked_only'] = ranked_only
+        else:
+            raise TypeError("ranked_only parameter should be of type boolean")
+
+    if from_rank is not None:
+        if is_valid_num(from_rank):
+            payload['from_rank'] = from_rank
+        else:
+            raise TypeError("from_rank parameter should be of type int")
+
+    if to_rank is not None:
+        if is_valid_num(to_rank):
+            payload['to_rank'] = to_rank
+        else:
+            raise TypeError("to_rank parameter should be of type int")
+
+    # Sort by
+    if sort_by is not None:
+        payload["sort_by"] = validate_choice(sort_by, const.allowed_sorts, 'sort_by', 'sort by type')
+
+    # Page and page sizes
+    if page_size is not None:
+        payload["page_size"] = validate_page_size(page_size)
+
+    if page is not None:
+        payload["page"] = validate_page(page)
+
+    return payload
+
+
+def build_sources_payload(lang=None, countries=None, topic=None):
+    payload = {}
+
+    # Language
+    if lang is not None:
+        payload["lang"] = validate_language(lang)
+
+    # Countries
+    if countries is not None:
+        payload["countries"] = validate_countries(countries, 'countries')
+
+    # Topic
+    if topic is not None:
+        payload['topic'] = validate_topic(topic)
+
+    return payload
+
+
 PY2 = sys.version_info[0] == 2
 PY3 = sys.version_info[0] == 3
 
@@ -106,3 +410,172 @@ def update_final_res(results, payload):
     payload['total_pages'] += results['total_pages']
     payload['page'] += results['page']
     return False
+
+
+def init_final_res():
+    return {'status': '', 'total_hits': 0, 'page': 0, 'total_pages': 0, 'page_size': 0, 'articles': [], 'user_input': {}}
+
+
+def finalize_final_res(results, payload, page_size, by, nb_articles_written=None):
+    payload['page_size'] = page_size
+    payload['user_input'] = results['user_input']
+    payload['user_input']['by'] = by
+    if nb_articles_written is not None:
+        # the articles went to a sink, only the summary is returned
+        del payload['articles']
+        payload['nb_articles_written'] = nb_articles_written
+        nb_articles = nb_articles_written
+    else:
+        nb_articles = len(payload['articles'])
+    if nb_articles > 0:
+        payload['status'] = 'ok'
+    else:
+        payload['status'] = 'No matches for your search.'
+    return payload
+
+
+# functions splitting the from_/to_ interval of get_search_all_articles into windows
+def get_time_delta(by):
+    if by == 'month':
+        return timedelta(days=28)
+    elif by == 'week':
+        return timedelta(days=7)
+    elif by == 'day':
+        return timedelta(days=1)
+    elif by == 'hour':
+        return timedelta(hours=1)
+    else:
+        raise ValueError(f"{by} is not a valid by value. It should be one of the list: {str(const.allowed_bys)}")
+
+
+def get_search_interval(from_, to_, by):
+    if not from_:
+        from_ = (datetime.utcnow() - timedelta(days=7)).strftime('%Y/%m/%d')
+    if not to_:
+        to_ = datetime.utcnow().strftime('%Y/%m/%d')
+
+    # create a timedelta corresponding to the by parameter
+    delta = get_time_delta(by)
+
+    # Convert the to_ and from_ parameters to datetime object
+    # Check if time is specified and treat accordingly
+    to_datetime = parse_date(to_)
+    from_datetime = parse_date(from_)
+
+    # the by parameter can't be smaller than `to_ - from_`
+    if to_datetime - from_datetime < delta:
+        raise ValueError("The 'by' parameter cannot be bigger than the difference of from_ and to_")
+
+    return from_datetime, to_datetime, delta
+
+
+def iter_time_windows(from_datetime, to_datetime, delta):
+    while True:
+
+        if to_datetime - from_datetime <= delta:
+            yield from_datetime, to_datetime
+            return
+
+        # move the to_ parameter forward
+        temp_to_ = from_datetime + delta
+
+        # subtract 1 sec if the to_ parameter is the exact midnight, for this window only
+        midnight_flag = False
+        if temp_to_.hour == 0 and temp_to_.minute == 0 and temp_to_.second == 0:
+            temp_to_ -= timedelta(seconds=1)
+            midnight_flag = True
+
+        yield from_datetime, temp_to_
+
+        # move the from_ parameter forward
+        from_datetime = temp_to_
+
+        # Add a second so from_ doesn't become DD-1/MM/YYYY 23:59:59
+        if midnight_flag:
+            from_datetime += timedelta(seconds=1)
+
+
+def format_window_date(value):
+    # same output as value.strftime(const.WINDOW_DATE_FORMAT), without parsing the format for every window
+    return (f'{value.month:02d}/{value.day:02d}/{value.year:04d} '
+            f'{value.hour:02d}:{value.minute:02d}:{value.second:02d}')
+
+
+# YYYY/MM/DD or YYYY-MM-DD, with an optional time, fraction of second and UTC offset, e.g. ISO 8601
+_ISO_DATE_RE = re.compile(r'(\d{4})[-/](\d{2})[-/](\d{2})'
+                          r'(?:[ T](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?'
+                          r'(Z|[+-]\d{2}:?\d{2})?')
+# MM/DD/YYYY HH:MM:SS, the const.WINDOW_DATE_FORMAT of the time windows
+_WINDOW_DATE_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4}) (\d{2}):(\d{2}):(\d{2})')
+
+
+def parse_date(value):
+    """Parse a ``from_``/``to_`` date as a naive UTC datetime, or return ``None`` if it is not a date.
+
+    The ISO and ``YYYY/MM/DD[ HH:MM:SS]`` formats, and the format of the time windows, are parsed directly.
+    Other formats, like ``"3 days ago"``, fall back to dateparser, which is only imported then. Values other than
+    a str or a datetime raise a :class:`TypeError`.
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    elif not isinstance(value, str):
+        raise TypeError(f"date should be a str or a datetime, not {type(value).__name__}")
+    else:
+        parsed = _parse_date_fast(value.strip())
+        if parsed is None:
+            from dateparser import parse as dateparser_parse
+
+            parsed = dateparser_parse(value, settings={'TIMEZONE': 'UTC'})
+
+    if parsed is not None and parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse_date_fast(value):
+    match = _ISO_DATE_RE.fullmatch(value)
+    try:
+        if match is not None:
+            year, month, day, hour, minute, second, fraction, offset = match.groups()
+            parsed = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+                              int((fraction or '0').ljust(6, '0')))
+            if offset is not None and offset != 'Z':
+                sign = -1 if offset[0] == '-' else 1
+                offset = offset[1:].replace(':', '')
+                parsed -= sign * timedelta(hours=int(offset[:2]), minutes=int(offset[2:]))
+            return parsed
+
+        match = _WINDOW_DATE_RE.fullmatch(value)
+        if match is not None:
+            month, day, year, hour, minute, second = map(int, match.groups())
+            return datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        # out of range values, like a day-first date, are left to dateparser
+        return None
+    return None
+
+
+def imap_ordered(func, items, max_workers):
+    """Yield ``func(item)`` for each item, in order, running up to ``max_workers`` calls at once on a thread pool.
+
+    At most ``2 * max_workers`` items are submitted ahead of the consumer, and the items that have not started
+    yet are cancelled when the consumer stops early. With no ``max_workers`` the calls run one by one.
+    """
+    if not max_workers or max_workers == 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        try:
+            for item in items:
+                if len(in_flight) >= 2 * max_workers:
+                    yield in_flight.popleft().result()
+                in_flight.append(executor.submit(func, item))
+
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -15,6 +15,7 @@ from setuptools import setup, find_packages
 VERSION = "0.7.2"
 INSTALL_REQUIRES = ["requests>=2.24.0", "dateparser"]
 TESTS_REQUIRE = ["pytest"]
+EXTRAS_REQUIRE = {"async": ["aiohttp>=3.7"], "orjson": ["orjson>=3"], "parquet": ["pyarrow>=1"], "zstd": ["zstandard>=0.15"]}
 
 if __name__ == "__main__":
     setup(
@@ -25,6 +26,7 @@ if __name__ == "__main__":
         url="https://github.com/NewscatcherAPI/newscatcherapi-sdk-python",
         packages=find_packages(),
         install_requires=INSTALL_REQUIRES,
+        extras_require=EXTRAS_REQUIRE,
         tests_require=TESTS_REQUIRE,
         description="An official Python client for the NewsCatcher News API",
         download_url="",
@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode('utf-8')
+        self.headers = {'Content-Type': 'application/json'}
+        self.headers.update(headers or {})
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession(object):
+    """Stand-in for :class:`requests.Session` serving paginated search results without network access."""
+
+    def __init__(self, total_pages=3, page_size=2, delays=None, failing_pages=(), hits_per_hour=None, drift=0,
+                 transient_errors=None, pages_per_query=None, record_calls=True):
+        self.hits_per_hour = hits_per_hour
+        # page -> list of status codes or exceptions returned by the first calls of the page
+        self.transient_errors = {page: list(errors) for page, errors in (transient_errors or {}).items()}
+        self.drift = drift
+        self.total_pages = total_pages
+        # q -> total_pages of the query, the other queries having `total_pages`
+        self.pages_per_query = pages_per_query or {}
+        self.page_size = page_size
+        self.delays = delays or {}
+        self.failing_pages = set(failing_pages)
+        # the calls are not kept by the memory tests
+        self.record_calls = record_calls
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, params=None, proxies=None):
+        # the parameters as received by the API: a pre-encoded query string or a dict, str values either way
+        if isinstance(params, str):
+            params = dict(parse_qsl(params))
+        else:
+            params = {name: str(value) for name, value in (params or {}).items()}
+        if self.record_calls:
+            with self.lock:
+                self.calls.append((url, params))
+        page = int(params.get('page', 1))
+        time.sleep(self.delays.get(page, 0))
+
+        with self.lock:
+            errors = self.transient_errors.get(page)
+            error = errors.pop(0) if errors else None
+        if isinstance(error, Exception):
+            raise error
+        if error is not None:
+            return FakeResponse(error, {'status': 'error', 'error_code': f'HTTP_{error}', 'message': 'try again'},
+                                headers={'Retry-After': '0'} if error == 429 else None)
+
+        if page in self.failing_pages:
+            return FakeResponse(400, {'status': 'error', 'error_code': 'HTTP_400', 'message': 'page failed'})
+
+        total_hits = self.pages_per_query.get(params.get('q'), self.total_pages) * self.page_size
+        if self.hits_per_hour is not None:
+            # one article every 3600 / hits_per_hour seconds of the requested window
+            window_from = datetime.strptime(params['from'], '%m/%d/%Y %H:%M:%S')
+            window_to = datetime.strptime(params['to'], '%m/%d/%Y %H:%M:%S')
+            total_hits = int(((window_to - window_from).total_seconds() + 1) * self.hits_per_hour / 3600)
+        total_pages = (total_hits + self.page_size - 1) // self.page_size
+        nb_articles = max(0, min(self.page_size, total_hits - (page - 1) * self.page_size))
+
+        prefix = f'{params["from"]}-' if 'from' in params else ''
+        if self.drift:
+            # new articles indexed between two calls push the last `drift` articles of a page to the next one
+            ids = [f'{prefix}{(page - 1) * (self.page_size - self.drift) + i}' for i in range(nb_articles)]
+        else:
+            ids = [f'{prefix}{page}-{i}' for i in range(nb_articles)]
+        articles = [{'_id': article_id, 'title': f'article {i} of page {page}'} for i, article_id in enumerate(ids)]
+        return FakeResponse(200, {'status': 'ok', 'total_hits': total_hits, 'page': page,
+                                  'total_pages': total_pages, 'page_size': self.page_size,
+                                  'articles': articles, 'user_input': params})
@@ -0,0 +1,213 @@
+"""Local stand-in for the NewsCatcher News API, serving synthetic articles without network access or API key."""
+
+import hashlib
+import json
+import multiprocessing
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from newscatcherapi import const, utils
+
+SUMMARY_SENTENCE = 'The quick brown fox jumps over the lazy dog near the river bank. '
+
+
+class MockNewsCatcherServer(object):
+    """HTTP server implementing `/v2/search`, `/v2/latest_headlines` and `/v2/sources` with synthetic articles.
+
+    Pages are deterministic: the same query and page always give the same articles, with ``_id`` values unique
+    per query, window and position. The number of hits of a `/search` call is ``total_hits``, or
+    ``hits_per_day`` times the length of its ``from``/``to`` window when set, capped at the 10 000 articles the API
+    returns. Every ``rate_limit_every``-th request is answered with a 429 and a ``Retry-After`` header.
+
+    Run it in a thread with :meth:`start`, or in another process with :meth:`start_process`, so that timing the
+    client is not disturbed by the server sharing its interpreter.
+
+    :param total_hits: Hits of every query without a window. Default: `1000`.
+    :param hits_per_day: Hits per day of the ``from``/``to`` window of `/search` calls, `None` to use ``total_hits``.
+    :param latency: Seconds waited before answering each request. Default: `0`.
+    :param rate_limit_every: Answer every n-th request with a 429. Default: `0`, never.
+    :param retry_after: ``Retry-After`` header of the 429 responses, in seconds. Default: `0`.
+    :param summary_size: Length of the summary of each article, in characters. Default: `1000`.
+    :param api_key: Only accept this ``x-api-key``, `None` to accept any key.
+    """
+
+    def __init__(self, total_hits=1000, hits_per_day=None, latency=0.0, rate_limit_every=0, retry_after=0,
+                 summary_size=1000, api_key=None, host='127.0.0.1', port=0):
+        self.total_hits = total_hits
+        self.hits_per_day = hits_per_day
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.summary = (SUMMARY_SENTENCE * (summary_size // len(SUMMARY_SENTENCE) + 1))[:summary_size]
+        self.api_key = api_key
+        self.host = host
+        self.port = port
+        self.nb_requests = 0
+        self.paths = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._process = None
+
+    @property
+    def base_url(self):
+        return f'http://{self.host}:{self.port}'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Serve in a background thread of this process and return the server."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def start_process(self):
+        """Serve in a child process and return the server. :attr:`nb_requests` is then not updated."""
+        ready = multiprocessing.get_context('spawn').Queue()
+        self._process = multiprocessing.get_context('spawn').Process(target=_serve_in_process, args=(self, ready),
+                                                                     daemon=True)
+        self._process.start()
+        self.port = ready.get(timeout=30)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __getstate__(self):
+        # sent to the child process of start_process, without the server, thread and lock
+        state = dict(self.__dict__)
+        state.update(_server=None, _thread=None, _process=None, _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def respond(self, path, params, headers):
+        """Return the ``(status, headers, body)`` answer to a request."""
+        with self._lock:
+            self.nb_requests += 1
+            nb_requests = self.nb_requests
+            self.paths.append(path)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.api_key is not None and headers.get('x-api-key') != self.api_key:
+            return _error(401, 'HTTP_401', 'Invalid API key')
+        if self.rate_limit_every and nb_requests % self.rate_limit_every == 0:
+            status, response_headers, body = _error(429, 'HTTP_429', 'Too many requests')
+            response_headers['Retry-After'] = str(self.retry_after)
+            return status, response_headers, body
+
+        if path == const.SEARCH_URL:
+            if not params.get('q'):
+                return _error(422, 'HTTP_422', '[q] parameter is required')
+            return self._articles(params, self._count_search_hits(params))
+        if path == const.LATEST_HEADLINES_URL:
+            return self._articles(params, self.total_hits)
+        if path == const.SOURCES_URL:
+            sources = [f'source-{i}.com' for i in range(50)]
+            return _ok({'message': 'Maximum sources displayed according to your plan is set to 1000',
+                        'sources': sources, 'user_input': params})
+        return _error(404, 'HTTP_404', f'{path} not found')
+
+    def _count_search_hits(self, params):
+        if self.hits_per_day is None or 'from' not in params or 'to' not in params:
+            return self.total_hits
+        try:
+            window = utils.parse_date(params['to']) - utils.parse_date(params['from']) + timedelta(seconds=1)
+        except ValueError:
+            return self.total_hits
+        return max(0, int(window.total_seconds() * self.hits_per_day / 86400))
+
+    def _articles(self, params, total_hits):
+        page_size = int(params.get('page_size', 50))
+        page = int(params.get('page', 1))
+        total_hits = min(total_hits, const.MAX_ARTICLES_PER_QUERY)
+        if total_hits == 0:
+            return _ok({'status': 'No matches for your search.', 'total_hits': 0, 'page': page,
+                        'total_pages': 0, 'page_size': page_size, 'user_input': params})
+
+        total_pages = (total_hits + page_size - 1) // page_size
+        first = (page - 1) * page_size
+        prefix = hashlib.sha1(f'{params.get("q")}|{params.get("from")}|{params.get("to")}'.encode()).hexdigest()[:8]
+        articles = [self._article(prefix, position) for position in range(first, min(first + page_size, total_hits))]
+        return _ok({'total_hits': total_hits, 'page': page, 'total_pages': total_pages, 'page_size': page_size,
+                    'articles': articles, 'user_input': params})
+
+    def _article(self, prefix, position):
+        return {
+            'title': f'Synthetic article {position}',
+            'author': 'Jane Doe',
+            'authors': ['Jane Doe'],
+            'published_date': f'2021-01-{position % 28 + 1:02d} {position % 24:02d}:00:00',
+            'published_date_precision': 'full',
+            'link': f'https://news-{position % 97}.example.com/articles/{prefix}-{position}',
+            'clean_url': f'news-{position % 97}.example.com',
+            'excerpt': self.summary[:120],
+            'summary': self.summary,
+            'rights': f'news-{position % 97}.example.com',
+            'rank': position % 5000 + 1,
+            'topic': 'news',
+            'country': 'US',
+            'language': 'en',
+            'is_opinion': False,
+            'twitter_account': None,
+            '_score': 10.0,
+            '_id': f'{prefix}{position:08d}',
+        }
+
+
+def _ok(body):
+    body.setdefault('status', 'ok')
+    return 200, {}, body
+
+
+def _error(status, error_code, message):
+    return status, {}, {'status': 'error', 'error_code': error_code, 'message': message}
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            status, headers, body = server.respond(url.path, dict(parse_qsl(url.query)),
+                                                   {key.lower(): value for key, value in self.headers.items()})
+            content = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _serve_in_process(server, ready):
+    server.start()
+    ready.put(server.port)
+    server._thread.join()
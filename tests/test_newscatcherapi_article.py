@@ -0,0 +1,96 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from newscatcherapi import Article, MemoryTransport, NewsCatcherApiClient
+from newscatcherapi.newscatcherapi_article import to_articles
+from tests.fakes import FakeSession
+
+SUMMARY = 'Elon Musk said on Monday that the company would build a new factory. ' * 20
+
+
+class ArticleTest(unittest.TestCase):
+    def setUp(self):
+        self.fields = {'_id': 'a1', 'title': 'Tesla', 'summary': SUMMARY, 'rank': 12, 'country': 'US',
+                       'new_field': [1, 2]}
+        self.article = Article(self.fields)
+
+    def test_dict_access(self):
+        article = self.article
+        self.assertEqual(article['title'], 'Tesla')
+        self.assertEqual(article.title, 'Tesla')
+        self.assertEqual(article.get('link', 'none'), 'none')
+        self.assertIn('summary', article)
+        self.assertNotIn('link', article)
+        self.assertEqual(list(article), ['_id', 'title', 'summary', 'rank', 'country', 'new_field'])
+        self.assertEqual(len(article), 6)
+        self.assertEqual(article, self.fields)
+        self.assertEqual(article.to_dict(), self.fields)
+        with self.assertRaises(KeyError):
+            article['link']
+
+        article['rank'] = 1
+        article['other'] = True
+        self.assertEqual((article['rank'], article['other']), (1, True))
+
+    def test_summary_compression_is_opt_in(self):
+        self.assertIs(self.article._summary, SUMMARY)
+
+        article = Article(self.fields, compress_summary=True)
+        self.assertIsInstance(article._summary, bytes)
+        self.assertLess(len(article._summary), len(SUMMARY) / 4)
+        self.assertEqual(article.summary, SUMMARY)
+        self.assertEqual(article, self.fields)
+        self.assertEqual(Article({'summary': 'short'}, compress_summary=True)._summary, 'short')
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.article, '__dict__'))
+
+    def test_json_and_pickle(self):
+        self.assertEqual(json.loads(json.dumps({'articles': [self.article]}, default=dict)),
+                         {'articles': [self.fields]})
+        self.assertEqual(pickle.loads(pickle.dumps(self.article)), self.fields)
+
+    def test_to_articles(self):
+        result = to_articles({'status': 'ok', 'articles': [self.fields, self.article]})
+        self.assertIsInstance(result['articles'][0], Article)
+        self.assertIs(result['articles'][1], self.article)
+        self.assertEqual(to_articles({'sources': ['a.com']}), {'sources': ['a.com']})
+
+
+class ClientCompactArticlesTest(unittest.TestCase):
+    def test_get_search_all_pages(self):
+        api = NewsCatcherApiClient('key', session=FakeSession(), compact_articles=True)
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0, dedup=True)
+        self.assertEqual(len(result['articles']), 6)
+        self.assertTrue(all(isinstance(article, Article) for article in result['articles']))
+        self.assertEqual(result['articles'][0]['_id'], '1-0')
+
+    def test_compress_summaries(self):
+        body = json.dumps({'status': 'ok', 'articles': [{'_id': 'a1', 'summary': SUMMARY}]})
+        transport = MemoryTransport(lambda path, params, headers: (200, None, body))
+        article = NewsCatcherApiClient('key', transport=transport, compact_articles=True).get_search(
+            q='Elon Musk')['articles'][0]
+        self.assertIsInstance(article._summary, str)
+
+        api = NewsCatcherApiClient('key', transport=transport, compact_articles=True, compress_summaries=True)
+        article = api.get_search(q='Elon Musk')['articles'][0]
+        self.assertIsInstance(article._summary, bytes)
+        self.assertEqual(article['summary'], SUMMARY)
+        with self.assertRaises(ValueError):
+            NewsCatcherApiClient('key', session=FakeSession(), compress_summaries=True)
+
+    def test_checkpoint_replay(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'backfill.jsonl')
+
+        api = NewsCatcherApiClient('key', session=FakeSession(), compact_articles=True)
+        params = dict(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day', seconds_pause=0, checkpoint=path)
+        first = api.get_search_all_articles(**params)
+        resumed = api.get_search_all_articles(resume=True, **params)
+        self.assertTrue(all(isinstance(article, Article) for article in resumed['articles']))
+        self.assertEqual(resumed['articles'], first['articles'])
@@ -0,0 +1,167 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from newscatcherapi import (Article, AsyncNewsCatcherApiClient, HeadlinesWatermark, MetricsCollector, Profiler,
+                            RetryPolicy)
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+
+
+def make_app(total_pages=3, calls=None):
+    nb_flaky_calls = []
+
+    async def search(request):
+        if request.headers.get('x-api-key') != 'key':
+            return web.json_response({'status': 'error', 'error_code': 'HTTP_401', 'message': 'bad key'}, status=401)
+        if request.query.get('q') == 'flaky' and len(nb_flaky_calls) < 2:
+            nb_flaky_calls.append(1)
+            return web.json_response({'status': 'error', 'error_code': 'HTTP_503', 'message': 'try again'},
+                                     status=503, headers={'Retry-After': '0'})
+        page = int(request.query.get('page', 1))
+        if calls is not None:
+            calls.append(dict(request.query))
+        return web.json_response({'status': 'ok', 'total_hits': total_pages, 'page': page,
+                                  'total_pages': total_pages, 'page_size': 1,
+                                  'articles': [{'_id': str(page), 'title': request.query.get('q')}],
+                                  'user_input': dict(request.query)})
+
+    app = web.Application()
+    app.router.add_get('/v2/search', search)
+    app.router.add_get('/v2/latest_headlines', search)
+    return app
+
+
+class AsyncNewsCatcherApiTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = []
+        self.server = TestServer(make_app(calls=self.calls))
+        await self.server.start_server()
+        self.api = AsyncNewsCatcherApiClient('key', base_url=str(self.server.make_url('')).rstrip('/'))
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        await self.server.close()
+
+    async def test_validation(self):
+        with self.assertRaises(TypeError):
+            await self.api.get_search(q=0)
+
+        with self.assertRaises(ValueError):
+            await self.api.get_latest_headlines(lang='aer')
+
+        with self.assertRaises(ValueError):
+            await self.api.get_sources(topic='dogcoin')
+
+    async def test_sync_only_options(self):
+        with self.assertRaisesRegex(TypeError, 'transport'):
+            AsyncNewsCatcherApiClient('key', transport=object())
+        with self.assertRaisesRegex(TypeError, 'disk_cache'):
+            AsyncNewsCatcherApiClient('key', disk_cache=object())
+        for option, value in (('checkpoint', 'backfill.jsonl'), ('resume', True), ('sink', [])):
+            with self.assertRaisesRegex(TypeError, option):
+                await self.api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', **{option: value})
+        with self.assertRaisesRegex(TypeError, 'checkpoint'):
+            async for _ in self.api.iter_search_articles(q='Elon Musk', from_='2021/01/01', checkpoint='a.jsonl'):
+                pass
+        self.assertEqual(self.calls, [])
+
+    async def test_get_search(self):
+        result = await self.api.get_search(q='Elon Musk', ranked_only=True, page=2)
+        self.assertEqual(result['page'], 2)
+        self.assertEqual(result['user_input']['ranked_only'], 'True')
+
+    async def test_get_search_all_pages(self):
+        result = await self.api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+        self.assertEqual([article['_id'] for article in result['articles']], ['1', '2', '3'])
+
+    async def test_get_search_all_pages_concurrent(self):
+        result = await self.api.get_search_all_pages(q='Elon Musk', seconds_pause=0, max_workers=3)
+        self.assertEqual([article['_id'] for article in result['articles']], ['1', '2', '3'])
+
+    async def test_iter_search_pages(self):
+        pages = [result async for result in self.api.iter_search_pages(q='Elon Musk', page_size=1,
+                                                                             seconds_pause=0, limit=2)]
+        self.assertEqual([result['page'] for result in pages], [1, 2])
+
+    async def test_get_search_all_articles_parallel_windows(self):
+        result = await self.api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/05', by='day',
+                                                        seconds_pause=0, max_workers=4)
+        self.assertEqual(len(result['articles']), 12)
+        self.assertEqual(result['status'], 'ok')
+
+    async def test_iter_search_batch(self):
+        pages = [(query_id, result['user_input']['q'], result['page'])
+                 async for query_id, result in self.api.iter_search_batch({'a': {'q': 'Tesla'}, 'b': {'q': 'SpaceX'}},
+                                                                          max_page=2, seconds_pause=0, max_workers=2)]
+        self.assertEqual(pages, [('a', 'Tesla', 1), ('b', 'SpaceX', 1), ('a', 'Tesla', 2), ('b', 'SpaceX', 2)])
+
+    async def test_coalesce(self):
+        api = AsyncNewsCatcherApiClient('key', base_url=self.api.base_url, coalesce=True)
+        results = await asyncio.gather(*(api.get_search(q='Elon Musk', page=2) for _ in range(5)))
+        await api.close()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    async def test_fetch_prepared_query(self):
+        query = self.api.prepare_search(q='Elon Musk & "Tesla"', from_='2021/01/01', ranked_only=True)
+        result = await self.api.fetch(query.page(2))
+        self.assertEqual(result['user_input'], {'q': 'Elon Musk & "Tesla"', 'from': '2021/01/01',
+                                                'ranked_only': 'True', 'page': '2'})
+
+    async def test_metrics(self):
+        metrics = MetricsCollector()
+        api = AsyncNewsCatcherApiClient('key', base_url=self.api.base_url, hooks=metrics)
+        await api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+        await api.close()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual((snapshot['requests'], snapshot['pages'], snapshot['articles']), (3, 3, 3))
+        self.assertEqual(snapshot['latency']['/v2/search']['count'], 3)
+
+    async def test_profiler(self):
+        profiler = Profiler()
+        api = AsyncNewsCatcherApiClient('key', base_url=self.api.base_url, hooks=profiler)
+        await api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                          seconds_pause=0)
+        await api.close()
+
+        phases = profiler.report()['phases']
+        self.assertEqual([phases[phase]['count'] for phase in ('time_to_headers', 'download', 'decode')], [6, 6, 6])
+        self.assertEqual(phases['date_parsing']['count'], 1)
+
+    async def test_error_response(self):
+        api = AsyncNewsCatcherApiClient('wrong', base_url=self.api.base_url)
+        with self.assertRaises(NewsCatcherApiException):
+            await api.get_search(q='Elon Musk')
+        await api.close()
+
+    async def test_retry(self):
+        with self.assertRaises(NewsCatcherApiException):
+            await self.api.get_search(q='flaky')
+
+        api = AsyncNewsCatcherApiClient('key', base_url=self.api.base_url, retry_policy=RetryPolicy(backoff_factor=0))
+        result = await api.get_search(q='flaky')
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual(api.retry_policy.nb_retries, 1)
+        await api.close()
+
+    async def test_compact_articles(self):
+        api = AsyncNewsCatcherApiClient('key', base_url=self.api.base_url, compact_articles=True)
+        result = await api.get_search(q='Elon Musk')
+        self.assertIsInstance(result['articles'][0], Article)
+        self.assertEqual(result['articles'][0]['title'], 'Elon Musk')
+        await api.close()
+
+    async def test_poll_latest_headlines(self):
+        watermark = HeadlinesWatermark()
+        articles = [article async for article in self.api.poll_latest_headlines(watermark, when='1h',
+                                                                                seconds_pause=0)]
+        self.assertEqual([article['_id'] for article in articles], ['3', '2', '1'])
+
+        self.calls.clear()
+        self.assertEqual([article async for article in self.api.poll_latest_headlines(watermark, when='1h',
+                                                                                      seconds_pause=0)], [])
+        self.assertEqual([call['page'] for call in self.calls], ['1', '3'])
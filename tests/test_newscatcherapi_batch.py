@@ -0,0 +1,40 @@
+import unittest
+
+from newscatcherapi import NewsCatcherApiClient
+from tests.fakes import FakeSession
+
+
+class NewsCatcherApiBatchTest(unittest.TestCase):
+    def test_round_robin(self):
+        session = FakeSession(pages_per_query={'big': 4, 'small': 1, 'medium': 2})
+        api = NewsCatcherApiClient('key', session=session)
+        queries = {'a': {'q': 'big'}, 'b': {'q': 'small'}, 'c': {'q': 'medium', 'lang': 'en'}}
+        pages = [(query_id, result['page']) for query_id, result in api.iter_search_batch(queries, seconds_pause=0)]
+
+        self.assertEqual(pages, [('a', 1), ('b', 1), ('c', 1), ('a', 2), ('c', 2), ('a', 3), ('a', 4)])
+        self.assertEqual([(params['q'], params['page']) for _, params in session.calls],
+                         [('big', '1'), ('small', '1'), ('medium', '1'), ('big', '2'), ('medium', '2'),
+                          ('big', '3'), ('big', '4')])
+        self.assertEqual(session.calls[2][1]['lang'], 'en')
+
+    def test_concurrent_pairs_and_max_page(self):
+        session = FakeSession(total_pages=5, delays={1: 0.05}, failing_pages=[2])
+        api = NewsCatcherApiClient('key', session=session)
+        queries = [('x', {'q': 'Tesla'}), ('y', {'q': 'SpaceX'})]
+        pages = [(query_id, result['user_input']['q'], result['page'])
+                 for query_id, result in api.iter_search_batch(queries, max_page=3, seconds_pause=0, max_workers=4)]
+
+        self.assertEqual(pages, [('x', 'Tesla', 1), ('y', 'SpaceX', 1), ('x', 'Tesla', 3), ('y', 'SpaceX', 3)])
+
+    def test_validation(self):
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        with self.assertRaises(ValueError):
+            api.iter_search_batch({})
+        with self.assertRaises(ValueError):
+            api.iter_search_batch([('a', {'q': 'Tesla'}), ('a', {'q': 'SpaceX'})])
+        with self.assertRaises(ValueError):
+            api.iter_search_batch({'a': {'q': 'Tesla', 'page': 2}})
+        with self.assertRaises(TypeError):
+            api.iter_search_batch({'a': {'q': 0}})
+        with self.assertRaises(TypeError):
+            api.iter_search_batch({'a': 'Tesla'})
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from newscatcherapi import NewsCatcherApiClient, ResponseCache, SearchWindowCache, const, utils
+from tests.fakes import FakeSession
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_repeated_calls_are_served_from_cache(self):
+        session = FakeSession()
+        cache = ResponseCache(ttl=60)
+        api = NewsCatcherApiClient('key', session=session, cache=cache)
+
+        first = api.get_latest_headlines(lang='en', topic='business')
+        first['articles'].clear()
+        second = api.get_latest_headlines(lang='EN ', topic='business')
+
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(len(second['articles']), 2)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        api.get_latest_headlines(lang='en', topic='sport')
+        self.assertEqual(len(session.calls), 2)
+
+    def test_ttl_per_endpoint(self):
+        session = FakeSession()
+        cache = ResponseCache(ttl=0.05, endpoint_ttls={const.SEARCH_URL: 0})
+        api = NewsCatcherApiClient('key', session=session, cache=cache)
+
+        api.get_search(q='Elon Musk')
+        api.get_search(q='Elon Musk')
+        self.assertEqual(len(session.calls), 2)
+
+        api.get_sources(lang='en')
+        api.get_sources(lang='en')
+        self.assertEqual(len(session.calls), 3)
+        time.sleep(0.06)
+        api.get_sources(lang='en')
+        self.assertEqual(len(session.calls), 4)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        cache.set(('a', ()), b'1234')
+        cache.set(('b', ()), b'1234')
+        cache.get(('a', ()))
+        cache.set(('c', ()), b'1234')
+
+        self.assertIsNone(cache.get(('b', ())))
+        self.assertEqual(cache.get(('a', ())), b'1234')
+        self.assertEqual(cache.evictions, 1)
+
+        # over max_bytes: the least recently used entry goes first
+        cache.set(('d', ()), b'123456')
+        self.assertIsNone(cache.get(('c', ())))
+        self.assertEqual(cache.nb_bytes, 10)
+
+
+class SearchWindowCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'search.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_backfill_rerun_uses_disk(self):
+        with SearchWindowCache(self.path) as disk_cache:
+            session = FakeSession(page_size=5, hits_per_hour=1)
+            api = NewsCatcherApiClient('key', session=session, disk_cache=disk_cache)
+            first = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/02', by='day',
+                                                page_size=5, seconds_pause=0)
+            calls = len(session.calls)
+
+        with SearchWindowCache(self.path) as disk_cache:
+            session = FakeSession(page_size=5, hits_per_hour=1)
+            api = NewsCatcherApiClient('key', session=session, disk_cache=disk_cache)
+            second = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/02', by='day',
+                                                 page_size=5, seconds_pause=0)
+
+            self.assertEqual(len(session.calls), 0)
+            self.assertEqual(disk_cache.stats()['hits'], calls)
+            self.assertEqual(first['articles'], second['articles'])
+
+    def test_recent_window_expires(self):
+        disk_cache = SearchWindowCache(self.path, tail_ttl=0.05)
+        recent_to = datetime.utcnow().strftime('%m/%d/%Y %H:%M:%S')
+        recent = utils.make_request_key(const.SEARCH_URL, {'q': 'a', 'from': '01/01/2021 00:00:00', 'to': recent_to})
+        old = utils.make_request_key(const.SEARCH_URL, {'q': 'a', 'from': '2021/01/01', 'to': '2021/01/02'})
+        headlines = utils.make_request_key(const.LATEST_HEADLINES_URL, {'lang': 'en'})
+
+        for key in (recent, old, headlines):
+            disk_cache.set(key, b'{}')
+        self.assertEqual(disk_cache.get(recent), b'{}')
+        self.assertIsNone(disk_cache.get(headlines))
+
+        time.sleep(0.06)
+        self.assertIsNone(disk_cache.get(recent))
+        self.assertEqual(disk_cache.get(old), b'{}')
+        disk_cache.purge()
+        self.assertEqual(disk_cache.stats()['entries'], 1)
+        disk_cache.close()
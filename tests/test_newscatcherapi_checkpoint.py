@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from newscatcherapi import NewsCatcherApiClient
+from tests.fakes import FakeSession
+
+
+class SearchCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'backfill.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_articles(self, session, **kwargs):
+        api = NewsCatcherApiClient('key', session=session)
+        return api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                           seconds_pause=0, checkpoint=self.path, **kwargs)
+
+    def read_journal(self):
+        with open(self.path) as journal:
+            return [json.loads(line) for line in journal]
+
+    def test_resume_only_fetches_missing_pages(self):
+        self.get_articles(FakeSession(failing_pages=[2]))
+        journal = self.read_journal()
+        self.assertEqual(len([entry for entry in journal if 'page' in entry]), 4)
+
+        session = FakeSession()
+        result = self.get_articles(session, resume=True)
+        self.assertEqual([params['page'] for _, params in session.calls], ['2', '2'])
+        self.assertEqual(len(result['articles']), 12)
+        self.assertEqual(len(self.read_journal()), 1 + 6)
+
+        session = FakeSession()
+        resumed = self.get_articles(session, resume=True)
+        self.assertEqual(session.calls, [])
+        self.assertEqual(resumed['articles'], result['articles'])
+
+    def test_without_resume_the_journal_is_reset(self):
+        self.get_articles(FakeSession())
+
+        session = FakeSession()
+        self.get_articles(session)
+        self.assertEqual(len(session.calls), 6)
+        self.assertEqual(len(self.read_journal()), 1 + 6)
+
+    def test_without_resume_the_pages_are_removed(self):
+        self.get_articles(FakeSession())
+        stale_page = os.path.join(self.path + '.pages', 'stale.json')
+        with open(stale_page, 'w') as page_file:
+            page_file.write('{}')
+
+        self.get_articles(FakeSession(), sort_by='date')
+        self.assertFalse(os.path.exists(stale_page))
+        self.assertEqual(len(os.listdir(self.path + '.pages')), 6)
+
+    def test_resume_another_search(self):
+        self.get_articles(FakeSession())
+        with self.assertRaises(ValueError):
+            self.get_articles(FakeSession(), resume=True, sort_by='date')
+
+    def test_resume_adaptive_run_replays_probes(self):
+        first = self.get_articles(FakeSession(hits_per_hour=2, page_size=10), adaptive=True, max_page=2)
+
+        session = FakeSession(hits_per_hour=2, page_size=10)
+        result = self.get_articles(session, resume=True, adaptive=True, max_page=2)
+        self.assertEqual(session.calls, [])
+        self.assertEqual(result['articles'], first['articles'])
+
+    def test_iter_search_articles(self):
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        articles = list(api.iter_search_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                                 page_size=2, seconds_pause=0, checkpoint=self.path, limit=5))
+        self.assertEqual(len(articles), 5)
+
+        session = FakeSession()
+        api = NewsCatcherApiClient('key', session=session)
+        articles = list(api.iter_search_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                                 page_size=2, seconds_pause=0, checkpoint=self.path, resume=True))
+        self.assertEqual(len(articles), 12)
+        self.assertEqual(len(session.calls), 3)
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from newscatcherapi import Article, ArticleSink, ColumnarArticles, NewsCatcherApiClient, ParquetSink
+from tests.fakes import FakeSession
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+ARTICLES = [
+    {'_id': 'a', 'published_date': '2021-01-01 10:20:30', 'rank': 12, '_score': '1.5', 'is_opinion': False,
+     'authors': 'Jane Doe', 'title': 'Tesla'},
+    Article({'_id': 'b', 'published_date': None, 'rank': 'unranked', 'authors': ['A', 'B'], 'summary': 'Text'}),
+]
+
+
+class RecordingSink(ArticleSink):
+    def __init__(self):
+        self.windows = [[]]
+
+    def write_articles(self, articles):
+        self.windows[-1].extend(articles)
+
+    def end_window(self):
+        self.windows.append([])
+
+
+class ColumnarArticlesTest(unittest.TestCase):
+    def test_typed_columns(self):
+        columns = ColumnarArticles(['_id', 'published_date', 'rank', '_score', 'is_opinion', 'authors', 'summary'])
+        columns.append_articles(ARTICLES)
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(columns.to_pydict(), {
+            '_id': ['a', 'b'],
+            'published_date': [datetime(2021, 1, 1, 10, 20, 30), None],
+            'rank': [12, None],
+            '_score': [1.5, None],
+            'is_opinion': [False, None],
+            'authors': [['Jane Doe'], ['A', 'B']],
+            'summary': [None, 'Text'],
+        })
+
+        # a malformed date is stored as null instead of failing the whole write
+        columns.append_articles([{'_id': 'c', 'published_date': 1609459200}, {'_id': 'd', 'published_date': {}},
+                                 {'_id': 'e', 'published_date': ['2021-01-01']}])
+        self.assertEqual(columns.to_pydict()['published_date'][2:], [None, None, None])
+
+        columns.clear()
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(columns.to_pydict()['rank'], [])
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_record_batch(self):
+        columns = ColumnarArticles(['_id', 'published_date', 'rank'])
+        columns.append_articles(ARTICLES)
+        batch = columns.to_record_batch()
+        self.assertEqual(batch.schema.field('published_date').type, pyarrow.timestamp('s', tz='UTC'))
+        self.assertEqual(batch.schema.field('rank').type, pyarrow.int64())
+        self.assertEqual(batch.num_rows, 2)
+
+
+class SinkTest(unittest.TestCase):
+    def test_get_search_all_articles_with_sink(self):
+        sink = RecordingSink()
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        result = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                             seconds_pause=0, max_workers=2, sink=sink)
+
+        self.assertNotIn('articles', result)
+        self.assertEqual(result['nb_articles_written'], 12)
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual(result['total_hits'], 12)
+        self.assertEqual([len(window) for window in sink.windows], [6, 6, 0])
+        self.assertTrue(sink.windows[0][0]['_id'].startswith('01/01/2021'))
+
+        with self.assertRaises(TypeError):
+            api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day', sink=[])
+
+    @unittest.skipIf(pyarrow, 'pyarrow is installed')
+    def test_parquet_sink_requires_pyarrow(self):
+        with self.assertRaises(ImportError):
+            ParquetSink('articles.parquet')
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_parquet_sink(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'articles.parquet')
+
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        with ParquetSink(path, columns=['_id', 'title', 'published_date', 'rank']) as sink:
+            api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                        seconds_pause=0, sink=sink)
+
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        self.assertEqual(parquet_file.metadata.num_rows, 12)
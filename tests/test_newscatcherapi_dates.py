@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+from datetime import datetime
+
+from dateparser import parse as dateparser_parse
+
+from newscatcherapi import const, utils
+
+# wall time allowed for `import newscatcherapi` in a fresh interpreter, in seconds: about twice the time it takes
+# now, most of it importing requests, and below the 0.2s it took while dateparser was imported with the package
+IMPORT_TIME_BUDGET = 0.15
+
+# slow modules only imported by the code paths using them
+LAZY_MODULES = ('dateparser', 'asyncio', 'sqlite3')
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_fast_path_matches_dateparser(self):
+        for value in ['2021/01/01', '2021-01-01', '2021/01/01 10:20:30', '2021-01-01T10:20:30', '2021-01-01 10:20',
+                      '2021-01-01T10:20:30.123456', '01/02/2021 10:00:00', '2021-01-01T10:20:30Z']:
+            expected = dateparser_parse(value, settings={'TIMEZONE': 'UTC'}).replace(tzinfo=None)
+            self.assertEqual(utils._parse_date_fast(value), expected, value)
+            self.assertEqual(utils.parse_date(value), expected, value)
+
+    def test_utc_offset(self):
+        self.assertEqual(utils.parse_date('2021-01-01T01:20:30+02:00'), datetime(2020, 12, 31, 23, 20, 30))
+        self.assertEqual(utils.parse_date('2021-01-01T01:20:30-0130'), datetime(2021, 1, 1, 2, 50, 30))
+
+    def test_fallback_to_dateparser(self):
+        self.assertIsNone(utils._parse_date_fast('2021/13/01'))
+        self.assertEqual(utils.parse_date('2021/13/01'), datetime(2021, 1, 13))
+        self.assertEqual(utils.parse_date('January 5, 2021'), datetime(2021, 1, 5))
+        self.assertIsNone(utils.parse_date('not a date'))
+
+    def test_not_a_str(self):
+        for value in [1609459200, {'date': '2021-01-01'}, None]:
+            with self.assertRaises(TypeError):
+                utils.parse_date(value)
+
+    def test_format_window_date(self):
+        value = datetime(2021, 3, 4, 5, 6, 7)
+        self.assertEqual(utils.format_window_date(value), value.strftime(const.WINDOW_DATE_FORMAT))
+        self.assertEqual(utils.parse_date(utils.format_window_date(value)), value)
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_import_budget(self):
+        code = ("import sys, time; start = time.perf_counter(); import newscatcherapi; "
+                f"print(time.perf_counter() - start, *[module in sys.modules for module in {LAZY_MODULES!r}])")
+        import_times = []
+        for _ in range(3):
+            output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                                    universal_newlines=True).stdout.split()
+            import_times.append(float(output[0]))
+            self.assertEqual(dict(zip(LAZY_MODULES, output[1:])), {module: 'False' for module in LAZY_MODULES})
+        self.assertLess(min(import_times), IMPORT_TIME_BUDGET)
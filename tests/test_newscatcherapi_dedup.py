@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from newscatcherapi import ArticleIdSet, BloomFilter, NewsCatcherApiClient
+from newscatcherapi.newscatcherapi_dedup import get_deduplicator
+from tests.fakes import FakeSession
+
+
+class ArticleIdSetTest(unittest.TestCase):
+    def test_filter(self):
+        dedup = ArticleIdSet()
+        self.assertTrue(dedup.add('a'))
+        self.assertFalse(dedup.add('a'))
+        self.assertIn('a', dedup)
+
+        articles = dedup.filter([{'_id': 'a'}, {'_id': 'b'}, {'_id': 'b'}, {'title': 'no id'}])
+        self.assertEqual(articles, [{'_id': 'b'}, {'title': 'no id'}])
+        self.assertEqual(dedup.nb_duplicates, 2)
+        self.assertEqual(len(dedup), 2)
+
+    def test_filter_new_from_threads(self):
+        for dedup in (ArticleIdSet(), BloomFilter(capacity=10000)):
+            self.assertEqual(dedup.filter_new(['a', 'b', 'a']), ['a', 'b'])
+            self.assertEqual(dedup.nb_duplicates, 1)
+
+            # each id is new for exactly one of the threads
+            ids = [str(i) for i in range(1000)]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                new_ids = [article_id for batch in executor.map(dedup.filter_new, [ids] * 4) for article_id in batch]
+            self.assertEqual(sorted(new_ids), sorted(ids))
+            self.assertEqual(dedup.nb_duplicates, 1 + 3 * 1000)
+
+    def test_get_deduplicator(self):
+        self.assertIsNone(get_deduplicator(False))
+        self.assertIsInstance(get_deduplicator(True), ArticleIdSet)
+        bloom_filter = BloomFilter(capacity=10)
+        self.assertIs(get_deduplicator(bloom_filter), bloom_filter)
+        with self.assertRaises(TypeError):
+            get_deduplicator(set())
+
+
+class BloomFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_error_rate(self):
+        bloom_filter = BloomFilter(capacity=10000, error_rate=0.001)
+        self.assertLess(sum(not bloom_filter.add(f'seen-{i}') for i in range(10000)), 50)
+        self.assertTrue(all(f'seen-{i}' in bloom_filter for i in range(10000)))
+
+        false_positives = sum(f'new-{i}' in bloom_filter for i in range(10000))
+        self.assertLess(false_positives, 50)
+        self.assertLess(len(bloom_filter._bits), 10000 * 2)
+
+    def test_save_load_and_update(self):
+        path = os.path.join(self.directory, 'seen.bloom')
+        worker_1 = BloomFilter(capacity=1000)
+        worker_1.add('a')
+        worker_1.save(path)
+
+        worker_2 = BloomFilter.load(path)
+        self.assertIn('a', worker_2)
+        worker_2.add('b')
+
+        merged_bits = bytearray(a | b for a, b in zip(worker_1._bits, worker_2._bits))
+        worker_1.update(worker_2)
+        self.assertIn('b', worker_1)
+        self.assertEqual(worker_1._bits, merged_bits)
+
+        with self.assertRaises(ValueError):
+            worker_1.update(BloomFilter(capacity=10))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(error_rate=1)
+        with self.assertRaises(TypeError):
+            BloomFilter(capacity=1.5)
+
+
+class ClientDedupTest(unittest.TestCase):
+    def test_get_search_all_pages(self):
+        api = NewsCatcherApiClient('key', session=FakeSession(drift=1))
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0, max_workers=3, dedup=True)
+        self.assertEqual([article['_id'] for article in result['articles']], ['0', '1', '2', '3'])
+
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+        self.assertEqual(len(result['articles']), 6)
+
+    def test_dedup_shared_between_calls(self):
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        dedup = ArticleIdSet()
+        first = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                            seconds_pause=0, max_workers=2, dedup=dedup)
+        second = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                             seconds_pause=0, dedup=dedup)
+        self.assertEqual(len(first['articles']), 12)
+        self.assertEqual(second['articles'], [])
+        self.assertEqual(dedup.nb_duplicates, 12)
+
+    def test_iter_search_pages(self):
+        api = NewsCatcherApiClient('key', session=FakeSession(drift=1))
+        pages = list(api.iter_search_pages(q='Elon Musk', page_size=2, seconds_pause=0, dedup=BloomFilter(100)))
+        self.assertEqual([[article['_id'] for article in result['articles']] for result in pages],
+                         [['0', '1'], ['2'], ['3']])
@@ -0,0 +1,139 @@
+import contextlib
+import io
+import unittest
+
+from newscatcherapi import ClientHooks, JsonLinesSink, MetricsCollector, NewsCatcherApiClient, Profiler, RetryPolicy
+from newscatcherapi.newscatcherapi_hooks import LatencyHistogram
+from tests.fakes import FakeSession
+
+
+class RecordingHooks(ClientHooks):
+    def __init__(self):
+        self.events = []
+        self.latencies = []
+
+    def on_request_start(self, endpoint, attempt):
+        self.events.append(('request_start', endpoint, attempt))
+
+    def on_response(self, endpoint, status, latency, nb_bytes, nb_articles, attempt):
+        self.latencies.append(latency)
+        self.events.append(('response', endpoint, status, nb_articles, attempt))
+
+    def on_retry(self, endpoint, attempt, delay, status=None, error=None):
+        self.events.append(('retry', endpoint, attempt, status))
+
+    def on_page(self, page, nb_pages, nb_articles):
+        self.events.append(('page', page, nb_pages, nb_articles))
+
+    def on_window(self, window_from, window_to, total_hits):
+        self.events.append(('window', window_from, window_to, total_hits))
+
+
+class ClientHooksTest(unittest.TestCase):
+    def test_events_of_all_pages(self):
+        hooks = RecordingHooks()
+        api = NewsCatcherApiClient('key', session=FakeSession(total_pages=2, transient_errors={2: [503]}),
+                                   retry_policy=RetryPolicy(backoff_factor=0, jitter=False), hooks=hooks)
+        api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+
+        self.assertEqual(hooks.events, [
+            ('request_start', '/v2/search', 1),
+            ('response', '/v2/search', 200, 2, 1),
+            ('page', 1, 2, 2),
+            ('request_start', '/v2/search', 1),
+            ('response', '/v2/search', 503, None, 1),
+            ('retry', '/v2/search', 1, 503),
+            ('request_start', '/v2/search', 2),
+            ('response', '/v2/search', 200, 2, 2),
+            ('page', 2, 2, 2),
+        ])
+        self.assertTrue(all(latency >= 0 for latency in hooks.latencies))
+
+    def test_windows_and_several_hooks(self):
+        hooks = RecordingHooks()
+        metrics = MetricsCollector()
+        api = NewsCatcherApiClient('key', session=FakeSession(total_pages=1), hooks=[hooks, metrics])
+        api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day', seconds_pause=0)
+
+        windows = [event for event in hooks.events if event[0] == 'window']
+        self.assertEqual(windows, [('window', '01/01/2021 00:00:00', '01/01/2021 23:59:59', None),
+                                   ('window', '01/02/2021 00:00:00', '01/03/2021 00:00:00', None)])
+        self.assertEqual(metrics.snapshot()['windows'], 2)
+
+        with self.assertRaises(TypeError):
+            NewsCatcherApiClient('key', hooks=[metrics, print])
+
+    def test_progress_is_logged_not_printed(self):
+        api = NewsCatcherApiClient('key', session=FakeSession(total_pages=2, failing_pages=[2]))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertLogs('newscatcherapi', level='DEBUG') as logs:
+            api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+
+        self.assertEqual(output.getvalue(), '')
+        self.assertIn('2/2 page is going to be extracted', '\n'.join(logs.output))
+        self.assertTrue(any(line.startswith('WARNING') and 'due to an error' in line for line in logs.output))
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def test_snapshot(self):
+        metrics = MetricsCollector()
+        api = NewsCatcherApiClient('key', session=FakeSession(total_pages=3, failing_pages=[3]), hooks=metrics)
+        api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual({key: snapshot[key] for key in ('requests', 'errors', 'retries', 'articles', 'pages')},
+                         {'requests': 3, 'errors': 1, 'retries': 0, 'articles': 4, 'pages': 2})
+        self.assertEqual(snapshot['statuses'], {200: 2, 400: 1})
+        self.assertEqual(snapshot['latency']['/v2/search']['count'], 3)
+        self.assertGreater(snapshot['bytes'], 0)
+        self.assertGreater(snapshot['requests_per_second'], 0)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()['requests'], 0)
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(99))
+        for i in range(1, 1001):
+            histogram.record(i / 1000.0)
+
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 1000)
+        self.assertAlmostEqual(summary['mean'], 0.5005)
+        self.assertAlmostEqual(summary['p50'], 0.5, delta=0.05)
+        self.assertAlmostEqual(summary['p99'], 0.99, delta=0.1)
+        self.assertEqual(summary['max'], 1.0)
+        self.assertLessEqual(summary['p99'], summary['max'])
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_report(self):
+        profiler = Profiler()
+        session = FakeSession(total_pages=2, delays={1: 0.05, 2: 0.05})
+        api = NewsCatcherApiClient('key', session=session, hooks=profiler)
+        api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day', seconds_pause=0.1,
+                                    sink=JsonLinesSink(io.BytesIO()))
+
+        report = profiler.report()
+        phases = report['phases']
+        self.assertEqual(report['requests'], 4)
+        self.assertEqual(phases['time_to_headers']['count'], 4)
+        self.assertGreaterEqual(phases['time_to_headers']['seconds'], 0.2)
+        self.assertEqual(phases['decode']['count'], 4)
+        # the first call is sent right away, the 3 others wait for the pacing
+        self.assertEqual(phases['rate_limit_wait']['count'], 4)
+        self.assertGreater(phases['rate_limit_wait']['seconds'], 0.1)
+        self.assertEqual(phases['date_parsing']['count'], 1)
+        self.assertEqual(phases['validation']['count'], 5)
+        self.assertEqual(phases['sink_write']['count'], 6)
+        self.assertEqual(phases['retry_backoff']['count'], 0)
+        self.assertLessEqual(sum(phase['share'] for phase in phases.values()), 1.0)
+        self.assertGreaterEqual(report['unaccounted'], 0)
+
+        text = profiler.format_report()
+        self.assertTrue(text.startswith('4 requests in '))
+        self.assertIn('time_to_headers', text)
+        self.assertNotIn('retry_backoff', text)
+
+        profiler.start()
+        self.assertEqual(profiler.report()['requests'], 0)
@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from newscatcherapi import JsonDecoder, NewsCatcherApiClient, ResponseCache
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from newscatcherapi.newscatcherapi_json import get_default_loads
+from tests.fakes import FakeResponse, FakeSession
+
+
+class HtmlErrorSession(FakeSession):
+    def get(self, url, headers=None, timeout=None, params=None, proxies=None):
+        response = FakeResponse(502, {})
+        response.content = b'<html><body>502 Bad Gateway</body></html>'
+        return response
+
+
+class JsonDecoderTest(unittest.TestCase):
+    def test_default_loads(self):
+        try:
+            import orjson
+        except ImportError:
+            self.assertIs(get_default_loads(), json.loads)
+        else:
+            self.assertIs(get_default_loads(), orjson.loads)
+
+        with self.assertRaises(TypeError):
+            JsonDecoder(loads='orjson')
+
+    def test_decode_error(self):
+        decoder = JsonDecoder(json.loads)
+        error = {'status': 'error', 'error_code': 'HTTP_400', 'message': 'bad page'}
+        self.assertEqual(decoder.decode_error(400, json.dumps(error).encode()), error)
+        self.assertEqual(decoder.decode_error(502, b' <html>502</html>'),
+                         {'status': 'error', 'error_code': 'HTTP_502', 'message': '<html>502</html>'})
+
+    def test_each_body_is_decoded_once(self):
+        bodies = []
+
+        def loads(content):
+            bodies.append(content)
+            return json.loads(content)
+
+        api = NewsCatcherApiClient('key', session=FakeSession(), json_decoder=loads, cache=ResponseCache())
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+        api.get_search(q='Elon Musk', page=1)
+
+        self.assertEqual(len(result['articles']), 6)
+        self.assertEqual(len(bodies), 4)
+        stats = api.json_decoder.stats()
+        self.assertEqual(stats['bodies'], 4)
+        self.assertEqual(stats['bytes'], sum(len(body) for body in bodies))
+        self.assertGreater(stats['seconds'], 0)
+
+    def test_html_error_body(self):
+        api = NewsCatcherApiClient('key', session=HtmlErrorSession())
+        with self.assertRaises(NewsCatcherApiException) as context:
+            api.get_search(q='Elon Musk')
+        self.assertEqual(context.exception.get_code(), 'HTTP_502')
+        self.assertIn('Bad Gateway', context.exception.get_message())
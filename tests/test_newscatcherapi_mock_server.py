@@ -0,0 +1,68 @@
+import importlib.util
+import os
+import unittest
+
+from newscatcherapi import NewsCatcherApiClient, RetryPolicy
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from tests.mock_server import MockNewsCatcherServer
+
+BENCHMARKS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks',
+                               'bench_client.py')
+
+
+class MockServerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockNewsCatcherServer(total_hits=250, summary_size=100, api_key='key').start()
+        self.addCleanup(self.server.stop)
+        self.client = NewsCatcherApiClient('key', base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+
+    def test_pagination(self):
+        result = self.client.get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0)
+        self.assertEqual(len(result['articles']), 250)
+        self.assertEqual(len({article['_id'] for article in result['articles']}), 250)
+        self.assertEqual(self.server.nb_requests, 3)
+
+        result = self.client.get_latest_headlines(page=3, page_size=100)
+        self.assertEqual((result['page'], result['total_pages'], len(result['articles'])), (3, 3, 50))
+        self.assertEqual(self.client.get_search(q='bitcoin'), self.client.get_search(q='bitcoin'))
+        self.assertIn('sources', self.client.get_sources(lang='en'))
+
+    def test_search_windows(self):
+        self.server.hits_per_day = 48
+        result = self.client.get_search_all_articles(q='bitcoin', from_='2021/01/01', to_='2021/01/04', by='day',
+                                                     seconds_pause=0)
+        self.assertEqual(len(result['articles']), 3 * 48)
+        self.assertEqual(self.server.nb_requests, 3)
+
+    def test_errors(self):
+        with self.assertRaises(NewsCatcherApiException):
+            NewsCatcherApiClient('wrong key', base_url=self.server.base_url).get_search(q='bitcoin')
+
+        self.server.rate_limit_every = 2
+        client = NewsCatcherApiClient('key', base_url=self.server.base_url,
+                                      retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+        result = client.get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0)
+        self.assertEqual(len(result['articles']), 250)
+        self.assertEqual(self.server.nb_requests, 1 + 3 * 2)
+
+
+class BenchmarksTest(unittest.TestCase):
+    def test_run_benchmarks(self):
+        spec = importlib.util.spec_from_file_location('bench_client', BENCHMARKS_PATH)
+        bench_client = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench_client)
+
+        results = bench_client.run_benchmarks(nb_pages=2, page_size=10, nb_days=2, hits_per_day=10, repeat=1,
+                                              in_process=True)
+        self.assertEqual(results['get_search_all_pages']['articles'], 20)
+        self.assertEqual(results['get_search_all_articles']['pages'], 2)
+        for name in ('get_search_all_pages', 'get_latest_headlines_all_pages', 'get_search_all_articles'):
+            self.assertGreater(results[name]['pages_per_second'], 0)
+            self.assertGreater(results[name]['peak_memory_mb'], 0)
+        self.assertGreater(results['import']['seconds'], 0)
+        self.assertIn('get_search_all_articles', bench_client.format_results(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import time
+import unittest
+
+from newscatcherapi import NewsCatcherApiClient
+from tests.fakes import FakeSession
+
+
+class NewsCatcherApiPaginationTest(unittest.TestCase):
+    def test_all_pages_sequential(self):
+        session = FakeSession(total_pages=3)
+        api = NewsCatcherApiClient('key', session=session)
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0)
+
+        self.assertEqual(len(result['articles']), 6)
+        self.assertEqual([params['page'] for _, params in session.calls], ['1', '2', '3'])
+
+    def test_all_pages_concurrent_keeps_page_order(self):
+        # later pages answer first
+        session = FakeSession(total_pages=6, delays={2: 0.2, 3: 0.1})
+        api = NewsCatcherApiClient('key', session=session)
+
+        started = time.monotonic()
+        result = api.get_latest_headlines_all_pages(lang='en', seconds_pause=0, max_workers=5)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual([article['_id'] for article in result['articles']],
+                         [f'{page}-{i}' for page in range(1, 7) for i in range(2)])
+        self.assertLess(elapsed, 0.3)
+
+    def test_all_pages_concurrent_skips_failed_page(self):
+        session = FakeSession(total_pages=4, failing_pages=[3])
+        api = NewsCatcherApiClient('key', session=session)
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0, max_workers=2, max_page=4)
+
+        self.assertEqual(len(result['articles']), 6)
+
+    def test_max_workers_validation(self):
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        with self.assertRaises(ValueError):
+            api.get_search_all_pages(q='Elon Musk', max_workers=0)
+        with self.assertRaises(TypeError):
+            api.get_search_all_pages(q='Elon Musk', max_workers='2')
+
+
+class NewsCatcherApiSessionTest(unittest.TestCase):
+    def test_owned_session_is_pooled_and_closed(self):
+        with NewsCatcherApiClient('key', pool_connections=2, pool_maxsize=20, timeout=5) as api:
+            adapter = api.request_method.get_adapter('https://api.newscatcherapi.com')
+            self.assertEqual(adapter._pool_maxsize, 20)
+            self.assertEqual(api.timeout, 5)
+        self.assertEqual(len(adapter.poolmanager.pools), 0)
+
+    def test_provided_session_is_not_closed(self):
+        session = FakeSession()
+        session.close = lambda: self.fail('provided session must not be closed')
+        with NewsCatcherApiClient('key', session=session) as api:
+            api.get_search(q='Elon Musk')
+        self.assertEqual(session.calls[0][1]['q'], 'Elon Musk')
+
+    def test_pool_size_validation(self):
+        with self.assertRaises(ValueError):
+            NewsCatcherApiClient('key', pool_maxsize=0)
+
+
+class NewsCatcherApiGeneratorTest(unittest.TestCase):
+    def test_iter_search_pages_limit_stops_requests(self):
+        session = FakeSession(total_pages=5, page_size=10)
+        api = NewsCatcherApiClient('key', session=session)
+        pages = list(api.iter_search_pages(q='Elon Musk', page_size=10, seconds_pause=0, max_workers=3, limit=25))
+
+        self.assertEqual([len(result['articles']) for result in pages], [10, 10, 5])
+        self.assertEqual(len(session.calls), 3)
+
+    def test_iter_search_pages_limit_counts_yielded_articles(self):
+        # the failed pages and the duplicated articles are made up for with the following pages
+        session = FakeSession(total_pages=6, page_size=10, failing_pages=[2, 4])
+        api = NewsCatcherApiClient('key', session=session)
+        articles = list(api.iter_search_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/02', by='day',
+                                                 page_size=10, seconds_pause=0, limit=25))
+        self.assertEqual(len(articles), 25)
+        self.assertEqual([params['page'] for _, params in session.calls], ['1', '2', '3', '4', '5'])
+
+        for max_workers in (None, 3):
+            session = FakeSession(total_pages=6, page_size=10, drift=5)
+            api = NewsCatcherApiClient('key', session=session)
+            pages = list(api.iter_search_pages(q='Elon Musk', page_size=10, seconds_pause=0, max_workers=max_workers,
+                                               limit=25, dedup=True))
+            self.assertEqual([len(result['articles']) for result in pages], [10, 5, 5, 5])
+            self.assertEqual(len(session.calls), 4)
+
+        # the results run out first
+        session = FakeSession(total_pages=3, page_size=10, failing_pages=[3])
+        api = NewsCatcherApiClient('key', session=session)
+        pages = list(api.iter_search_pages(q='Elon Musk', page_size=10, seconds_pause=0, limit=25))
+        self.assertEqual([len(result['articles']) for result in pages], [10, 10])
+        self.assertEqual(len(session.calls), 3)
+
+    def test_iter_latest_headlines_pages_is_lazy(self):
+        session = FakeSession(total_pages=5)
+        api = NewsCatcherApiClient('key', session=session)
+        pages = api.iter_latest_headlines_pages(lang='en', seconds_pause=0)
+        self.assertEqual(len(session.calls), 0)
+
+        next(pages)
+        self.assertEqual(len(session.calls), 1)
+
+    def test_iter_search_articles_across_windows(self):
+        session = FakeSession(total_pages=2, page_size=3)
+        api = NewsCatcherApiClient('key', session=session)
+        articles = list(api.iter_search_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/04', by='day',
+                                                 page_size=3, seconds_pause=0, limit=8))
+
+        self.assertEqual(len(articles), 8)
+        # both pages of the first window, then only the first page of the second one
+        self.assertEqual(len(session.calls), 3)
@@ -0,0 +1,78 @@
+import unittest
+from urllib.parse import parse_qsl
+
+from newscatcherapi import AsyncNewsCatcherApiClient, NewsCatcherApiClient, PreparedQuery, ResponseCache
+from newscatcherapi import utils
+from tests.fakes import FakeSession
+
+
+class PreparedQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession(total_pages=3)
+        self.api = NewsCatcherApiClient('key', session=self.session)
+
+    def test_query_string(self):
+        query = self.api.prepare_search(q='Elon Musk & "Tesla"', lang=['en', ' FR'], ranked_only=True, page_size=50)
+        self.assertEqual(dict(parse_qsl(query.query_string)),
+                         {'q': 'Elon Musk & "Tesla"', 'lang': 'en,fr', 'ranked_only': 'True', 'page_size': '50'})
+
+        page = query.window('01/01/2021 00:00:00', '01/01/2021 23:59:59').page(3)
+        self.assertEqual(dict(page.params), dict(query.params, page=3, **{'from': '01/01/2021 00:00:00',
+                                                                          'to': '01/01/2021 23:59:59'}))
+        self.assertEqual(dict(parse_qsl(page.query_string)), {key: str(value) for key, value in page.params.items()})
+        # the variants leave the original query unchanged
+        self.assertNotIn('page', query.params)
+
+        window = page.window('01/02/2021 00:00:00', '01/02/2021 23:59:59')
+        self.assertEqual(window.params['from'], '01/02/2021 00:00:00')
+        self.assertEqual(window.query_string.count('from='), 1)
+
+    def test_same_key_as_get_search(self):
+        payload = utils.build_search_payload(q='Tesla', lang='en', page=2)
+        self.assertEqual(self.api.prepare_search(q='Tesla', lang='en').page(2).key,
+                         utils.make_request_key('/v2/search', payload))
+        self.assertEqual(self.api.prepare_search(q='Tesla', page=2), self.api.prepare_search(q='Tesla').page(2))
+
+    def test_immutable(self):
+        query = self.api.prepare_latest_headlines(lang='en')
+        with self.assertRaises(AttributeError):
+            query.endpoint = '/v2/search'
+        with self.assertRaises(TypeError):
+            query.params['lang'] = 'fr'
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.api.prepare_search(q='Tesla', lang='aer')
+        with self.assertRaises(TypeError):
+            self.api.prepare_search(q='Tesla').page('2')
+        with self.assertRaises(ValueError):
+            self.api.prepare_search(q='Tesla').page(0)
+        with self.assertRaises(TypeError):
+            self.api.prepare_search(q='Tesla').window(None, '2021/01/02')
+        with self.assertRaises(ValueError):
+            self.api.prepare_latest_headlines(lang='en').window('2021/01/01', '2021/01/02')
+        with self.assertRaises(TypeError):
+            self.api.fetch({'q': 'Tesla'})
+
+    def test_fetch(self):
+        query = self.api.prepare_latest_headlines(lang='en', page_size=2)
+        result = self.api.fetch(query.page(2))
+
+        self.assertEqual(result['page'], 2)
+        url, params = self.session.calls[0]
+        self.assertTrue(url.endswith('/v2/latest_headlines'))
+        self.assertEqual(params, {'lang': 'en', 'page_size': '2', 'page': '2'})
+
+    def test_fetch_shares_the_cache_of_get_search(self):
+        api = NewsCatcherApiClient('key', session=self.session, cache=ResponseCache())
+        api.get_search(q='Tesla', page=2)
+        api.fetch(api.prepare_search(q='Tesla').page(2))
+        self.assertEqual(len(self.session.calls), 1)
+
+
+class AsyncPreparedQueryTest(unittest.TestCase):
+    def test_same_query_as_the_sync_client(self):
+        api = AsyncNewsCatcherApiClient('key')
+        query = api.prepare_search(q='Tesla', lang='en').page(2)
+        self.assertIsInstance(query, PreparedQuery)
+        self.assertEqual(query, NewsCatcherApiClient('key').prepare_search(q='Tesla', lang='en', page=2))
@@ -0,0 +1,53 @@
+import threading
+import time
+import unittest
+
+from newscatcherapi import NewsCatcherApiClient, RateLimiter
+from tests.fakes import FakeSession
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_burst_then_paced(self):
+        limiter = RateLimiter(20, burst=3)
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - started, 0.03)
+
+        for _ in range(4):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_shared_between_threads(self):
+        limiter = RateLimiter(50, burst=1)
+        started = time.monotonic()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+        with self.assertRaises(TypeError):
+            RateLimiter('1')
+        with self.assertRaises(ValueError):
+            RateLimiter(1, burst=0)
+        self.assertIsNone(RateLimiter.from_seconds_pause(0))
+
+    def test_client_rate_limiter_replaces_seconds_pause(self):
+        api = NewsCatcherApiClient('key', session=FakeSession(total_pages=5), rate_limiter=RateLimiter(1000, burst=5))
+        started = time.monotonic()
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=10)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(len(result['articles']), 10)
+
+    def test_seconds_pause_paces_dispatch(self):
+        # slow responses already cover the pause, so no extra sleep is added after them
+        session = FakeSession(total_pages=3, delays={1: 0.2, 2: 0.2, 3: 0.2})
+        api = NewsCatcherApiClient('key', session=session)
+        started = time.monotonic()
+        api.get_search_all_pages(q='Elon Musk', seconds_pause=0.2)
+        self.assertLess(time.monotonic() - started, 0.75)
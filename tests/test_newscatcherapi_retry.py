@@ -0,0 +1,83 @@
+import time
+import unittest
+from email.utils import formatdate
+
+import requests
+
+from newscatcherapi import NewsCatcherApiClient, RetryPolicy
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from newscatcherapi.newscatcherapi_retry import parse_retry_after
+from tests.fakes import FakeSession
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_backoff(self):
+        policy = RetryPolicy(max_retries=3, backoff_factor=1, max_backoff=3, jitter=False)
+        self.assertEqual([policy.next_delay(attempt) for attempt in range(1, 5)], [1, 2, 3, None])
+
+        policy = RetryPolicy(backoff_factor=1)
+        self.assertTrue(all(0 <= policy.next_delay(2) <= 2 for _ in range(20)))
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=10, jitter=False)
+        self.assertEqual(policy.next_delay(1, '5'), 5)
+        self.assertEqual(policy.next_delay(1, '120'), 10)
+        self.assertEqual(policy.next_delay(1, 'not a date'), 1)
+
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 60, usegmt=True)), 60, delta=2)
+        self.assertEqual(parse_retry_after(formatdate(time.time() - 60, usegmt=True)), 0)
+
+    def test_budget(self):
+        policy = RetryPolicy(max_retries=5, backoff_factor=0, retry_budget=2)
+        self.assertEqual(policy.next_delay(1), 0)
+        self.assertEqual(policy.next_delay(1), 0)
+        self.assertIsNone(policy.next_delay(1))
+        self.assertEqual(policy.nb_retries, 2)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
+        with self.assertRaises(TypeError):
+            RetryPolicy(max_retries='3')
+        with self.assertRaises(ValueError):
+            RetryPolicy(retry_budget=-1)
+        with self.assertRaises(TypeError):
+            RetryPolicy(retry_budget=1.5)
+        with self.assertRaises(TypeError):
+            RetryPolicy(backoff_factor='1')
+        with self.assertRaises(TypeError):
+            NewsCatcherApiClient('key', retry_policy=3)
+
+
+class ClientRetryTest(unittest.TestCase):
+    def test_transient_errors_are_retried(self):
+        session = FakeSession(transient_errors={1: [503, 429, requests.ConnectionError('reset')]})
+        api = NewsCatcherApiClient('key', session=session, retry_policy=RetryPolicy(backoff_factor=0))
+
+        result = api.get_search(q='Elon Musk')
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual(len(session.calls), 4)
+
+    def test_retries_exhausted(self):
+        session = FakeSession(transient_errors={1: [503, 503, 503]})
+        api = NewsCatcherApiClient('key', session=session, retry_policy=RetryPolicy(max_retries=2, backoff_factor=0))
+        with self.assertRaises(NewsCatcherApiException):
+            api.get_search(q='Elon Musk')
+        self.assertEqual(len(session.calls), 3)
+
+        session = FakeSession(transient_errors={1: [requests.Timeout()]})
+        with self.assertRaises(requests.Timeout):
+            NewsCatcherApiClient('key', session=session).get_search(q='Elon Musk')
+
+    def test_client_errors_are_not_retried(self):
+        session = FakeSession(failing_pages=[1])
+        api = NewsCatcherApiClient('key', session=session, retry_policy=RetryPolicy(backoff_factor=0))
+        with self.assertRaises(NewsCatcherApiException):
+            api.get_search(q='Elon Musk')
+        self.assertEqual(len(session.calls), 1)
+
+    def test_no_page_lost_in_all_pages(self):
+        session = FakeSession(transient_errors={2: [502], 3: [requests.ConnectionError()]})
+        api = NewsCatcherApiClient('key', session=session, retry_policy=RetryPolicy(backoff_factor=0))
+        result = api.get_search_all_pages(q='Elon Musk', seconds_pause=0, max_workers=2)
+        self.assertEqual(len(result['articles']), 6)
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import unittest
+
+from newscatcherapi import NewsCatcherApiClient
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from newscatcherapi.newscatcherapi_singleflight import AsyncSingleFlight, SingleFlight
+from tests.fakes import FakeSession
+
+
+def run_threads(func, nb_threads):
+    results = [None] * nb_threads
+    barrier = threading.Barrier(nb_threads)
+
+    def target(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(nb_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_identical_calls_share_one_request(self):
+        session = FakeSession(total_pages=1, delays={1: 0.2})
+        api = NewsCatcherApiClient('key', session=session, coalesce=True)
+        results = run_threads(lambda: api.get_latest_headlines(lang='en', countries=['US', 'GB']), 8)
+
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(api.single_flight.nb_coalesced, 7)
+        self.assertTrue(all(result == results[0] for result in results))
+        # each caller gets its own result
+        self.assertEqual(len({id(result) for result in results}), 8)
+
+        # the call is not cached once it returned
+        api.get_latest_headlines(lang='en', countries=['US', 'GB'])
+        self.assertEqual(len(session.calls), 2)
+
+    def test_different_calls_are_not_merged(self):
+        session = FakeSession(total_pages=1, delays={1: 0.1})
+        api = NewsCatcherApiClient('key', session=session, coalesce=True)
+        queries = iter(['Tesla', 'SpaceX', 'Tesla', 'SpaceX'])
+        results = run_threads(lambda: api.get_search(q=next(queries)), 4)
+
+        self.assertEqual(sorted(params['q'] for _, params in session.calls), ['SpaceX', 'Tesla'])
+        self.assertEqual(sorted(result['user_input']['q'] for result in results), ['SpaceX', 'SpaceX', 'Tesla', 'Tesla'])
+
+    def test_error_is_shared(self):
+        session = FakeSession(total_pages=1, delays={1: 0.2}, failing_pages=[1])
+        api = NewsCatcherApiClient('key', session=session, coalesce=True)
+        results = run_threads(lambda: api.get_search(q='Tesla'), 4)
+
+        self.assertEqual(len(session.calls), 1)
+        self.assertTrue(all(isinstance(result, NewsCatcherApiException) for result in results))
+
+    def test_disabled_by_default(self):
+        session = FakeSession(total_pages=1, delays={1: 0.1})
+        api = NewsCatcherApiClient('key', session=session)
+        self.assertIsNone(api.single_flight)
+        run_threads(lambda: api.get_search(q='Tesla'), 3)
+        self.assertEqual(len(session.calls), 3)
+
+        with self.assertRaises(TypeError):
+            NewsCatcherApiClient('key', session=session, coalesce='yes')
+
+    def test_key_is_forgotten_after_a_failure(self):
+        single_flight = SingleFlight()
+
+        def fail():
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            single_flight.do('key', fail)
+        self.assertEqual(single_flight.do('key', lambda: 1), (1, False))
+
+
+class AsyncSingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_calls_share_one_task(self):
+        single_flight = AsyncSingleFlight()
+        nb_calls = []
+
+        async def call():
+            nb_calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        results = await asyncio.gather(*(single_flight.do('key', call) for _ in range(5)))
+        self.assertEqual(len(nb_calls), 1)
+        self.assertEqual(sorted(results), [('value', False)] + [('value', True)] * 4)
+        self.assertEqual(single_flight.nb_coalesced, 4)
+
+    async def test_cancelled_waiter_does_not_cancel_the_call(self):
+        single_flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        first = asyncio.ensure_future(single_flight.do('key', call))
+        second = asyncio.ensure_future(single_flight.do('key', call))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, ('value', True))
@@ -0,0 +1,102 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+from newscatcherapi import Article, JsonLinesSink, NewsCatcherApiClient
+from tests.fakes import FakeSession
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class JsonLinesSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_articles(self, sink, max_workers=None, **kwargs):
+        api = NewsCatcherApiClient('key', session=FakeSession(**kwargs))
+        return api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                           seconds_pause=0, max_workers=max_workers, sink=sink)
+
+    def test_path(self):
+        path = os.path.join(self.directory, 'articles.jsonl')
+        result = self.get_articles(path)
+
+        self.assertEqual({key: result[key] for key in ('status', 'total_hits', 'nb_articles_written',
+                                                       'nb_pages_written')},
+                         {'status': 'ok', 'total_hits': 12, 'nb_articles_written': 12, 'nb_pages_written': 6})
+        self.assertNotIn('articles', result)
+        with open(path) as jsonl:
+            articles = [json.loads(line) for line in jsonl]
+        self.assertEqual(len(articles), 12)
+        self.assertEqual(articles[0]['_id'], '01/01/2021 00:00:00-1-0')
+
+    def test_nb_pages_written(self):
+        # the pages are written one by one, or a window at a time with max_workers, failed pages are not counted
+        for max_workers in (None, 2):
+            result = self.get_articles(io.StringIO(), max_workers=max_workers)
+            self.assertEqual((result['nb_articles_written'], result['nb_pages_written']), (12, 6))
+            result = self.get_articles(io.StringIO(), max_workers=max_workers, failing_pages=(2,))
+            self.assertEqual((result['nb_articles_written'], result['nb_pages_written']), (8, 4))
+
+    def test_gzip(self):
+        path = os.path.join(self.directory, 'articles.jsonl.gz')
+        self.get_articles(path)
+        with gzip.open(path, 'rt') as jsonl:
+            self.assertEqual(len(jsonl.readlines()), 12)
+
+    @unittest.skipUnless(zstandard, 'zstandard is not installed')
+    def test_zstd(self):
+        path = os.path.join(self.directory, 'articles.jsonl.zst')
+        self.get_articles(path)
+        with open(path, 'rb') as compressed:
+            lines = zstandard.ZstdDecompressor().stream_reader(compressed).read().splitlines()
+        self.assertEqual(len(lines), 12)
+
+    def test_file_object_is_left_open(self):
+        output = io.StringIO()
+        self.get_articles(output)
+        self.assertEqual(len(output.getvalue().splitlines()), 12)
+
+        output = io.BytesIO()
+        with JsonLinesSink(output, compression='gzip') as sink:
+            self.get_articles(sink)
+            self.get_articles(sink)
+            self.assertEqual(sink.nb_articles, 24)
+        self.assertFalse(output.closed)
+        self.assertEqual(len(gzip.decompress(output.getvalue()).splitlines()), 24)
+
+    def test_periodic_flush(self):
+        output = io.BytesIO()
+        sink = JsonLinesSink(output, compression='gzip', flush_interval=0)
+        sink.write_articles([Article({'_id': 'a', 'summary': 'x' * 300}), {'_id': 'b'}])
+        lines = gzip.GzipFile(fileobj=io.BytesIO(output.getvalue())).read1(1024).splitlines()
+        self.assertEqual([json.loads(line)['_id'] for line in lines], ['a', 'b'])
+        self.assertEqual(json.loads(lines[0])['summary'], 'x' * 300)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            JsonLinesSink(io.BytesIO(), compression='lz4')
+        with self.assertRaises(ValueError):
+            JsonLinesSink(io.StringIO(), compression='gzip')
+
+    def test_memory_does_not_grow_with_the_pull(self):
+        def peak_memory(nb_pages):
+            with open(os.devnull, 'wb') as output:
+                tracemalloc.start()
+                self.get_articles(output, total_pages=nb_pages, page_size=50, record_calls=False)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            return peak
+
+        self.assertLess(peak_memory(40), peak_memory(4) * 1.5)
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+
+from newscatcherapi import (NewsCatcherApiClient, MemoryTransport, RecordReplayTransport, RequestsTransport,
+                            RetryPolicy, Urllib3Transport)
+from newscatcherapi.newscatcherapi_auth import NewsCatcherApiAuth
+from newscatcherapi.newscatcherapi_exception import NewsCatcherApiException
+from tests.mock_server import MockNewsCatcherServer
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        self.server = MockNewsCatcherServer(total_hits=250, summary_size=100, api_key='key')
+
+    def test_memory_transport(self):
+        api = NewsCatcherApiClient('key', transport=MemoryTransport(self.server.respond))
+        result = api.get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0)
+        self.assertEqual(len(result['articles']), 250)
+        self.assertEqual(self.server.nb_requests, 3)
+        self.assertIsNone(api.request_method)
+
+        with self.assertRaises(NewsCatcherApiException):
+            NewsCatcherApiClient('wrong key', transport=MemoryTransport(self.server.respond)).get_search(q='bitcoin')
+
+        transport = MemoryTransport(lambda path, params, headers: (200, None, '{"status": "ok", "sources": []}'))
+        self.assertEqual(NewsCatcherApiClient('key', transport=transport).get_sources(),
+                         {'status': 'ok', 'sources': []})
+
+    def test_urllib3_transport(self):
+        self.server.rate_limit_every = 2
+        with self.server, Urllib3Transport(maxsize=2) as transport:
+            api = NewsCatcherApiClient('key', base_url=self.server.base_url, transport=transport, timeout=(5, 5),
+                                       retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+            result = api.get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0, max_workers=2)
+            self.assertEqual(len(result['articles']), 250)
+            self.assertEqual(result['articles'], NewsCatcherApiClient(
+                'key', base_url=self.server.base_url, retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+            ).get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0)['articles'])
+
+            prepared = api.prepare_search(q='bitcoin', page_size=100)
+            self.assertEqual(len(api.fetch(prepared.page(3))['articles']), 50)
+
+            # network errors are retried, then raised
+            api.base_url = 'http://127.0.0.1:1'
+            api.retry_policy = RetryPolicy(max_retries=1, backoff_factor=0)
+            with self.assertRaises(transport.RETRYABLE_ERRORS):
+                api.get_search(q='bitcoin')
+
+    def test_record_replay_transport(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'recording.db')
+
+        with self.server:
+            with RecordReplayTransport(path, mode='record') as transport:
+                api = NewsCatcherApiClient('key', base_url=self.server.base_url, transport=transport)
+                recorded = api.get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0)
+                self.assertEqual(transport.nb_recorded, 3)
+
+        # replayed against any base URL, without a server
+        with RecordReplayTransport(path) as transport:
+            api = NewsCatcherApiClient('other key', base_url='http://localhost:1', transport=transport)
+            self.assertEqual(api.get_search_all_pages(q='bitcoin', page_size=100, seconds_pause=0), recorded)
+            self.assertEqual(transport.nb_replayed, 3)
+            with self.assertRaises(LookupError):
+                api.get_search(q='ethereum')
+
+        with RecordReplayTransport(path, mode='auto', transport=MemoryTransport(self.server.respond)) as transport:
+            api = NewsCatcherApiClient('key', transport=transport)
+            api.get_search(q='bitcoin', page_size=100, page=1)
+            api.get_search(q='ethereum', page_size=100)
+            self.assertEqual((transport.nb_replayed, transport.nb_recorded), (1, 1))
+
+    def test_auth(self):
+        api = NewsCatcherApiClient('wrong key', transport=MemoryTransport(self.server.respond))
+        self.assertIsInstance(api.auth, NewsCatcherApiAuth)
+        self.assertEqual(api.auth.x_api_key, 'wrong key')
+        with self.assertRaises(NewsCatcherApiException):
+            api.get_search(q='bitcoin')
+
+        api.auth = NewsCatcherApiAuth(x_api_key='key')
+        self.assertEqual(api.get_search(q='bitcoin')['status'], 'ok')
+
+    def test_validation(self):
+        transport = MemoryTransport(self.server.respond)
+        with self.assertRaises(ValueError):
+            NewsCatcherApiClient('key', session=requests.Session(), transport=transport)
+        with self.assertRaises(TypeError):
+            NewsCatcherApiClient('key', transport=requests.Session())
+        with self.assertRaises(TypeError):
+            MemoryTransport(None)
+        with self.assertRaises(ValueError):
+            RecordReplayTransport(':memory:', mode='rewind')
+        with self.assertRaises(TypeError):
+            RecordReplayTransport(':memory:', transport=requests.Session())
+
+    def test_close(self):
+        session = requests.Session()
+        api = NewsCatcherApiClient('key', session=session)
+        self.assertIsInstance(api.transport, RequestsTransport)
+        self.assertIs(api.request_method, session)
+        api.close()
+
+        closed = []
+        transport = MemoryTransport(self.server.respond)
+        transport.close = lambda: closed.append(True)
+        NewsCatcherApiClient('key', transport=transport).close()
+        self.assertEqual(closed, [])
+
+    def test_set_request_method(self):
+        api = NewsCatcherApiClient('key')
+        created = api.request_method
+        created_close, closed = created.close, []
+        created.close = lambda: (closed.append(True), created_close())
+        session = requests.Session()
+        api.request_method = session
+        self.assertEqual(closed, [True])
+        self.assertIs(api.request_method, session)
+        self.assertIs(api.transport.session, session)
+        api.close()
+
+        api = NewsCatcherApiClient('key', transport=MemoryTransport(self.server.respond))
+        with self.assertRaises(AttributeError):
+            api.request_method = session
+        self.assertIsNone(api.request_method)
+        session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
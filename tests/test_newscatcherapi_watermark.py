@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from newscatcherapi import HeadlinesWatermark, MemoryTransport, NewsCatcherApiClient
+
+
+class Headlines(object):
+    """Latest headlines sorted by the earliest date published first, like the API, as articles come and go."""
+
+    def __init__(self, nb_articles):
+        self.articles = []
+        self.calls = []
+        self.nb_published = 0
+        self.publish(nb_articles)
+
+    def publish(self, nb_articles):
+        first = self.nb_published
+        self.nb_published += nb_articles
+        self.articles.extend({'_id': str(i), 'published_date': f'2021-08-31 {i // 60:02d}:{i % 60:02d}:00'}
+                             for i in range(first, self.nb_published))
+
+    def expire(self, nb_articles):
+        # the oldest articles drop out of the `when` period
+        del self.articles[:nb_articles]
+
+    def respond(self, path, params, headers):
+        self.calls.append(params)
+        page, page_size = int(params['page']), int(params['page_size'])
+        total_pages = (len(self.articles) + page_size - 1) // page_size
+        return 200, None, {'status': 'ok', 'total_hits': len(self.articles), 'page': page, 'page_size': page_size,
+                           'total_pages': total_pages,
+                           'articles': self.articles[(page - 1) * page_size:page * page_size]}
+
+
+class HeadlinesWatermarkTest(unittest.TestCase):
+    def setUp(self):
+        self.headlines = Headlines(250)
+        self.api = NewsCatcherApiClient('key', transport=MemoryTransport(self.headlines.respond))
+
+    def poll(self, watermark, **params):
+        self.headlines.calls = []
+        return [article['_id'] for article in self.api.poll_latest_headlines(
+            watermark, lang='en', when='1h', page_size=100, seconds_pause=0, **params)]
+
+    def test_poll(self):
+        watermark = HeadlinesWatermark()
+        self.assertEqual(self.poll(watermark), [str(i) for i in range(249, -1, -1)])
+        self.assertEqual([call['page'] for call in self.headlines.calls], ['1', '3', '2'])
+        self.assertEqual(watermark.latest, '2021-08-31 04:09:00')
+
+        # the new articles are on the last pages
+        self.headlines.publish(30)
+        self.assertEqual(self.poll(watermark), [str(i) for i in range(279, 249, -1)])
+        self.assertEqual([call['page'] for call in self.headlines.calls], ['1', '3', '2'])
+
+        self.assertEqual(self.poll(watermark), [])
+        self.assertEqual([call['page'] for call in self.headlines.calls], ['1', '3'])
+        self.assertEqual((watermark.nb_new, len(watermark)), (280, 280))
+
+        with self.assertRaises(ValueError):
+            self.poll(watermark, countries='US')
+        with self.assertRaises(TypeError):
+            self.poll({})
+
+    def test_sliding_period(self):
+        watermark = HeadlinesWatermark()
+        self.poll(watermark)
+        # as many articles drop out of the period as are published: the new ones fill the last 1.5 pages
+        self.headlines.expire(150)
+        self.headlines.publish(150)
+        self.assertEqual(self.poll(watermark), [str(i) for i in range(399, 249, -1)])
+        self.assertEqual([call['page'] for call in self.headlines.calls], ['1', '3', '2'])
+
+    def test_stop_early(self):
+        watermark = HeadlinesWatermark()
+        for _ in self.api.poll_latest_headlines(watermark, page_size=100, seconds_pause=0):
+            break
+        self.assertEqual((len(watermark), len(self.headlines.calls)), (1, 2))
+        self.assertEqual(watermark.latest, '2021-08-31 04:09:00')
+
+        self.headlines.calls = []
+        self.assertEqual(len(list(self.api.poll_latest_headlines(watermark, page_size=100, seconds_pause=0))), 249)
+
+    def test_forgotten_ids(self):
+        watermark = HeadlinesWatermark(max_ids=300)
+        self.assertEqual(len(self.poll(watermark)), 250)
+        self.headlines.publish(100)
+        self.assertEqual(len(self.poll(watermark)), 100)
+        self.assertEqual(len(watermark), 300)
+        # the ids of the 50 oldest articles are forgotten, they are published before the floor
+        self.assertEqual(watermark.floor, '2021-08-31 00:49:00')
+        self.assertTrue(watermark.is_known({'_id': '0', 'published_date': '2021-08-31 00:00:00'}))
+        self.assertFalse(watermark.is_known({'_id': 'late', 'published_date': '2021-08-31 03:00:00'}))
+
+        self.headlines.publish(10)
+        self.assertEqual(len(self.poll(watermark)), 10)
+        self.assertEqual([call['page'] for call in self.headlines.calls], ['1', '4', '3'])
+
+    def test_save(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'watermark.json')
+
+        self.assertEqual(len(self.poll(HeadlinesWatermark(path))), 250)
+        self.assertTrue(os.path.exists(path))
+
+        self.headlines.publish(5)
+        watermark = HeadlinesWatermark(path)
+        self.assertEqual(self.poll(watermark), ['254', '253', '252', '251', '250'])
+        self.assertEqual(HeadlinesWatermark(path).latest, watermark.latest)
+        with self.assertRaises(ValueError):
+            self.poll(HeadlinesWatermark(path), topic='tech')
+
+        with self.assertRaises(ValueError):
+            HeadlinesWatermark(max_ids=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
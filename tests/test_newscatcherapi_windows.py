@@ -0,0 +1,105 @@
+import unittest
+from datetime import datetime, timedelta
+
+from newscatcherapi import NewsCatcherApiClient, utils
+from newscatcherapi.newscatcherapi_windows import AdaptiveTimeWindows
+from tests.fakes import FakeSession
+
+
+class AdaptiveTimeWindowsTest(unittest.TestCase):
+    def test_split_then_grow(self):
+        windows = AdaptiveTimeWindows(datetime(2021, 1, 1), datetime(2021, 1, 3, 23, 59, 59), timedelta(days=1), 100)
+
+        self.assertEqual(windows.current(), (datetime(2021, 1, 1), datetime(2021, 1, 1, 23, 59, 59)))
+        self.assertFalse(windows.submit(150))
+        self.assertEqual(windows.current(), (datetime(2021, 1, 1), datetime(2021, 1, 1, 11, 59, 59)))
+
+        self.assertTrue(windows.submit(75))
+        self.assertEqual(windows.current(), (datetime(2021, 1, 1, 12), datetime(2021, 1, 1, 23, 59, 59)))
+
+        # sparse: the next window is twice as large, and is cut at the end of the interval
+        self.assertTrue(windows.submit(10))
+        self.assertEqual(windows.current(), (datetime(2021, 1, 2), datetime(2021, 1, 2, 23, 59, 59)))
+        self.assertTrue(windows.submit(10))
+        self.assertEqual(windows.current(), (datetime(2021, 1, 3), datetime(2021, 1, 3, 23, 59, 59)))
+        self.assertTrue(windows.submit(10))
+        self.assertIsNone(windows.current())
+
+    def test_minimum_window_is_accepted(self):
+        windows = AdaptiveTimeWindows(datetime(2021, 1, 1), datetime(2021, 1, 1, 0, 0, 59), timedelta(minutes=1), 10)
+        self.assertTrue(windows.submit(1000))
+        self.assertIsNone(windows.current())
+
+
+class TimeWindowsTest(unittest.TestCase):
+    def test_midnight_offset(self):
+        windows = list(utils.iter_time_windows(datetime(2021, 1, 1, 22), datetime(2021, 1, 2, 3), timedelta(hours=1)))
+        # only the window ending at midnight is shortened by a second, the later ones stay on the hour
+        self.assertEqual(windows, [
+            (datetime(2021, 1, 1, 22), datetime(2021, 1, 1, 23)),
+            (datetime(2021, 1, 1, 23), datetime(2021, 1, 1, 23, 59, 59)),
+            (datetime(2021, 1, 2, 0), datetime(2021, 1, 2, 1)),
+            (datetime(2021, 1, 2, 1), datetime(2021, 1, 2, 2)),
+            (datetime(2021, 1, 2, 2), datetime(2021, 1, 2, 3)),
+        ])
+
+    def test_invalid_by(self):
+        with self.assertRaises(ValueError):
+            utils.get_time_delta('year')
+        api = NewsCatcherApiClient('key', session=FakeSession())
+        with self.assertRaises(ValueError):
+            api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='year')
+
+
+class AdaptiveSearchAllArticlesTest(unittest.TestCase):
+    def test_busy_windows_are_not_cut_off(self):
+        # 2 articles per hour, at most 2 pages of 10 articles per window
+        session = FakeSession(page_size=10, hits_per_hour=2)
+        api = NewsCatcherApiClient('key', session=session)
+        result = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                             page_size=10, max_page=2, seconds_pause=0, adaptive=True)
+
+        self.assertEqual(len(result['articles']), 96)
+        self.assertEqual(len(result['articles']), len({article['_id'] for article in result['articles']}))
+
+        fixed = NewsCatcherApiClient('key', session=FakeSession(page_size=10, hits_per_hour=2))
+        result = fixed.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='day',
+                                               page_size=10, max_page=2, seconds_pause=0)
+        self.assertEqual(len(result['articles']), 40)
+
+    def test_page_cap_saturates_small_pages(self):
+        # 1200 articles in the day, the 100 pages of 10 articles of one query only reach 1000 of them
+        self.assertEqual(utils.get_window_max_hits(1, 10, None), 1000)
+        self.assertEqual(utils.get_window_max_hits(1, 100, None), 10000)
+        self.assertEqual(utils.get_window_max_hits(1, 10, 20), 200)
+
+        session = FakeSession(page_size=10, hits_per_hour=50)
+        api = NewsCatcherApiClient('key', session=session)
+        result = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/02', by='day',
+                                             page_size=10, seconds_pause=0, adaptive=True)
+        self.assertEqual(len({article['_id'] for article in result['articles']}), 1200)
+        self.assertLessEqual(max(int(params['page']) for _, params in session.calls), 100)
+
+    def test_sparse_windows_use_fewer_calls(self):
+        session = FakeSession(page_size=10, hits_per_hour=1)
+        api = NewsCatcherApiClient('key', session=session)
+        articles = list(api.iter_search_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/03', by='hour',
+                                                 page_size=10, seconds_pause=0, adaptive=True))
+
+        self.assertEqual(len(articles), 48)
+        # 48 calls with one window per hour
+        self.assertLess(len(session.calls), 12)
+
+
+class ParallelSearchAllArticlesTest(unittest.TestCase):
+    def test_windows_in_parallel_keep_window_order(self):
+        session = FakeSession(page_size=5, hits_per_hour=1, delays={1: 0.05})
+        api = NewsCatcherApiClient('key', session=session)
+        sequential = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/01 12:00:00',
+                                                 by='hour', page_size=5, seconds_pause=0)
+        parallel = api.get_search_all_articles(q='Elon Musk', from_='2021/01/01', to_='2021/01/01 12:00:00',
+                                               by='hour', page_size=5, seconds_pause=0, max_workers=6)
+
+        self.assertEqual(len(parallel['articles']), 12)
+        self.assertEqual(parallel['articles'], sequential['articles'])
+        self.assertEqual(parallel['total_hits'], sequential['total_hits'])